@@ -0,0 +1,310 @@
+# bench_api.py - Benchmark et test de charge de l'API Flask
+#
+# Utilisation (depuis la racine du projet) :
+#   python benchmarks/bench_api.py                                  # client de test Flask, tous les scénarios
+#   python benchmarks/bench_api.py --target wsgi --concurrency 16   # serveur WSGI réel dans le processus
+#   python benchmarks/bench_api.py --url http://localhost:5001       # serveur déjà démarré (gunicorn, ...)
+#   python benchmarks/bench_api.py --output results/avant.json
+#   python benchmarks/bench_api.py --compare results/avant.json     # écarts par rapport à une mesure précédente
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server')
+sys.path.insert(0, SERVER_DIR)
+
+SCENARIOS = ('dashboard', 'modules', 'static')
+
+# Filtres du tableau de bord : 'hot' rejoue quelques combinaisons (écrans muraux),
+# 'wide' parcourt un large éventail de périodes
+HOT_FILTERS = [
+    {"view_type": "weekly", "display_type": "total", "week": 2, "month": 3, "year": 2024},
+    {"view_type": "monthly", "display_type": "total", "week": 1, "month": 3, "year": 2024},
+    {"view_type": "monthly", "display_type": "average", "week": 1, "month": 3, "year": 2024},
+    {"view_type": "yearly", "display_type": "total", "week": 1, "month": 1, "year": 2024},
+    {"view_type": "yearly", "display_type": "average", "week": 1, "month": 1, "year": 2023}
+]
+
+def wide_filters(rng):
+    """Tire une combinaison de filtres quelconque"""
+    return {
+        "view_type": rng.choice(["weekly", "monthly", "yearly"]),
+        "display_type": rng.choice(["total", "average"]),
+        "week": rng.randint(1, 4),
+        "month": rng.randint(1, 12),
+        "year": rng.randint(2020, 2025)
+    }
+
+def build_path(scenario, filter_mix, rng):
+    """
+    Construit le chemin de la prochaine requête d'un scénario
+
+    Args:
+        scenario (str): dashboard, modules ou static
+        filter_mix (str): hot ou wide (scénario dashboard)
+        rng (random.Random): Générateur du thread client
+
+    Returns:
+        str: Chemin de la requête
+    """
+    if scenario == 'modules':
+        return '/api/modules'
+    if scenario == 'static':
+        return rng.choice(['/', '/index.html', '/dashboard', '/tickets'])
+    filters = rng.choice(HOT_FILTERS) if filter_mix == 'hot' else wide_filters(rng)
+    return '/api/dashboard/data?' + '&'.join(f"{key}={value}" for key, value in filters.items())
+
+class TestClientTarget:
+    """Exécute les requêtes dans le processus via le client de test Flask (sans réseau)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def session(self):
+        client = self.app.test_client()
+
+        def request(path):
+            response = client.get(path)
+            response.close()
+            return response.status_code
+        return request
+
+    def close(self):
+        pass
+
+class HTTPTarget:
+    """Exécute les requêtes sur un serveur HTTP (connexion keep-alive par thread client)"""
+
+    def __init__(self, base_url, server=None):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.https = parsed.scheme == 'https'
+        self.server = server
+
+    def session(self):
+        state = {"connection": None}
+
+        def request(path):
+            for attempt in range(2):
+                if state["connection"] is None:
+                    connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+                    state["connection"] = connection_class(self.host, self.port, timeout=30)
+                try:
+                    state["connection"].request('GET', path)
+                    response = state["connection"].getresponse()
+                    response.read()
+                    if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                        state["connection"].close()
+                        state["connection"] = None
+                    return response.status
+                except (http.client.HTTPException, OSError):
+                    state["connection"].close()
+                    state["connection"] = None
+                    if attempt:
+                        raise
+        return request
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+def create_target(args):
+    """
+    Prépare la cible du benchmark
+
+    Returns:
+        object: Cible exposant session() et close()
+    """
+    if args.url:
+        return HTTPTarget(args.url)
+
+    from app import create_app
+    app = create_app()
+    if args.target == 'testclient':
+        return TestClientTarget(app)
+
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return HTTPTarget(f"http://127.0.0.1:{server.server_port}", server=server)
+
+def run_scenario(target, scenario, args):
+    """
+    Exécute un scénario avec 'concurrency' clients pendant 'duration' secondes
+
+    Returns:
+        dict: Latences (ms), débit, erreurs et mémoire résidente
+    """
+    latencies = []
+    errors = []
+    statuses = {}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + args.warmup + args.duration
+    measure_from = time.perf_counter() + args.warmup
+
+    def client(index):
+        rng = random.Random(args.seed + index)
+        request = target.session()
+        local_latencies = []
+        local_statuses = {}
+        local_errors = 0
+        while True:
+            start = time.perf_counter()
+            if start >= stop_at:
+                break
+            try:
+                status = request(build_path(scenario, args.filter_mix, rng))
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            if start < measure_from:
+                continue
+            local_latencies.append(elapsed)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+            if status is None or status >= 500:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+            for status, count in local_statuses.items():
+                statuses[str(status)] = statuses.get(str(status), 0) + count
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": sum(errors),
+        "statuses": statuses,
+        "throughput_rps": count / args.duration,
+        "latency_ms": {
+            "mean": 1000 * sum(latencies) / count if count else None,
+            "p50": 1000 * percentile(latencies, 50),
+            "p95": 1000 * percentile(latencies, 95),
+            "p99": 1000 * percentile(latencies, 99),
+            "max": 1000 * latencies[-1] if count else None
+        },
+        "rss_mb": current_rss_mb(),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    }
+
+def percentile(sorted_values, rank):
+    """Percentile par la méthode du rang le plus proche (valeurs déjà triées)"""
+    if not sorted_values:
+        return float('nan')
+    index = max(0, min(len(sorted_values) - 1, int(round(rank / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def current_rss_mb():
+    """Mémoire résidente actuelle du processus (Linux), ou None si indisponible"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        return None
+    return None
+
+def git_revision():
+    """Renvoie le commit courant et l'état de l'arbre de travail"""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=SERVER_DIR,
+                                         stderr=subprocess.DEVNULL).decode().strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain'], cwd=SERVER_DIR,
+                                             stderr=subprocess.DEVNULL).strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+def print_comparison(results, baseline_path):
+    """Affiche les écarts de débit et de latence par rapport à une mesure enregistrée"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    print(f"\nComparaison avec {baseline_path} (commit {baseline.get('git', {}).get('commit')})")
+    for scenario, result in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if not before:
+            continue
+        for label, key, path in (("débit", "throughput_rps", None), ("p50", "p50", "latency_ms"),
+                                 ("p95", "p95", "latency_ms"), ("p99", "p99", "latency_ms")):
+            new = result[path][key] if path else result[key]
+            old = before[path][key] if path else before[key]
+            change = 100.0 * (new - old) / old if old else float('nan')
+            print(f"  {scenario:<10} {label:<6} {old:10.2f} -> {new:10.2f} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'API du tableau de bord KPI")
+    parser.add_argument('--target', choices=['testclient', 'wsgi'], default='testclient',
+                        help="Client de test Flask ou serveur WSGI réel dans le processus")
+    parser.add_argument('--url', help="URL d'un serveur déjà démarré (remplace --target)")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=8, help="Clients simultanés")
+    parser.add_argument('--duration', type=float, default=10.0, help="Durée de mesure par scénario (s)")
+    parser.add_argument('--warmup', type=float, default=1.0, help="Durée de chauffe non mesurée (s)")
+    parser.add_argument('--filter-mix', choices=['hot', 'wide'], default='hot',
+                        help="Combinaisons de filtres du scénario dashboard")
+    parser.add_argument('--seed', type=int, default=0, help="Graine des tirages de filtres")
+    parser.add_argument('--output', help="Fichier JSON de résultats")
+    parser.add_argument('--compare', help="Fichier JSON d'une mesure précédente à comparer")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    target = create_target(args)
+    results = {
+        "benchmark": "api",
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "target": args.url or args.target,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "filter_mix": args.filter_mix
+        },
+        "scenarios": {}
+    }
+
+    try:
+        for scenario in args.scenarios:
+            result = run_scenario(target, scenario, args)
+            results["scenarios"][scenario] = result
+            latency = result["latency_ms"]
+            print(f"{scenario:<10} {result['throughput_rps']:9.1f} req/s | p50 {latency['p50']:7.2f} ms | "
+                  f"p95 {latency['p95']:7.2f} ms | p99 {latency['p99']:7.2f} ms | "
+                  f"erreurs {result['errors']} | RSS {result['rss_mb'] or 0:.0f} Mo")
+    finally:
+        target.close()
+
+    if args.output:
+        directory = os.path.dirname(os.path.abspath(args.output))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+# bench_ingest.py - Débit de l'ingestion d'une source API paginée dans la base KPI
+#
+# Une source locale (serveur WSGI démarré dans le processus) sert une année de tickets au
+# format de la source 'landesk_tickets', page par page. Le pipeline par lots est comparé à
+# une écriture ligne par ligne (une transaction par ticket), et la synchronisation
+# incrémentale (updated_since) à une relecture complète.
+#
+# Utilisation (depuis la racine du projet) :
+#   python benchmarks/bench_ingest.py
+#   python benchmarks/bench_ingest.py --tickets 500000 --batch-size 10000 --no-baseline
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from werkzeug.serving import make_server  # noqa: E402
+from werkzeug.wrappers import Request, Response  # noqa: E402
+
+from config.settings import DATABASE_CONFIG, INGEST_CONFIG  # noqa: E402
+from connectors.api_connector import APIConnector  # noqa: E402
+from connectors.sql_connector import SQLConnector  # noqa: E402
+from modules.dashboard import synthetic  # noqa: E402
+
+class Source:
+    """Source paginée locale : une année de tickets au format de 'landesk_tickets'"""
+
+    def __init__(self, count, page_size, seed):
+        self.page_size = page_size
+        self.records = []
+        for rows in synthetic.generate_tickets(count, datetime(2024, 1, 1), datetime(2025, 1, 1), seed=seed):
+            for ticket_id, technology, assignee, severity, status, opened_at, closed_at, updated_at in rows:
+                self.records.append({
+                    "id": ticket_id,
+                    "category": technology,
+                    "assignee": {"name": assignee} if assignee else None,
+                    "priority": severity.upper(),
+                    "status": status,
+                    "created_at": opened_at,
+                    "closed_at": closed_at,
+                    "updated_at": updated_at
+                })
+        self.pages = {}  # Pages complètes déjà sérialisées, par offset
+
+    def modify(self, count, seed):
+        """Met à jour 'count' tickets tirés au hasard (clôture datée de maintenant)"""
+        import random
+        stamp = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        for record in random.Random(seed).sample(self.records, count):
+            record.update(status='closed', closed_at=record['closed_at'] or stamp, updated_at=stamp)
+        self.pages.clear()
+
+    def application(self, environ, start_response):
+        request = Request(environ)
+        offset = int(request.args.get('offset', 0))
+        since = request.args.get('updated_since')
+        if since:
+            changed = [record for record in self.records if record['updated_at'] >= since]
+            body = json.dumps({"data": changed[offset:offset + self.page_size]}).encode()
+        else:
+            body = self.pages.get(offset)
+            if body is None:
+                body = json.dumps({"data": self.records[offset:offset + self.page_size]}).encode()
+                self.pages[offset] = body
+        return Response(body, mimetype='application/json')(environ, start_response)
+
+def start_source(source):
+    """
+    Démarre la source locale dans un thread
+
+    Returns:
+        tuple: (serveur, URL de base)
+    """
+    server = make_server('127.0.0.1', 0, source.application, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"
+
+def run(mode, args, base_url, directory, source):
+    """
+    Ingère la source dans une base neuve
+
+    Args:
+        mode (str): 'batch' (pipeline), 'row' (une transaction par ticket) ou 'delta'
+            (synchronisation complète, modification de --changes tickets, puis synchronisation incrémentale)
+
+    Returns:
+        dict: Statistiques du pipeline (du passage incrémental pour 'delta')
+    """
+    from database.ingest import IngestPipeline
+    from database.sync import DeltaSync
+
+    class RowByRowPipeline(IngestPipeline):
+        """Référence : un INSERT et un COMMIT par ticket"""
+
+        def _write(self, rows, stats):
+            started = time.perf_counter()
+            with self.store.lease() as connection:
+                for row in self.parameters(rows):
+                    with connection:
+                        connection.execute(self._statement, row)
+            stats["write_seconds"] += time.perf_counter() - started
+            stats["written"] += len(rows)
+            stats["batches"] += 1
+            stats["latest_updated_at"] = max([stats["latest_updated_at"] or ''] + [row[-1] for row in rows])
+
+    config = dict(INGEST_CONFIG['SOURCES']['landesk_tickets'])
+    config['PAGINATION'] = dict(config['PAGINATION'], page_size=args.page_size)
+    api = APIConnector('bench_source', dict(DATABASE_CONFIG['API'], BASE_URL=base_url, HTTP_CACHE_ENABLED=False))
+    store = SQLConnector('bench_store', dict(DATABASE_CONFIG['SQL'], NAME=os.path.join(directory, f"{mode}.db")))
+    pipeline_class = RowByRowPipeline if mode == 'row' else IngestPipeline
+    pipeline = pipeline_class(f"bench_{mode}", config, api, store, args.batch_size)
+    try:
+        if mode != 'delta':
+            return pipeline.run()
+        sync = DeltaSync(pipeline, dict(config['SYNC'], LOOKBACK=0))
+        full = sync.run()
+        source.modify(args.changes, args.seed)
+        stats = sync.run()
+        stats["full_seconds"] = full["seconds"]
+        return stats
+    finally:
+        api.disconnect()
+        store.disconnect()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'ingestion API vers la base KPI")
+    parser.add_argument('--tickets', type=int, default=200000, help="Tickets servis par la source (une année)")
+    parser.add_argument('--page-size', type=int, default=1000, help="Enregistrements par page de la source")
+    parser.add_argument('--batch-size', type=int, default=INGEST_CONFIG.get('BATCH_SIZE', 5000),
+                        help="Enregistrements par transaction")
+    parser.add_argument('--changes', type=int, default=2000, help="Tickets modifiés avant la synchronisation incrémentale")
+    parser.add_argument('--no-baseline', action='store_true', help="Ne pas mesurer l'écriture ligne par ligne")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des données synthétiques")
+    parser.add_argument('--output', help="Fichier JSON de sortie")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    source = Source(args.tickets, args.page_size, args.seed)
+    server, base_url = start_source(source)
+    directory = tempfile.mkdtemp(prefix='bench_ingest_')
+    results = {}
+    try:
+        for mode in ['batch', 'delta'] if args.no_baseline else ['batch', 'row', 'delta']:
+            stats = run(mode, args, base_url, directory, source)
+            results[mode] = stats
+            print(f"{mode:<6} {stats['written']:>8} tickets en {stats['seconds']:6.2f}s | "
+                  f"{stats['records_per_second']:9.0f} tickets/s | écriture {stats['write_seconds']:6.2f}s | "
+                  f"{stats['batches']} lots" + (f" | erreur: {stats['error']}" if "error" in stats else "")
+                  + (f" | passage complet {stats['full_seconds']:.2f}s" if mode == 'delta' else ""))
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({"benchmark": "ingest", "date": date.today().isoformat(),
+                       "config": vars(args), "results": results}, output, indent=2)
+
+if __name__ == '__main__':
+    main()
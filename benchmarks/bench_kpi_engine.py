@@ -0,0 +1,99 @@
+# bench_kpi_engine.py - Compare le moteur KPI vectorisé (NumPy) à la version en boucles Python
+#
+# Utilisation (depuis la racine du projet) :
+#   python benchmarks/bench_kpi_engine.py
+#   python benchmarks/bench_kpi_engine.py --sizes 10000 1000000 --loop-limit 1000000
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from modules.dashboard import kpi_engine  # noqa: E402
+
+TECHNOLOGIES = ["Firewall", "VPN", "EDR", "SIEM", "IAM", "DLP"]
+PERSONNEL = ["Alice", "Bob", "Carol", "David", ""]
+
+def generate_columns(size, seed=42):
+    """
+    Génère des colonnes de tickets synthétiques
+
+    Args:
+        size (int): Nombre de tickets
+        seed (int, optional): Graine du générateur. Par défaut 42.
+
+    Returns:
+        dict: Colonnes attendues par kpi_engine.compute_period_totals
+    """
+    rng = np.random.default_rng(seed)
+    minutes = rng.gamma(2.0, 60.0, size)
+    minutes[rng.random(size) < 0.15] = np.nan  # Tickets non résolus
+    return {
+        "technology": np.array(TECHNOLOGIES)[rng.integers(0, len(TECHNOLOGIES), size)],
+        "assignee": np.array(PERSONNEL)[rng.integers(0, len(PERSONNEL), size)],
+        "critical": (rng.random(size) < 0.1).astype(np.int8),
+        "processing_minutes": minutes,
+        "current": (rng.random(size) < 0.5).astype(np.int8)
+    }
+
+def as_lists(columns):
+    """Convertit les colonnes en listes Python, comme un résultat SQL au format colonnes"""
+    return {
+        name: [None if isinstance(v, float) and v != v else v for v in values.tolist()]
+        for name, values in columns.items()
+    }
+
+def best_of(func, repeat):
+    """Renvoie le meilleur temps (secondes) de 'repeat' exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur KPI vectorisé")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000, 10000000],
+                        help="Nombres de tickets à tester")
+    parser.add_argument('--repeat', type=int, default=3, help="Exécutions par mesure (meilleur temps)")
+    parser.add_argument('--loop-limit', type=int, default=10000000,
+                        help="Taille maximale mesurée pour la version en boucles")
+    parser.add_argument('--output', help="Fichier JSON de sortie")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        columns = generate_columns(size)
+        lists = as_lists(columns) if size <= args.loop_limit else None
+
+        numpy_time = best_of(lambda: kpi_engine.compute_period_totals_numpy(lists or columns), args.repeat)
+        encoded = dict(columns)
+        for name in ("technology", "assignee"):
+            names, codes = np.unique(columns[name], return_inverse=True)
+            encoded[name] = (names.tolist(), codes)
+        encoded_time = best_of(lambda: kpi_engine.compute_period_totals_numpy(encoded), args.repeat)
+        loop_time = best_of(lambda: kpi_engine.compute_period_totals_python(lists), 1) if lists else None
+
+        result = {
+            "tickets": size,
+            "loop_s": loop_time,
+            "numpy_s": numpy_time,
+            "numpy_encoded_s": encoded_time,
+            "speedup": loop_time / numpy_time if loop_time else None,
+            "speedup_encoded": loop_time / encoded_time if loop_time else None
+        }
+        results.append(result)
+        print(f"{size:>10} tickets | boucles: {loop_time or float('nan'):8.3f}s | "
+              f"numpy: {numpy_time:8.3f}s | numpy (colonnes encodées): {encoded_time:8.3f}s")
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({"benchmark": "kpi_engine", "results": results}, output, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# bench_serializer.py - Compare les encodeurs JSON des réponses (orjson et json de la bibliothèque standard)
+#
+# Utilisation (depuis la racine du projet) :
+#   python benchmarks/bench_serializer.py
+#   python benchmarks/bench_serializer.py --rows 100000 --repeat 5
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from modules.dashboard import generate_mock_data  # noqa: E402
+from utils import serializer  # noqa: E402
+from utils.columnar import to_columnar  # noqa: E402
+
+def ticket_rows(count, seed=42):
+    """
+    Génère des lignes de tickets comparables à un résultat SQLConnector (avec datetime)
+
+    Args:
+        count (int): Nombre de lignes
+        seed (int, optional): Graine du générateur. Par défaut 42.
+
+    Returns:
+        list: Liste de dictionnaires
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for index in range(count):
+        opened = start + timedelta(minutes=rng.randrange(525600))
+        rows.append({
+            "id": f"SYN-{index:09d}",
+            "technology": rng.choice(["Firewall", "VPN", "EDR", "SIEM", "IAM", "DLP"]),
+            "assignee": rng.choice(["Alice", "Bob", "Carol", "David", None]),
+            "severity": rng.choice(["low", "medium", "high", "critical"]),
+            "opened_at": opened,
+            "closed_at": opened + timedelta(minutes=rng.randrange(1, 600)),
+            "processing_minutes": rng.random() * 600
+        })
+    return rows
+
+def best_of(func, repeat):
+    """Renvoie le meilleur temps (secondes) de 'repeat' exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des encodeurs JSON des réponses")
+    parser.add_argument('--rows', type=int, default=50000, help="Lignes du résultat de tickets")
+    parser.add_argument('--repeat', type=int, default=5, help="Exécutions par mesure (meilleur temps)")
+    parser.add_argument('--output', help="Fichier JSON de sortie")
+    args = parser.parse_args()
+
+    rows = ticket_rows(args.rows)
+    payloads = {
+        "dashboard": generate_mock_data('yearly', 'total', 1, 1, 2024),
+        "tickets_rows": rows,
+        "tickets_columnar": to_columnar(rows)
+    }
+
+    backends = ['json']
+    if serializer.orjson is not None:
+        backends.append('orjson')
+
+    results = []
+    for name, payload in payloads.items():
+        timings = {}
+        for backend in backends:
+            serializer.set_backend(backend)
+            timings[backend] = best_of(lambda: serializer.dumps(payload), args.repeat)
+        size = len(serializer.dumps(payload))
+        results.append({"payload": name, "bytes": size, "seconds": timings})
+        line = " | ".join(f"{backend}: {1000 * seconds:9.2f} ms" for backend, seconds in timings.items())
+        print(f"{name:<18} {size:>10} octets | {line}")
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({"benchmark": "serializer", "rows": args.rows, "results": results}, output, indent=2)
+
+if __name__ == '__main__':
+    main()
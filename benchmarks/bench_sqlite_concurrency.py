@@ -0,0 +1,207 @@
+# bench_sqlite_concurrency.py - Débit des lectures du tableau de bord pendant une ingestion continue
+#
+# Compare le profil SQLite par défaut (journal rollback, sans PRAGMA) au profil de
+# DATABASE_CONFIG['SQL'] (WAL, cache, mmap, connexions de lecture seule).
+#
+# Utilisation (depuis la racine du projet) :
+#   python benchmarks/bench_sqlite_concurrency.py
+#   python benchmarks/bench_sqlite_concurrency.py --tickets 500000 --readers 8 --duration 10
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from config.settings import DATABASE_CONFIG  # noqa: E402
+from connectors.sql_connector import SQLConnector  # noqa: E402
+from modules.dashboard import rollups, synthetic  # noqa: E402
+
+# Clés de DATABASE_CONFIG['SQL'] propres au profil optimisé
+TUNED_KEYS = ('JOURNAL_MODE', 'SYNCHRONOUS', 'CACHE_SIZE', 'MMAP_SIZE', 'TEMP_STORE',
+              'CACHED_STATEMENTS', 'READ_ONLY_QUERIES', 'READ_POOL_MAX_SIZE')
+
+# Requête de la source 'tickets' du tableau de bord (generate_ticket_data), sur un mois
+TICKETS_QUERY = """
+    SELECT technology,
+           COALESCE(assignee, '') AS assignee,
+           COALESCE(severity = 'critical', 0) AS critical,
+           (julianday(closed_at) - julianday(opened_at)) * 1440 AS processing_minutes
+    FROM tickets
+    WHERE opened_at >= :start AND opened_at < :end
+"""
+
+def profile_config(profile, database):
+    """
+    Construit la configuration du connecteur pour un profil
+
+    Args:
+        profile (str): 'default' ou 'tuned'
+        database (str): Fichier SQLite
+
+    Returns:
+        dict: Configuration de SQLConnector
+    """
+    config = {key: value for key, value in DATABASE_CONFIG['SQL'].items() if key not in TUNED_KEYS}
+    config.update({'NAME': database, 'POOL_ENABLED': True})
+    if profile == 'tuned':
+        config.update({key: DATABASE_CONFIG['SQL'][key] for key in TUNED_KEYS if key in DATABASE_CONFIG['SQL']})
+    return config
+
+def percentile(sorted_values, rank):
+    """Percentile par la méthode du rang le plus proche (valeurs déjà triées)"""
+    if not sorted_values:
+        return float('nan')
+    index = max(0, min(len(sorted_values) - 1, int(round(rank / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def read_loop(config, args, index, stop, results):
+    """
+    Boucle d'un lecteur (processus distinct, comme un worker Gunicorn) : interroge des mois au
+    hasard jusqu'à l'arrêt, puis publie ses latences et ses erreurs
+
+    Args:
+        config (dict): Configuration du connecteur
+        args (Namespace): Arguments de la ligne de commande
+        index (int): Numéro du lecteur (graine)
+        stop (Event): Signal d'arrêt
+        results (Queue): File des résultats
+    """
+    connector = SQLConnector(f"lecteur_{index}", config)
+    connector.connect()
+    rng = random.Random(args.seed + index)
+    latencies = []
+    errors = 0
+    while not stop.is_set():
+        start, end = rollups.period_bounds('monthly', 1, rng.randint(1, 12), 2024)
+        began = time.perf_counter()
+        try:
+            if args.query == 'tickets':
+                result = connector.fetch_data(TICKETS_QUERY, {"start": start.isoformat(), "end": end.isoformat()},
+                                              result_format='columnar')
+                if "error" in result:
+                    raise RuntimeError(result["error"])
+            else:
+                with connector.lease(read_only=True) as connection:
+                    rollups.query_period(connection, start, end)
+            latencies.append(time.perf_counter() - began)
+        except Exception:
+            errors += 1
+    connector.disconnect()
+    results.put((latencies, errors))
+
+def run_profile(profile, args, directory):
+    """
+    Prépare une base, puis mesure les lectures pendant que l'ingestion écrit en continu
+
+    Returns:
+        dict: Débits, latences et erreurs des lectures et des écritures
+    """
+    config = profile_config(profile, os.path.join(directory, f"{profile}.db"))
+    connector = SQLConnector(f"bench_{profile}", config)
+    connector.connect()
+    start, end = datetime(2024, 1, 1), datetime(2025, 1, 1)
+    with connector.lease() as connection:
+        synthetic.load_tickets(connection, args.tickets, start, end, seed=args.seed)
+        rollups.refresh_rollups(connection, full=True)
+    connector.disconnect()
+
+    context = multiprocessing.get_context('fork')
+    stop = context.Event()
+    results = context.Queue()
+    readers = [context.Process(target=read_loop, args=(config, args, index, stop, results))
+               for index in range(args.readers)]
+    writes, write_errors = [0], [0]
+
+    def writer():
+        connector.connect()
+        batches = synthetic.generate_tickets(10 ** 9, start, end, seed=args.seed + 1,
+                                             batch_size=args.batch_size, first_id=args.tickets)
+        for rows in batches:
+            if stop.is_set():
+                break
+            # Tickets mis à jour maintenant : le rafraîchissement incrémental les prend en compte
+            stamp = datetime.now().isoformat()
+            rows = [row[:7] + (stamp,) for row in rows]
+            try:
+                with connector.lease() as connection:
+                    with connection:
+                        connection.executemany(synthetic.INSERT_TICKET, rows)
+                    rollups.refresh_rollups(connection)
+                writes[0] += len(rows)
+            except Exception:
+                write_errors[0] += 1
+        connector.disconnect()
+
+    for process in readers:
+        process.start()
+    ingestion = threading.Thread(target=writer)
+    if not args.no_ingest:
+        ingestion.start()
+    began = time.perf_counter()
+    time.sleep(args.duration)
+    stop.set()
+    reads, read_errors = [], 0
+    for _ in readers:
+        latencies, errors = results.get()
+        reads.extend(latencies)
+        read_errors += errors
+    for process in readers:
+        process.join()
+    if ingestion.is_alive():
+        ingestion.join()
+    elapsed = time.perf_counter() - began
+
+    reads.sort()
+    return {
+        "reads_per_s": len(reads) / elapsed,
+        "read_p50_ms": 1000 * percentile(reads, 50),
+        "read_p99_ms": 1000 * percentile(reads, 99),
+        "read_errors": read_errors,
+        "tickets_written_per_s": writes[0] / elapsed,
+        "write_errors": write_errors[0]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Lectures concurrentes SQLite pendant l'ingestion")
+    parser.add_argument('--tickets', type=int, default=200000, help="Tickets chargés avant la mesure")
+    parser.add_argument('--readers', type=int, default=4, help="Processus de lecture (workers)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Durée de mesure par profil (s)")
+    parser.add_argument('--batch-size', type=int, default=500, help="Tickets par transaction d'ingestion")
+    parser.add_argument('--profiles', nargs='+', choices=['default', 'tuned'], default=['default', 'tuned'])
+    parser.add_argument('--query', choices=['rollups', 'tickets'], default='rollups',
+                        help="Lecture mesurée : agrégats journaliers ou tickets bruts d'un mois")
+    parser.add_argument('--no-ingest', action='store_true', help="Mesurer les lectures seules")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des données synthétiques")
+    parser.add_argument('--output', help="Fichier JSON de sortie")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    directory = tempfile.mkdtemp(prefix='bench_sqlite_')
+    results = {}
+    try:
+        for profile in args.profiles:
+            result = run_profile(profile, args, directory)
+            results[profile] = result
+            print(f"{profile:<8} lectures {result['reads_per_s']:9.1f}/s | p50 {result['read_p50_ms']:7.2f} ms | "
+                  f"p99 {result['read_p99_ms']:8.2f} ms | erreurs {result['read_errors']} | "
+                  f"ingestion {result['tickets_written_per_s']:8.0f} tickets/s (erreurs {result['write_errors']})")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({"benchmark": "sqlite_concurrency", "date": date.today().isoformat(),
+                       "config": vars(args), "results": results}, output, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,14 @@
 # app.py - Point d'entrée principal du serveur
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, abort, request, g
 from flask_cors import CORS
+import argparse
 import os
-import importlib
-import pkgutil
+import time
 import logging
-from config.settings import SERVER_CONFIG
+from config.settings import SERVER_CONFIG, APP_CONFIG
+from utils import metrics, serializer
+from utils.compression import finalize_response
+from utils.static_index import StaticIndex
 
 # Configuration du logging
 logging.basicConfig(
@@ -14,71 +17,188 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__, static_folder='../client/build')
-CORS(app)  # Active CORS pour le développement
+def create_app(lazy_modules=None):
+    """
+    Crée et configure l'application Flask (fabrique utilisée par wsgi.py, le mode production
+    et les benchmarks)
+    
+    Args:
+        lazy_modules (bool, optional): Différer l'import des modules jusqu'à leur première requête.
+            Par défaut selon APP_CONFIG['MODULES_LAZY_LOAD'] (toujours désactivé en debug).
+            
+    Returns:
+        Flask: Application avec ses modules enregistrés
+    """
+    app = Flask(__name__, static_folder='../client/build')
+    app.debug = SERVER_CONFIG.get('DEBUG', False)
+    CORS(app)  # Active CORS pour le développement
+    
+    # Sérialisation JSON : encodeur rapide pour les réponses, conversions communes pour jsonify
+    serializer.set_backend(APP_CONFIG.get('JSON_BACKEND', 'auto'))
+    app.json_encoder = serializer.APIJSONEncoder
+    
+    # Index en mémoire du build frontend (métadonnées, contenu et variantes compressées) ;
+    # en debug, le dossier est revérifié pendant les requêtes pour suivre les builds successifs
+    static_config = dict(SERVER_CONFIG, STATIC_INDEX_REFRESH='request') if app.debug else SERVER_CONFIG
+    app.extensions['static_index'] = StaticIndex(app.static_folder, static_config)
+    
+    register_hooks(app)
+    register_core_routes(app)
+    register_modules(app, lazy_modules)
+    return app
 
 # Enregistrement dynamique des modules
-def register_modules():
-    """Charge dynamiquement tous les modules disponibles dans le dossier modules"""
-    logger.info("Chargement des modules...")
-    modules_package = 'modules'
+def register_modules(app, lazy=None):
+    """
+    Charge les modules du dossier modules en une seule passe de découverte. Hors mode debug,
+    le manifeste de la découverte précédente permet de différer l'import de chaque module
+    jusqu'à la première requête sur ses routes.
     
-    try:
-        modules_package_obj = importlib.import_module(modules_package)
-        modules_path = modules_package_obj.__path__
+    Args:
+        app (Flask): Application Flask
+        lazy (bool, optional): Import différé. Par défaut selon APP_CONFIG['MODULES_LAZY_LOAD'].
         
-        for _, module_name, is_pkg in pkgutil.iter_modules(modules_path):
-            if is_pkg:  # Assure que c'est un package (dossier avec __init__.py)
-                try:
-                    module = importlib.import_module(f'{modules_package}.{module_name}')
-                    if hasattr(module, 'register_routes'):
-                        logger.info(f"Enregistrement du module: {module_name}")
-                        module.register_routes(app)
-                    else:
-                        logger.warning(f"Module {module_name} n'a pas de fonction register_routes")
-                except Exception as e:
-                    logger.error(f"Erreur lors du chargement du module {module_name}: {str(e)}")
-    except ImportError as e:
-        logger.error(f"Erreur d'importation pour {modules_package}: {str(e)}")
-    except Exception as e:
-        logger.error(f"Erreur inattendue lors du chargement des modules: {str(e)}")
+    Returns:
+        LazyModuleLoader: Middleware de chargement différé, ou None si tout a été importé
+    """
+    if not APP_CONFIG.get('MODULES_ENABLED', True):
+        return None
+    logger.info("Chargement des modules...")
+    from modules.module_registry import module_registry
+    
+    if lazy is None:
+        lazy = APP_CONFIG.get('MODULES_LAZY_LOAD', True)
+    # Flask refuse l'ajout de routes après la première requête en mode debug
+    return module_registry.setup(app, lazy=lazy and not app.debug)
 
-# Endpoint pour la liste des modules disponibles
-@app.route('/api/modules', methods=['GET'])
-def get_modules():
-    """Renvoie la liste des modules disponibles pour le frontend"""
-    from modules import module_registry
-    return jsonify(module_registry.get_modules_info())
+def register_hooks(app):
+    """Installe la mesure des durées, les ETag et la compression des réponses"""
+    
+    # Mesure de la durée de chaque requête (horloge monotone)
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+    
+    @app.after_request
+    def record_request_duration(response):
+        start = g.pop('request_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.http_request_duration.observe(
+                time.perf_counter() - start, request.method, route, str(response.status_code)
+            )
+        return response
+    
+    # ETag, réponses 304 et compression négociée (exécuté avant la mesure de durée)
+    @app.after_request
+    def compress_response(response):
+        return finalize_response(response, SERVER_CONFIG)
 
-# Servir le frontend React en production
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    if path != "" and os.path.exists(app.static_folder + '/' + path):
-        return send_from_directory(app.static_folder, path)
-    else:
-        return send_from_directory(app.static_folder, 'index.html')
+def register_core_routes(app):
+    """Enregistre les routes propres au serveur (métriques, modules, frontend)"""
+    static_index = app.extensions['static_index']
+    
+    # Endpoint des métriques de performance au format Prometheus
+    @app.route('/api/metrics', methods=['GET'])
+    def get_metrics():
+        """Renvoie les métriques du processus au format texte Prometheus"""
+        return app.response_class(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+    
+    # Endpoint pour la liste des modules disponibles
+    @app.route('/api/modules', methods=['GET'])
+    def get_modules():
+        """Renvoie la liste des modules disponibles pour le frontend"""
+        from modules import module_registry
+        # Instantané déjà sérialisé, recalculé seulement quand le registre change ; 304 si l'ETag correspond
+        body, etag = module_registry.get_modules_snapshot()
+        response = serializer.json_response(body, headers={'Cache-Control': 'no-cache'})
+        response.set_etag(etag)
+        return response
+    
+    # Servir le frontend React en production
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        # Recherche dans l'index ; les chemins inconnus de l'application monopage reçoivent index.html
+        entry = static_index.lookup(path) or static_index.lookup('index.html')
+        if entry is None:
+            abort(404)
+        response = static_index.response(entry, request, app.response_class)
+        if response is None:
+            abort(404)
+        return response
+
+def run_production(workers=None, threads=None):
+    """
+    Démarre le serveur de production Gunicorn (plusieurs processus, threads par processus)
+    avec la configuration de gunicorn_config.py
+    
+    Args:
+        workers (int, optional): Nombre de processus. Par défaut SERVER_CONFIG['WORKERS'].
+        threads (int, optional): Threads par processus. Par défaut SERVER_CONFIG['THREADS'].
+    """
+    from gunicorn.app.base import BaseApplication
+    import gunicorn_config
+    
+    options = gunicorn_config.options(workers=workers, threads=threads)
+    
+    class ProductionApplication(BaseApplication):
+        """Application Gunicorn intégrée, chargée par la fabrique create_app"""
+        
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            # Avec preload_app, l'application est créée une fois dans le maître puis partagée
+            # par fork : les modules sont alors tous importés avant le fork
+            return create_app(lazy_modules=False if options.get('preload_app') else None)
+    
+    logger.info(f"Démarrage Gunicorn: {options['workers']} processus x {options['threads']} threads sur {options['bind']}")
+    ProductionApplication().run()
+
+def ssl_context_from_config():
+    """
+    Renvoie les chemins (certificat, clé) si HTTPS est activé et les certificats présents
+    
+    Returns:
+        tuple: (cert_path, key_path), ou None
+    """
+    if not SERVER_CONFIG.get('ENABLE_HTTPS', True):
+        return None
+    cert_path = os.path.join('config', 'ssl', 'cert.pem')
+    key_path = os.path.join('config', 'ssl', 'key.pem')
+    
+    if os.path.exists(cert_path) and os.path.exists(key_path):
+        logger.info("SSL activé avec les certificats existants")
+        return cert_path, key_path
+    logger.warning("Certificats SSL non trouvés, HTTPS désactivé")
+    return None
 
 # Point d'entrée principal
 if __name__ == '__main__':
-    register_modules()
+    parser = argparse.ArgumentParser(description="Serveur du Dashboard KPI Sécurité")
+    parser.add_argument('--production', action='store_true',
+                        help="Serveur Gunicorn multi-processus au lieu du serveur de développement")
+    parser.add_argument('--workers', type=int, help="Nombre de processus (mode production)")
+    parser.add_argument('--threads', type=int, help="Threads par processus (mode production)")
+    args = parser.parse_args()
     
-    # Configuration SSL pour HTTPS
-    ssl_context = None
-    if SERVER_CONFIG.get('ENABLE_HTTPS', True):
-        cert_path = os.path.join('config', 'ssl', 'cert.pem')
-        key_path = os.path.join('config', 'ssl', 'key.pem')
-        
-        if os.path.exists(cert_path) and os.path.exists(key_path):
-            ssl_context = (cert_path, key_path)
-            logger.info("SSL activé avec les certificats existants")
-        else:
-            logger.warning("Certificats SSL non trouvés, HTTPS désactivé")
-    
-    # Démarrage du serveur
-    app.run(
-        host=SERVER_CONFIG.get('HOST', '0.0.0.0'),
-        port=SERVER_CONFIG.get('PORT', 5001),
-        ssl_context=ssl_context,
-        debug=SERVER_CONFIG.get('DEBUG', False)
-    )
+    if args.production:
+        run_production(args.workers, args.threads)
+    else:
+        # Serveur de développement Werkzeug (un seul processus)
+        app = create_app()
+        # Avec le rechargeur du mode debug, seul le processus enfant (WERKZEUG_RUN_MAIN) sert les requêtes
+        if APP_CONFIG.get('MODULES_ENABLED', True) and (not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+            try:
+                from modules.dashboard.refresh import start_background_refresh
+                start_background_refresh()
+            except Exception as e:
+                logger.error(f"Planificateur de rafraîchissement non démarré: {str(e)}")
+        app.run(
+            host=SERVER_CONFIG.get('HOST', '0.0.0.0'),
+            port=SERVER_CONFIG.get('PORT', 5001),
+            ssl_context=ssl_context_from_config(),
+            debug=SERVER_CONFIG.get('DEBUG', False)
+        )
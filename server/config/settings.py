@@ -7,6 +7,28 @@ SERVER_CONFIG = {
     'PORT': 5001,       # Port spécifié dans les exigences
     'DEBUG': False,     # Désactivé en production
     'ENABLE_HTTPS': True,  # Activer HTTPS
+    'WORKERS': 0,  # Processus Gunicorn en mode production (0 = 2 x CPU + 1)
+    'THREADS': 4,  # Threads par processus (worker gthread si > 1)
+    'PRELOAD_APP': True,  # Importer l'application et les modules dans le maître avant le fork
+    'WORKER_TIMEOUT': 30,  # secondes sans réponse avant redémarrage d'un processus
+    'GRACEFUL_TIMEOUT': 30,  # secondes laissées aux requêtes en cours lors d'un arrêt ou rechargement
+    'KEEPALIVE': 5,  # secondes de maintien des connexions HTTP inactives
+    'MAX_REQUESTS': 10000,  # Requêtes avant recyclage d'un processus (0 = jamais)
+    'MAX_REQUESTS_JITTER': 1000,  # Variation aléatoire pour éviter les recyclages simultanés
+    'COMPRESSION_ENABLED': True,  # Compression gzip / brotli négociée selon Accept-Encoding
+    'COMPRESSION_MIN_SIZE': 1024,  # octets, seuil en dessous duquel la réponse n'est pas compressée
+    'COMPRESSION_MAX_FILE_SIZE': 4 * 1024 * 1024,  # octets, fichiers statiques compressés à la volée
+    'GZIP_LEVEL': 6,  # 1 (rapide) à 9 (compact)
+    'BROTLI_ENABLED': True,  # Proposer brotli si le paquet est installé
+    'BROTLI_QUALITY': 5,  # 0 (rapide) à 11 (compact)
+    'STATIC_MAX_AGE': 365 * 24 * 3600,  # secondes, ressources du build dont le nom contient une empreinte
+    'STATIC_PRELOAD_MAX_SIZE': 1024 * 1024,  # octets, fichiers du build gardés en mémoire
+    'STATIC_INDEX_REFRESH': 'background',  # background (thread d'arrière-plan par processus), startup (index
+                                           # construit au démarrage seulement, rechargement HUP après un build),
+                                           # request (vérification pendant les requêtes, forcé en debug)
+    'STATIC_INDEX_REFRESH_INTERVAL': 5,  # secondes entre deux vérifications du dossier de build (0 = jamais)
+    'STATIC_GZIP_LEVEL': 9,  # Compression des fichiers du build, calculée une seule fois au démarrage
+    'STATIC_BROTLI_QUALITY': 11,
 }
 
 # Configuration des connecteurs de données
@@ -18,19 +40,123 @@ DATABASE_CONFIG = {
         'PASSWORD': '',
         'HOST': '',
         'PORT': '',
+        'POOL_ENABLED': True,  # Pool de connexions partagé entre les threads
+        'POOL_MIN_SIZE': 1,
+        'POOL_MAX_SIZE': 8,
+        'POOL_TIMEOUT': 10,  # secondes d'attente maximale d'une connexion libre
+        'POOL_HEALTH_CHECK_INTERVAL': 30,  # secondes d'inactivité avant revérification
+        'POOL_LEASE': 'operation',  # operation, thread
+        'JOURNAL_MODE': 'wal',  # Lectures non bloquées par les écritures (ingestion)
+        'SYNCHRONOUS': 'normal',  # Sûr en mode WAL, évite un fsync à chaque transaction
+        'CACHE_SIZE': -64000,  # Cache de pages par connexion (négatif : en Kio, ici environ 64 Mo)
+        'MMAP_SIZE': 256 * 1024 * 1024,  # Lecture du fichier par projection mémoire (256 Mo)
+        'TEMP_STORE': 'memory',  # Tables et index temporaires en mémoire
+        'BUSY_TIMEOUT': 5,  # secondes d'attente d'un verrou d'écriture
+        'CACHED_STATEMENTS': 256,  # Requêtes préparées conservées par connexion
+        'READ_ONLY_QUERIES': True,  # fetch_data / fetch_iter sur des connexions en lecture seule
+        'READ_POOL_MAX_SIZE': 16,  # Connexions de lecture simultanées
     },
     'API': {
         'BASE_URL': '',
         'AUTH_TOKEN': '',
         'TIMEOUT': 10,  # secondes
+        'POOL_CONNECTIONS': 10,  # Nombre d'hôtes dont les connexions keep-alive sont conservées
+        'POOL_MAXSIZE': 10,  # Connexions keep-alive conservées par hôte
+        'MAX_WORKERS': 8,  # Appels parallèles pour fetch_many
+        'HTTP_CACHE_ENABLED': True,  # Requêtes conditionnelles ETag / Last-Modified
+        'HTTP_CACHE_MAX_ENTRIES': 256,
+        'HTTP_CACHE_MAX_BYTES': 32 * 1024 * 1024,  # 32 Mo
+        'RETRIES': 2,  # Nouvelles tentatives (GET, PUT, DELETE)
+        'BACKOFF_BASE': 0.2,  # secondes, doublé à chaque tentative (avec gigue)
+        'BACKOFF_MAX': 5,  # secondes
+        'LATENCY_BUDGET': 15,  # secondes, durée maximale d'un appel tentatives comprises
+        'BREAKER_FAILURE_THRESHOLD': 5,  # Échecs consécutifs avant ouverture du disjoncteur
+        'BREAKER_RECOVERY_TIMEOUT': 30,  # secondes avant un appel de test
     }
 }
 
+# Ingestion des sources API dans la base KPI (python -m database.ingest)
+INGEST_CONFIG = {
+    'BATCH_SIZE': 5000,  # Enregistrements écrits par transaction
+    'SOURCES': {
+        # Chaque source : endpoint paginé, table cible et correspondance colonne -> champ source
+        # (chemin pointé accepté). Les champs opened_at, closed_at et updated_at sont des dates.
+        'landesk_tickets': {
+            'ENDPOINT': 'tickets',
+            'TABLE': 'tickets',
+            'PARAMS': {},
+            'PAGINATION': {'style': 'offset', 'records_key': 'data', 'page_size': 1000, 'prefetch': 4},
+            'FIELDS': {
+                'id': 'id',
+                'technology': 'category',
+                'assignee': 'assignee.name',
+                'severity': 'priority',
+                'status': 'status',
+                'opened_at': 'created_at',
+                'closed_at': 'closed_at',
+                'updated_at': 'updated_at',
+            },
+            # Synchronisation incrémentale (python -m database.sync)
+            'SYNC': {
+                'MODE': 'since',  # since (date de modification), cursor (jeton opaque), full
+                'INTERVAL': 300,  # secondes entre deux synchronisations planifiées (SCHEDULER_CONFIG)
+                'SINCE_PARAM': 'updated_since',
+                'LOOKBACK': 600,  # secondes redemandées avant le point de reprise (mises à jour tardives)
+                'FULL_RESYNC_INTERVAL': 7 * 24 * 3600,  # Relecture complète hebdomadaire (suppressions)
+            },
+        },
+        'siem_incidents': {
+            'ENDPOINT': 'incidents',
+            'TABLE': 'incidents',
+            'PARAMS': {},
+            'PAGINATION': {'style': 'cursor', 'records_key': 'data', 'page_size': 1000,
+                           'next_cursor_key': 'meta.next_cursor'},
+            'FIELDS': {
+                'id': 'id',
+                'title': 'title',
+                'technology': 'source',
+                'assignee': 'owner',
+                'severity': 'severity',
+                'status': 'status',
+                'opened_at': 'detected_at',
+                'closed_at': 'resolved_at',
+                'updated_at': 'updated_at',
+                'deleted_at': 'deleted_at',  # Suppressions publiées dans le flux de modifications
+            },
+            'SYNC': {
+                'MODE': 'cursor',
+                'INTERVAL': 120,
+                'CURSOR_PARAM': 'sync_token',
+                'CURSOR_KEY': 'meta.sync_token',
+                'FULL_RESYNC_INTERVAL': 30 * 24 * 3600,
+            },
+        },
+    },
+}
+
+# Rafraîchissement en arrière-plan : synchronisations planifiées et pré-chauffage du cache du
+# tableau de bord (démarré dans chaque processus Gunicorn, ou python -m modules.dashboard.refresh)
+SCHEDULER_CONFIG = {
+    'ENABLED': True,  # Démarrer le planificateur avec le serveur
+    'SYNC_IN_PROCESS': True,  # Synchroniser les sources depuis le serveur (False si la commande tourne à part)
+    'WARM_INTERVAL': 60,  # secondes entre deux pré-chauffages des filtres de la période courante
+    'WARM_FORMATS': ['rows'],  # Formats pré-calculés (rows, columnar)
+    'JITTER': 0.1,  # Variation aléatoire des intervalles (±10 %), évite les passages simultanés
+    'MAX_WORKERS': 2,  # Tâches exécutées simultanément par processus
+}
+
 # Paramètres de l'application
 APP_CONFIG = {
     'CACHE_TIMEOUT': 300,  # Durée du cache en secondes (5 minutes)
+    'CACHE_MAX_ENTRIES': 512,  # Nombre maximal de réponses conservées en cache
+    'CACHE_MAX_BYTES': 32 * 1024 * 1024,  # Taille maximale du cache de réponses (32 Mo)
     'MODULES_ENABLED': True,  # Activer la découverte automatique des modules
+    'MODULES_LAZY_LOAD': True,  # Importer chaque module à la première requête sur ses routes (hors debug)
     'LOG_LEVEL': 'INFO',  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    'DASHBOARD_SOURCE': 'mock',  # mock (données fictives), rollups (agrégats de la base KPI), tickets (calcul direct)
+    'ROLLUP_REFRESH_INTERVAL': 60,  # secondes entre deux rafraîchissements incrémentaux des agrégats
+    'JSON_BACKEND': 'auto',  # auto (orjson si installé), orjson ou json (bibliothèque standard)
+    'EXPORT_BATCH_SIZE': 1000,  # Lignes lues par lot pour l'export en flux des tickets (/api/dashboard/tickets/export)
 }
 
 # Chemins importants
@@ -0,0 +1 @@
+# __init__.py - Connecteurs des sources de données (SQL, API REST)
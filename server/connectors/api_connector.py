@@ -0,0 +1,747 @@
+# api_connector.py - Connecteur pour les API REST
+import asyncio
+import logging
+import queue
+import threading
+import time
+import requests
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from .base_connector import BaseConnector
+from .circuit_breaker import CircuitBreaker, backoff_delay, parse_retry_after
+from utils.cache import TTLCache
+from utils.metrics import connector_request_duration, registry
+
+logger = logging.getLogger(__name__)
+
+# Méthodes HTTP pouvant être rejouées sans effet de bord
+IDEMPOTENT_METHODS = ('GET', 'PUT', 'DELETE')
+SUPPORTED_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+class PaginationError(Exception):
+    """Levée lorsqu'une page ne peut pas être récupérée pendant un parcours paginé"""
+    pass
+
+class APIConnector(BaseConnector):
+    """
+    Connecteur pour les API REST.
+    Permet de récupérer des données depuis des API externes.
+    """
+    
+    def __init__(self, name, config):
+        """
+        Initialise un connecteur API
+        
+        Args:
+            name (str): Nom du connecteur
+            config (dict): Configuration avec les clés :
+                - BASE_URL: URL de base de l'API
+                - AUTH_TOKEN: Token d'authentification (optionnel)
+                - TIMEOUT: Timeout en secondes (par défaut: 10)
+                - HEADERS: En-têtes HTTP supplémentaires (optionnel)
+                - POOL_CONNECTIONS: Nombre d'hôtes dont les connexions sont conservées (par défaut: 10)
+                - POOL_MAXSIZE: Connexions keep-alive conservées par hôte (par défaut: 10)
+                - MAX_WORKERS: Requêtes exécutées en parallèle par fetch_many (par défaut: 8)
+                - HTTP_CACHE_ENABLED: Requêtes GET conditionnelles (ETag / Last-Modified) (par défaut: True)
+                - HTTP_CACHE_MAX_ENTRIES: Nombre maximal de réponses en cache (par défaut: 256)
+                - HTTP_CACHE_MAX_BYTES: Taille maximale des réponses en cache (par défaut: 32 Mo)
+                - RETRIES: Nouvelles tentatives pour les méthodes idempotentes (par défaut: 2)
+                - BACKOFF_BASE / BACKOFF_MAX: Délais d'attente exponentiels en secondes (par défaut: 0.2 / 5)
+                - RETRY_STATUSES: Codes HTTP déclenchant une nouvelle tentative (par défaut: 429, 502, 503, 504)
+                - LATENCY_BUDGET: Durée maximale d'un appel, nouvelles tentatives comprises (par défaut: TIMEOUT)
+                - BREAKER_FAILURE_THRESHOLD: Échecs consécutifs avant ouverture du disjoncteur (par défaut: 5)
+                - BREAKER_RECOVERY_TIMEOUT: Secondes avant un appel de test après ouverture (par défaut: 30)
+        """
+        super().__init__(name, config)
+        self.base_url = config.get('BASE_URL', '')
+        self.auth_token = config.get('AUTH_TOKEN', '')
+        self.timeout = config.get('TIMEOUT', 10)
+        self.headers = dict(config.get('HEADERS', {}))
+        self.pool_connections = config.get('POOL_CONNECTIONS', 10)
+        self.pool_maxsize = config.get('POOL_MAXSIZE', 10)
+        self.max_workers = config.get('MAX_WORKERS', 8)
+        
+        # Configuration des en-têtes d'authentification si un token est fourni
+        if self.auth_token:
+            self.headers['Authorization'] = f"Bearer {self.auth_token}"
+        self.headers.setdefault('Connection', 'keep-alive')
+            
+        self.session = None
+        self.executor = None
+        
+        # Cache des réponses GET revalidées par If-None-Match / If-Modified-Since
+        self.http_cache = None
+        if config.get('HTTP_CACHE_ENABLED', True):
+            self.http_cache = TTLCache(
+                f"http:{name}",
+                ttl=None,
+                max_entries=config.get('HTTP_CACHE_MAX_ENTRIES', 256),
+                max_bytes=config.get('HTTP_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+            )
+            registry.track_cache(self.http_cache)
+        self.not_modified = 0  # Réponses 304 servies depuis le cache
+        
+        # Nouvelles tentatives et disjoncteur
+        self.retries = config.get('RETRIES', 2)
+        self.backoff_base = config.get('BACKOFF_BASE', 0.2)
+        self.backoff_max = config.get('BACKOFF_MAX', 5)
+        self.retry_statuses = tuple(config.get('RETRY_STATUSES', (429, 502, 503, 504)))
+        self.latency_budget = config.get('LATENCY_BUDGET', self.timeout)
+        self.circuit_breaker = CircuitBreaker(
+            name,
+            failure_threshold=config.get('BREAKER_FAILURE_THRESHOLD', 5),
+            recovery_timeout=config.get('BREAKER_RECOVERY_TIMEOUT', 30)
+        )
+        self.request_count = 0
+        self.retry_count = 0
+        self.total_request_time = 0.0
+        # Compteurs et création de l'exécuteur, partagés par les threads des appels parallèles
+        self._lock = threading.Lock()
+    
+    def connect(self):
+        """
+        Crée une session HTTP persistante
+        
+        Returns:
+            bool: True si la session a été créée avec succès, False sinon
+        """
+        try:
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            
+            # Pool de connexions keep-alive par hôte, dimensionné pour les appels parallèles
+            adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            self.is_connected = True
+            logger.info(f"Session API créée pour {self.base_url}")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de la création de la session API: {str(e)}")
+            self.is_connected = False
+            return False
+    
+    def disconnect(self):
+        """
+        Ferme la session HTTP
+        
+        Returns:
+            bool: True si la session a été fermée avec succès, False sinon
+        """
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=False)
+        if self.session:
+            try:
+                self.session.close()
+                self.session = None
+                self.is_connected = False
+                logger.info("Session API fermée")
+                return True
+            except Exception as e:
+                logger.error(f"Erreur lors de la fermeture de la session API: {str(e)}")
+                return False
+        return True
+    
+    def fetch_data(self, endpoint, params=None):
+        """
+        Récupère des données depuis l'API
+        
+        Args:
+            endpoint (str): Endpoint API à interroger (sera ajouté à l'URL de base)
+            params (dict, optional): Paramètres pour la requête API. Par défaut None.
+                Peut contenir :
+                - method: Méthode HTTP (GET par défaut)
+                - data: Données à envoyer pour POST/PUT
+                - query_params: Paramètres d'URL (?param=value)
+                
+        Returns:
+            dict: Résultats de la requête API
+        """
+        if not self.is_connected:
+            if not self.connect():
+                return {"error": "Non connecté à l'API"}
+        
+        return self._request(endpoint, params, self.timeout)
+    
+    def fetch_many(self, endpoints, deadline=None):
+        """
+        Récupère plusieurs endpoints en parallèle.
+        Le temps total correspond à l'appel le plus lent, et non à la somme des appels.
+        
+        Args:
+            endpoints (dict|list): Requêtes à exécuter, sous forme {clé: endpoint} ou
+                {clé: (endpoint, params)}, ou liste d'endpoints / de tuples (endpoint, params)
+            deadline (float, optional): Délai global en secondes pour l'ensemble des appels.
+                Par défaut le TIMEOUT du connecteur.
+                
+        Returns:
+            dict|list: Résultats au format de fetch_data, indexés comme endpoints. Les appels
+                non terminés à l'échéance renvoient une erreur.
+        """
+        if not self.is_connected:
+            if not self.connect():
+                error = {"error": "Non connecté à l'API"}
+                if isinstance(endpoints, dict):
+                    return {key: dict(error) for key in endpoints}
+                return [dict(error) for _ in endpoints]
+        
+        items = list(endpoints.items()) if isinstance(endpoints, dict) else list(enumerate(endpoints))
+        deadline = self.timeout if deadline is None else deadline
+        expires_at = time.monotonic() + deadline
+        
+        executor = self._get_executor()
+        futures = {}
+        for key, request in items:
+            endpoint, params = request if isinstance(request, tuple) else (request, None)
+            futures[key] = executor.submit(self._request, endpoint, params, expires_at=expires_at)
+        
+        wait(list(futures.values()), timeout=max(0, expires_at - time.monotonic()))
+        return self._collect(endpoints, items, futures, deadline)
+    
+    async def fetch_many_async(self, endpoints, deadline=None):
+        """
+        Variante asynchrone de fetch_many pour les vues async def : la coroutine attend
+        les appels sans bloquer la boucle d'événements, et plusieurs fetch_many_async
+        lancés ensemble partagent l'exécuteur (MAX_WORKERS appels simultanés au plus).
+        
+        Args:
+            endpoints (dict|list): Requêtes à exécuter (voir fetch_many)
+            deadline (float, optional): Délai global en secondes. Par défaut le TIMEOUT du connecteur.
+                
+        Returns:
+            dict|list: Résultats au format de fetch_data, indexés comme endpoints
+        """
+        if not self.is_connected:
+            if not self.connect():
+                error = {"error": "Non connecté à l'API"}
+                if isinstance(endpoints, dict):
+                    return {key: dict(error) for key in endpoints}
+                return [dict(error) for _ in endpoints]
+        
+        items = list(endpoints.items()) if isinstance(endpoints, dict) else list(enumerate(endpoints))
+        deadline = self.timeout if deadline is None else deadline
+        expires_at = time.monotonic() + deadline
+        
+        futures = {}
+        for key, request in items:
+            endpoint, params = request if isinstance(request, tuple) else (request, None)
+            futures[key] = self._run_blocking(self._request, endpoint, params, expires_at=expires_at)
+        
+        if futures:
+            await asyncio.wait(list(futures.values()), timeout=max(0, expires_at - time.monotonic()))
+        return self._collect(endpoints, items, futures, deadline)
+    
+    def _collect(self, endpoints, items, futures, deadline):
+        """
+        Rassemble les résultats de fetch_many / fetch_many_async ; les appels non terminés
+        à l'échéance sont annulés et renvoient une erreur
+        
+        Returns:
+            dict|list: Résultats indexés comme endpoints
+        """
+        results = {}
+        for key, future in futures.items():
+            if future.done() and not future.cancelled():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    results[key] = {"error": str(e)}
+            else:
+                future.cancel()
+                logger.error(f"Délai global de {deadline}s dépassé pour la requête {key}")
+                results[key] = {"error": "Délai global dépassé"}
+        
+        if isinstance(endpoints, dict):
+            return results
+        return [results[key] for key, _ in items]
+    
+    def fetch_pages(self, endpoint, params=None, pagination=None):
+        """
+        Parcourt une ressource paginée et renvoie les enregistrements au fil de l'eau.
+        Les pages suivantes sont téléchargées en parallèle pendant la consommation de la page
+        courante, dans la limite de 'prefetch' pages d'avance.
+        
+        Args:
+            endpoint (str): Endpoint API de la première page
+            params (dict, optional): Paramètres de la requête (voir fetch_data). Par défaut None.
+            pagination (dict, optional): Configuration de la pagination :
+                - style: 'offset', 'cursor' ou 'link' (en-tête Link rel="next") (par défaut: 'offset')
+                - records_key: Clé du corps contenant les enregistrements, chemin pointé accepté
+                  (par défaut: None, le corps est la liste des enregistrements)
+                - page_size: Taille des pages (par défaut: 100)
+                - offset_param / limit_param: Paramètres d'URL du style offset (par défaut: 'offset' / 'limit')
+                - cursor_param: Paramètre d'URL du curseur (par défaut: 'cursor')
+                - next_cursor_key: Clé du corps contenant le curseur suivant (par défaut: 'next_cursor')
+                - prefetch: Nombre de pages téléchargées à l'avance (par défaut: 2)
+                - max_pages: Nombre maximal de pages (par défaut: None, sans limite)
+                - on_page: Fonction appelée avec le corps de chaque page avant ses enregistrements
+                  (jeton de reprise d'un flux de modifications, ...) (par défaut: None)
+                
+        Yields:
+            object: Un enregistrement
+            
+        Raises:
+            PaginationError: Si une page renvoie une erreur
+        """
+        if not self.is_connected:
+            if not self.connect():
+                raise PaginationError("Non connecté à l'API")
+        
+        pagination = pagination or {}
+        style = pagination.get('style', 'offset')
+        if style == 'offset':
+            pages = self._offset_pages(endpoint, params or {}, pagination)
+        elif style in ('cursor', 'link'):
+            pages = self._chained_pages(endpoint, params or {}, pagination, style)
+        else:
+            raise ValueError(f"Style de pagination non supporté: {style}")
+        
+        records_key = pagination.get('records_key')
+        on_page = pagination.get('on_page')
+        for body in pages:
+            if on_page is not None:
+                on_page(body)
+            records = lookup_path(body, records_key) if records_key else body
+            for record in records or []:
+                yield record
+    
+    def _offset_pages(self, endpoint, params, pagination):
+        """
+        Génère les pages d'une pagination par offset ; les offsets suivants étant connus
+        à l'avance, jusqu'à 'prefetch' pages sont téléchargées simultanément.
+        """
+        page_size = pagination.get('page_size', 100)
+        prefetch = max(0, pagination.get('prefetch', 2))
+        max_pages = pagination.get('max_pages')
+        offset_param = pagination.get('offset_param', 'offset')
+        limit_param = pagination.get('limit_param', 'limit')
+        records_key = pagination.get('records_key')
+        executor = self._get_executor()
+        
+        def page_params(page):
+            page_query = dict(params.get('query_params') or {})
+            page_query[offset_param] = page * page_size
+            page_query[limit_param] = page_size
+            return dict(params, query_params=page_query)
+        
+        in_flight = deque()
+        next_page = 0
+        try:
+            while True:
+                # Maintenir la fenêtre de pages en cours de téléchargement
+                while len(in_flight) <= prefetch and (max_pages is None or next_page < max_pages):
+                    in_flight.append(executor.submit(self._request, endpoint, page_params(next_page)))
+                    next_page += 1
+                if not in_flight:
+                    return
+                
+                result = in_flight.popleft().result()
+                if "error" in result:
+                    raise PaginationError(f"Erreur de pagination sur {endpoint}: {result['error']}")
+                
+                body = result["data"]
+                yield body
+                
+                records = lookup_path(body, records_key) if records_key else body
+                if not records or len(records) < page_size:
+                    return
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    def _chained_pages(self, endpoint, params, pagination, style):
+        """
+        Génère les pages d'une pagination chaînée (curseur ou en-tête Link), où chaque page
+        indique la suivante. Un thread producteur télécharge les pages dans une file bornée :
+        il prend au plus 'prefetch' pages d'avance sur le consommateur.
+        """
+        prefetch = max(1, pagination.get('prefetch', 2))
+        max_pages = pagination.get('max_pages')
+        cursor_param = pagination.get('cursor_param', 'cursor')
+        next_cursor_key = pagination.get('next_cursor_key', 'next_cursor')
+        page_size = pagination.get('page_size')
+        
+        pages = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+        done = object()
+        
+        def put(item):
+            # Attendre une place dans la file sans bloquer indéfiniment si le consommateur s'arrête
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            page_endpoint = endpoint
+            page_query = dict(params.get('query_params') or {})
+            if page_size and style == 'cursor':
+                page_query.setdefault(pagination.get('limit_param', 'limit'), page_size)
+            count = 0
+            try:
+                while not stop.is_set() and (max_pages is None or count < max_pages):
+                    result = self._request(page_endpoint, dict(params, query_params=page_query), raw_response=True)
+                    if "error" in result:
+                        put(PaginationError(f"Erreur de pagination sur {endpoint}: {result['error']}"))
+                        return
+                    response = result.pop("response")
+                    if not put(result["data"]):
+                        return
+                    count += 1
+                    
+                    if style == 'cursor':
+                        cursor = lookup_path(result["data"], next_cursor_key)
+                        if not cursor:
+                            break
+                        page_query = dict(page_query, **{cursor_param: cursor})
+                    else:
+                        next_link = response.links.get('next', {}).get('url') if response is not None else None
+                        if not next_link:
+                            break
+                        page_endpoint, page_query = next_link, None
+            except Exception as e:
+                put(PaginationError(str(e)))
+                return
+            put(done)
+        
+        producer = threading.Thread(target=produce, name=f"{self.name}-pagination", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+    
+    def _get_async_executor(self):
+        """Les variantes asynchrones partagent l'exécuteur de fetch_many (MAX_WORKERS)"""
+        return self._get_executor()
+    
+    def _get_executor(self):
+        """
+        Renvoie le pool de threads partagé par les appels parallèles du connecteur
+        
+        Returns:
+            ThreadPoolExecutor: Pool de threads
+        """
+        executor = self.executor
+        if executor is None:
+            with self._lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                executor = self.executor
+        return executor
+    
+    def _request(self, endpoint, params=None, timeout=None, expires_at=None, raw_response=False):
+        """
+        Exécute une requête HTTP avec nouvelles tentatives, dans la limite du budget de latence,
+        et sous la protection du disjoncteur du connecteur
+        
+        Args:
+            endpoint (str): Endpoint API à interroger
+            params (dict, optional): Paramètres de la requête (voir fetch_data). Par défaut None.
+            timeout (float, optional): Timeout de chaque tentative. Par défaut le TIMEOUT du connecteur.
+            expires_at (float, optional): Échéance absolue (time.monotonic()) qui borne le timeout.
+            raw_response (bool, optional): Ajouter l'objet requests.Response au résultat
+                sous la clé 'response'. Par défaut False.
+            
+        Returns:
+            dict: Résultats de la requête API
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        if self.latency_budget:
+            budget_end = start + self.latency_budget
+            expires_at = budget_end if expires_at is None else min(expires_at, budget_end)
+        
+        method = (params or {}).get('method', 'GET').upper()
+        if method not in SUPPORTED_METHODS:
+            return {"error": f"Méthode HTTP non supportée: {method}"}
+        retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        
+        try:
+            while True:
+                attempt_timeout = timeout
+                if expires_at is not None:
+                    remaining = expires_at - time.monotonic()
+                    if remaining <= 0:
+                        return {"error": "Délai global dépassé"}
+                    attempt_timeout = min(timeout, remaining)
+                
+                if not self.circuit_breaker.allow_request():
+                    return {
+                        "error": f"Source {self.name} indisponible (disjoncteur ouvert), "
+                                 f"nouvel essai dans {self.circuit_breaker.retry_in():.0f}s",
+                        "circuit_open": True
+                    }
+                
+                result = self._send(endpoint, params, attempt_timeout, raw_response)
+                retryable = result.pop("retryable", False)
+                retry_after = result.pop("retry_after", None)
+                
+                # Seules les erreurs client (4xx) ne traduisent pas une défaillance de la source
+                if not self._is_source_failure(result, retryable):
+                    self.circuit_breaker.record_success()
+                    return result
+                
+                self.circuit_breaker.record_failure(result.get("error"))
+                if not retryable or attempt >= retries:
+                    return result
+                
+                attempt += 1
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                if expires_at is not None and time.monotonic() + delay >= expires_at:
+                    logger.warning(f"Budget de latence insuffisant pour une nouvelle tentative sur {endpoint}")
+                    return result
+                
+                with self._lock:
+                    self.retry_count += 1
+                logger.warning(f"Nouvelle tentative {attempt}/{retries} sur {endpoint} dans {delay:.2f}s")
+                time.sleep(delay)
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.request_count += 1
+                self.total_request_time += elapsed
+            connector_request_duration.observe(elapsed, self.name, self.__class__.__name__, method)
+    
+    @staticmethod
+    def _is_source_failure(result, retryable):
+        """
+        Indique si le résultat d'une tentative doit être compté comme un échec par le disjoncteur
+        
+        Args:
+            result (dict): Résultat de _send
+            retryable (bool): Erreur transitoire
+            
+        Returns:
+            bool: True pour toute erreur (exception, réponse 5xx) sauf une réponse 4xx
+        """
+        if retryable:
+            return True
+        if "error" not in result:
+            return False
+        status_code = result.get("status_code")
+        return status_code is None or not 400 <= status_code < 500
+    
+    def _send(self, endpoint, params, timeout, raw_response=False):
+        """
+        Exécute une tentative de requête HTTP sur la session partagée
+        
+        Args:
+            endpoint (str): Endpoint API à interroger
+            params (dict): Paramètres de la requête (voir fetch_data)
+            timeout (float): Timeout de la tentative
+            raw_response (bool, optional): Ajouter l'objet requests.Response au résultat. Par défaut False.
+            
+        Returns:
+            dict: Résultats de la requête API. Les erreurs transitoires portent les clés internes
+                'retryable' et 'retry_after', retirées par _request.
+        """
+        # Extraire les paramètres spécifiques
+        params = params or {}
+        method = params.get('method', 'GET').upper()
+        data = params.get('data')
+        query_params = params.get('query_params')
+        
+        # Construire l'URL complète (les URL absolues, comme celles de l'en-tête Link, sont conservées)
+        if endpoint.startswith(('http://', 'https://')):
+            url = endpoint
+        else:
+            url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        
+        # Validateurs de la dernière réponse connue pour une requête conditionnelle
+        cache_key = None
+        cached = None
+        conditional_headers = None
+        if method == 'GET' and self.http_cache is not None:
+            cache_key = (url, tuple(sorted((k, str(v)) for k, v in (query_params or {}).items())))
+            cached = self.http_cache.get(cache_key)
+            if cached:
+                conditional_headers = {}
+                if cached["etag"]:
+                    conditional_headers['If-None-Match'] = cached["etag"]
+                if cached["last_modified"]:
+                    conditional_headers['If-Modified-Since'] = cached["last_modified"]
+        
+        try:
+            start_time = time.perf_counter()
+            
+            # Exécuter la requête avec la méthode appropriée
+            if method == 'GET':
+                response = self.session.get(url, params=query_params, headers=conditional_headers, timeout=timeout)
+            elif method == 'POST':
+                response = self.session.post(url, json=data, params=query_params, timeout=timeout)
+            elif method == 'PUT':
+                response = self.session.put(url, json=data, params=query_params, timeout=timeout)
+            elif method == 'DELETE':
+                response = self.session.delete(url, params=query_params, timeout=timeout)
+            else:
+                return {"error": f"Méthode HTTP non supportée: {method}"}
+            
+            # Calculer le temps d'exécution
+            execution_time = time.perf_counter() - start_time
+            
+            # Contenu inchangé : servir le corps conservé, décodé à nouveau pour que l'appelant
+            # puisse modifier sa copie sans altérer le cache
+            if response.status_code == 304 and cached:
+                with self._lock:
+                    self.not_modified += 1
+                result = {
+                    "data": json.loads(cached["content"]),
+                    "status_code": response.status_code,
+                    "execution_time": execution_time,
+                    "headers": dict(cached["headers"]),
+                    "from_cache": True
+                }
+                if raw_response:
+                    result["response"] = response
+                return result
+            
+            # Vérifier si la requête a réussi
+            response.raise_for_status()
+            
+            # Analyser la réponse JSON
+            try:
+                result = response.json()
+            except json.JSONDecodeError:
+                # Si la réponse n'est pas du JSON valide
+                output = {
+                    "data": response.text,
+                    "status_code": response.status_code,
+                    "execution_time": execution_time,
+                    "content_type": response.headers.get('Content-Type')
+                }
+                if raw_response:
+                    output["response"] = response
+                return output
+            
+            if cache_key is not None:
+                self._store_validators(cache_key, response)
+            
+            # Renvoyer les résultats
+            output = {
+                "data": result,
+                "status_code": response.status_code,
+                "execution_time": execution_time,
+                "headers": dict(response.headers)
+            }
+            if raw_response:
+                output["response"] = response
+            return output
+            
+        except requests.exceptions.Timeout:
+            logger.error(f"Timeout lors de la requête à {url}")
+            return {"error": "Timeout de la requête", "retryable": True}
+        except requests.exceptions.ConnectionError:
+            logger.error(f"Erreur de connexion à {url}")
+            return {"error": "Erreur de connexion à l'API", "retryable": True}
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Erreur HTTP {e.response.status_code} pour {url}: {str(e)}")
+            return {
+                "error": f"Erreur HTTP {e.response.status_code}",
+                "status_code": e.response.status_code,
+                "response": e.response.text,
+                "retryable": e.response.status_code in self.retry_statuses,
+                "retry_after": e.response.headers.get('Retry-After')
+            }
+        except Exception as e:
+            logger.error(f"Erreur lors de la requête API à {url}: {str(e)}")
+            return {"error": str(e)}
+    
+    def _store_validators(self, cache_key, response):
+        """
+        Conserve une réponse GET et ses validateurs pour les requêtes conditionnelles suivantes.
+        Le corps est gardé brut : le résultat analysé appartient à l'appelant.
+        
+        Args:
+            cache_key (tuple): Clé URL + paramètres
+            response (requests.Response): Réponse HTTP reçue
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            self.http_cache.delete(cache_key)
+            return
+        
+        self.http_cache.set(cache_key, {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content": response.content,
+            "headers": dict(response.headers)
+        }, size=len(response.content))
+    
+    def test_connection(self):
+        """
+        Teste si la connexion à l'API est fonctionnelle
+        
+        Returns:
+            bool: True si la connexion est fonctionnelle, False sinon
+        """
+        if not self.is_connected:
+            if not self.connect():
+                return False
+                
+        try:
+            # Tente une requête simple vers la racine de l'API
+            result = self.fetch_data("/")
+            return "error" not in result and result.get("status_code", 0) < 400
+        except Exception:
+            return False
+    
+    def get_info(self):
+        """
+        Renvoie des informations sur le connecteur
+        
+        Returns:
+            dict: Informations sur le connecteur API
+        """
+        info = super().get_info()
+        info["base_url"] = self.base_url
+        info["circuit_breaker"] = self.circuit_breaker.get_stats()
+        with self._lock:
+            request_count, retry_count = self.request_count, self.retry_count
+            total_request_time, not_modified = self.total_request_time, self.not_modified
+        info["requests"] = {
+            "count": request_count,
+            "retries": retry_count,
+            "total_time": total_request_time,
+            "avg_time": total_request_time / request_count if request_count else 0.0,
+            "latency_budget": self.latency_budget
+        }
+        if self.http_cache is not None:
+            info["http_cache"] = self.http_cache.get_stats()
+            info["http_cache"]["not_modified"] = not_modified
+        return info
+
+def lookup_path(body, path):
+    """
+    Lit une valeur dans un corps JSON à partir d'un chemin pointé (ex: 'meta.next_cursor')
+    
+    Args:
+        body (object): Corps JSON analysé
+        path (str): Chemin des clés séparées par des points
+        
+    Returns:
+        object: Valeur trouvée, ou None si le chemin n'existe pas
+    """
+    value = body
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
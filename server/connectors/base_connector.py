@@ -1,4 +1,6 @@
 # base_connector.py - Classe de base pour tous les connecteurs de données
+import asyncio
+import functools
 import logging
 from abc import ABC, abstractmethod
 
@@ -69,6 +71,51 @@ class BaseConnector(ABC):
         """
         pass
     
+    async def fetch_data_async(self, query, params=None, **kwargs):
+        """
+        Variante asynchrone de fetch_data, utilisable dans une vue async def.
+        Les pilotes restant synchrones, l'appel s'exécute dans un thread de l'exécuteur
+        du connecteur : plusieurs appels attendus ensemble (asyncio.gather) se recouvrent.
+        
+        Args:
+            query (str): Requête ou chemin pour obtenir les données
+            params (dict, optional): Paramètres supplémentaires. Par défaut None.
+            **kwargs: Options propres au connecteur (result_format, ...)
+            
+        Returns:
+            dict: Résultats de la requête
+        """
+        return await self._run_blocking(self.fetch_data, query, params, **kwargs)
+    
+    async def test_connection_async(self):
+        """
+        Variante asynchrone de test_connection
+        
+        Returns:
+            bool: True si la connexion est fonctionnelle, False sinon
+        """
+        return await self._run_blocking(self.test_connection)
+    
+    def _run_blocking(self, func, *args, **kwargs):
+        """
+        Exécute une méthode bloquante dans l'exécuteur du connecteur
+        
+        Returns:
+            asyncio.Future: Résultat à attendre avec await
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self._get_async_executor(), functools.partial(func, *args, **kwargs))
+    
+    def _get_async_executor(self):
+        """
+        Renvoie l'exécuteur des variantes asynchrones. None désigne l'exécuteur par défaut
+        de la boucle ; un connecteur peut le remplacer pour borner ses appels simultanés.
+        
+        Returns:
+            concurrent.futures.Executor: Exécuteur, ou None
+        """
+        return None
+    
     def get_info(self):
         """
         Renvoie des informations sur le connecteur.
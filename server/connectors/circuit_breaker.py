@@ -0,0 +1,172 @@
+# circuit_breaker.py - Disjoncteur et temporisation des nouvelles tentatives pour les connecteurs
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """
+    Disjoncteur protégeant un connecteur contre une source défaillante.
+
+    - closed : les appels passent, les échecs consécutifs sont comptés
+    - open : après 'failure_threshold' échecs, les appels échouent immédiatement
+    - half_open : après 'recovery_timeout' secondes, un appel de test est autorisé ;
+      son succès referme le disjoncteur, son échec le rouvre
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30):
+        """
+        Initialise un disjoncteur
+
+        Args:
+            name (str): Nom du disjoncteur (utilisé dans les logs)
+            failure_threshold (int, optional): Échecs consécutifs avant ouverture. Par défaut 5.
+            recovery_timeout (float, optional): Durée d'ouverture en secondes avant un appel de test. Par défaut 30.
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.state_changed_at = time.monotonic()
+        self.last_failure = None
+        self.short_circuited = 0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        Indique si un appel peut être tenté
+
+        Returns:
+            bool: True si l'appel est autorisé, False s'il doit échouer immédiatement
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    self.short_circuited += 1
+                    return False
+                self._set_state(self.HALF_OPEN)
+
+            # Demi-ouvert : un seul appel de test à la fois
+            if self._probe_in_flight:
+                self.short_circuited += 1
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """Enregistre un appel réussi"""
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+                logger.info(f"Disjoncteur {self.name} refermé")
+
+    def record_failure(self, reason=None):
+        """
+        Enregistre un appel en échec
+
+        Args:
+            reason (str, optional): Description de l'échec
+        """
+        with self._lock:
+            self.failures += 1
+            self.last_failure = reason
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self._set_state(self.OPEN)
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+                logger.warning(f"Disjoncteur {self.name} ouvert après {self.failures} échec(s): {reason}")
+
+    def retry_in(self):
+        """
+        Renvoie le délai avant le prochain appel de test
+
+        Returns:
+            float: Secondes avant la prochaine tentative (0 si le disjoncteur n'est pas ouvert)
+        """
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def get_stats(self):
+        """
+        Renvoie l'état du disjoncteur
+
+        Returns:
+            dict: État, compteurs et durées
+        """
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+                "time_in_state": time.monotonic() - self.state_changed_at,
+                "retry_in": retry_in,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited,
+                "last_failure": self.last_failure
+            }
+
+    def _set_state(self, state):
+        """Change l'état du disjoncteur (le verrou doit être détenu)"""
+        self.state = state
+        self.state_changed_at = time.monotonic()
+
+def backoff_delay(attempt, base=0.2, maximum=5.0):
+    """
+    Calcule un délai d'attente exponentiel avec gigue complète ("full jitter")
+
+    Args:
+        attempt (int): Numéro de la nouvelle tentative (1 pour la première)
+        base (float, optional): Délai de base en secondes. Par défaut 0.2.
+        maximum (float, optional): Délai maximal en secondes. Par défaut 5.
+
+    Returns:
+        float: Délai en secondes, tiré uniformément entre 0 et min(maximum, base * 2^(attempt-1))
+    """
+    return random.uniform(0, min(maximum, base * (2 ** (attempt - 1))))
+
+def parse_retry_after(value):
+    """
+    Interprète un en-tête Retry-After (nombre de secondes ou date HTTP)
+
+    Args:
+        value (str): Valeur de l'en-tête
+
+    Returns:
+        float: Délai en secondes, ou None si la valeur est absente ou invalide
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
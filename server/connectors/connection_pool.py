@@ -0,0 +1,331 @@
+# connection_pool.py - Pool de connexions thread-safe pour les connecteurs
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeoutError(Exception):
+    """Levée lorsqu'aucune connexion n'a pu être obtenue dans le délai imparti"""
+    pass
+
+class ConnectionPool:
+    """
+    Pool de connexions borné et thread-safe.
+    Chaque connexion n'est utilisée que par un seul thread à la fois ; les connexions
+    inactives sont vérifiées avant d'être réutilisées.
+    """
+
+    def __init__(self, name, factory, min_size=1, max_size=5, timeout=30,
+                 health_check=None, health_check_interval=30):
+        """
+        Initialise un pool de connexions
+
+        Args:
+            name (str): Nom du pool (utilisé dans les logs)
+            factory (callable): Fonction sans argument créant une nouvelle connexion
+            min_size (int, optional): Nombre de connexions ouvertes à l'initialisation. Par défaut 1.
+            max_size (int, optional): Nombre maximal de connexions simultanées. Par défaut 5.
+            timeout (float, optional): Délai maximal d'attente d'une connexion en secondes. Par défaut 30.
+            health_check (callable, optional): Fonction recevant une connexion et renvoyant
+                True si elle est utilisable. Par défaut None (aucune vérification).
+            health_check_interval (float, optional): Durée d'inactivité en secondes au-delà de
+                laquelle une connexion est vérifiée avant d'être prêtée. Par défaut 30.
+        """
+        self.name = name
+        self.factory = factory
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self.health_check = health_check
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()  # [(connexion, instant de dernière utilisation)]
+        self._size = 0  # Connexions ouvertes (prêtées + inactives)
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+        # Statistiques
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def open(self):
+        """Ouvre les connexions minimales du pool"""
+        with self._condition:
+            self._closed = False
+            missing = self.min_size - self._size
+            self._size += max(0, missing)
+
+        for _ in range(max(0, missing)):
+            try:
+                connection = self._create()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                raise
+            with self._condition:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+        logger.info(f"Pool {self.name} ouvert ({self.min_size}-{self.max_size} connexions)")
+
+    def acquire(self, timeout=None):
+        """
+        Emprunte une connexion au pool
+
+        Args:
+            timeout (float, optional): Délai maximal d'attente. Par défaut le délai du pool.
+
+        Returns:
+            object: Connexion empruntée, à rendre avec release()
+
+        Raises:
+            PoolTimeoutError: Si aucune connexion ne s'est libérée dans le délai
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        while True:
+            connection = None
+            create = False
+
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError(f"Pool {self.name} fermé")
+
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        self._record_wait(time.monotonic() - start, waited)
+                        raise PoolTimeoutError(
+                            f"Aucune connexion disponible dans le pool {self.name} après {timeout}s"
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+                self._in_use += 1
+
+            if create:
+                try:
+                    connection = self._create()
+                except Exception:
+                    self._forget()
+                    raise
+            elif (self.health_check and time.monotonic() - last_used > self.health_check_interval
+                    and not self._is_healthy(connection)):
+                self._discard(connection)
+                continue
+
+            with self._condition:
+                self.checkouts += 1
+                self._record_wait(time.monotonic() - start, waited)
+            return connection
+
+    def release(self, connection, check=False):
+        """
+        Rend une connexion au pool. Une transaction restée ouverte est annulée ; une connexion
+        dont l'annulation échoue est écartée.
+
+        Args:
+            connection (object): Connexion obtenue par acquire()
+            check (bool, optional): Vérifier la connexion avant de la remettre à disposition
+                (par exemple après une erreur). Par défaut False.
+        """
+        if (check and not self._is_healthy(connection)) or not self._reset(connection):
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self._in_use -= 1
+            if self._closed:
+                self._size -= 1
+                close = True
+            else:
+                self._idle.append((connection, time.monotonic()))
+                close = False
+            self._condition.notify()
+
+        if close:
+            self._close_connection(connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Prête une connexion pour la durée d'un bloc with.
+        Les appels imbriqués dans un même thread réutilisent la connexion déjà prêtée,
+        ce qui permet de conserver une seule connexion pour toute une requête.
+
+        Yields:
+            object: Connexion empruntée
+        """
+        local = self._local
+        if getattr(local, 'connection', None) is not None:
+            local.depth += 1
+            try:
+                yield local.connection
+            finally:
+                local.depth -= 1
+            return
+
+        connection = self.acquire()
+        local.connection = connection
+        local.depth = 1
+        failed = False
+        try:
+            yield connection
+        except Exception:
+            failed = True
+            raise
+        finally:
+            local.depth -= 1
+            if local.depth <= 0 and not getattr(local, 'pinned', False):
+                local.connection = None
+                self.release(connection, check=failed)
+
+    def current(self):
+        """
+        Renvoie la connexion déjà prêtée au thread courant, sans en emprunter
+
+        Returns:
+            object: Connexion du thread, ou None
+        """
+        return getattr(self._local, 'connection', None)
+
+    def pin(self):
+        """
+        Associe durablement une connexion au thread courant.
+        Elle reste prêtée jusqu'à l'appel de unpin() (par exemple en fin de requête).
+
+        Returns:
+            object: Connexion associée au thread
+        """
+        local = self._local
+        if getattr(local, 'connection', None) is None:
+            local.connection = self.acquire()
+            local.depth = 0
+        local.pinned = True
+        return local.connection
+
+    def unpin(self):
+        """Rend au pool la connexion associée au thread courant par pin()"""
+        local = self._local
+        connection = getattr(local, 'connection', None)
+        local.pinned = False
+        if connection is not None and getattr(local, 'depth', 0) <= 0:
+            local.connection = None
+            self.release(connection)
+
+    def close(self):
+        """Ferme toutes les connexions inactives ; les connexions prêtées seront fermées à leur retour"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _ in idle:
+            self._close_connection(connection)
+        logger.info(f"Pool {self.name} fermé")
+
+    def get_stats(self):
+        """
+        Renvoie les statistiques du pool
+
+        Returns:
+            dict: Occupation du pool et temps d'attente cumulés
+        """
+        with self._condition:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self.checkouts,
+                "created": self.created,
+                "discarded": self.discarded,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "total_wait_time": self.total_wait_time,
+                "max_wait_time": self.max_wait_time,
+                "avg_wait_time": self.total_wait_time / self.waits if self.waits else 0.0
+            }
+
+    def _create(self):
+        """Crée une nouvelle connexion via la fabrique"""
+        connection = self.factory()
+        with self._condition:
+            self.created += 1
+        return connection
+
+    def _is_healthy(self, connection):
+        """Vérifie une connexion avec la fonction de contrôle configurée"""
+        if not self.health_check:
+            return True
+        try:
+            return bool(self.health_check(connection))
+        except Exception as e:
+            logger.warning(f"Pool {self.name}: connexion défaillante ({str(e)})")
+            return False
+
+    def _reset(self, connection):
+        """
+        Annule la transaction laissée ouverte sur une connexion rendue : l'emprunteur suivant ne
+        doit hériter ni de modifications non validées ni du verrou d'écriture
+
+        Returns:
+            bool: False si l'annulation a échoué (connexion à écarter)
+        """
+        try:
+            if getattr(connection, 'in_transaction', False):
+                connection.rollback()
+                logger.warning(f"Pool {self.name}: transaction non validée annulée au retour d'une connexion")
+            return True
+        except Exception as e:
+            logger.warning(f"Pool {self.name}: annulation impossible ({str(e)})")
+            return False
+
+    def _discard(self, connection):
+        """Ferme une connexion prêtée défaillante et libère sa place dans le pool"""
+        self._forget()
+        with self._condition:
+            self.discarded += 1
+        self._close_connection(connection)
+
+    def _forget(self):
+        """Retire une connexion prêtée du décompte du pool"""
+        with self._condition:
+            self._in_use -= 1
+            self._size -= 1
+            self._condition.notify()
+
+    def _record_wait(self, wait_time, waited):
+        """Enregistre un temps d'attente (le verrou doit être détenu)"""
+        if waited:
+            self.waits += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+    def _close_connection(self, connection):
+        """Ferme une connexion en ignorant les erreurs"""
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Pool {self.name}: erreur à la fermeture d'une connexion ({str(e)})")
@@ -0,0 +1,414 @@
+# sql_connector.py - Connecteur pour les bases de données SQL
+import logging
+import os
+import sqlite3
+import json
+import time
+from contextlib import contextmanager
+from functools import partial
+from urllib.request import pathname2url
+from .base_connector import BaseConnector
+from .connection_pool import ConnectionPool
+from utils.columnar import from_tuples, row_count
+from utils.metrics import connector_request_duration
+
+logger = logging.getLogger(__name__)
+
+class SQLConnector(BaseConnector):
+    """
+    Connecteur pour les bases de données SQL.
+    Supporte SQLite par défaut, extensible pour d'autres moteurs SQL.
+    """
+    
+    def __init__(self, name, config):
+        """
+        Initialise un connecteur SQL
+        
+        Args:
+            name (str): Nom du connecteur
+            config (dict): Configuration avec les clés :
+                - ENGINE: Type de base de données (sqlite, mysql, postgresql)
+                - NAME: Nom de la base de données ou chemin du fichier
+                - USER: Nom d'utilisateur (facultatif pour sqlite)
+                - PASSWORD: Mot de passe (facultatif pour sqlite)
+                - HOST: Hôte (facultatif pour sqlite)
+                - PORT: Port (facultatif pour sqlite)
+                - POOL_ENABLED: Utiliser un pool de connexions partagé entre threads (par défaut: False)
+                - POOL_MIN_SIZE: Connexions ouvertes au démarrage du pool (par défaut: 1)
+                - POOL_MAX_SIZE: Connexions simultanées maximales (par défaut: 5)
+                - POOL_TIMEOUT: Délai d'attente d'une connexion libre en secondes (par défaut: 30)
+                - POOL_HEALTH_CHECK_INTERVAL: Inactivité en secondes avant revérification (par défaut: 30)
+                - POOL_LEASE: 'operation' (une connexion par requête SQL) ou 'thread'
+                  (connexion conservée par le thread jusqu'à release_lease()) (par défaut: 'operation')
+                - JOURNAL_MODE: Mode de journalisation SQLite, 'wal' pour que les lectures ne
+                  soient pas bloquées par les écritures (par défaut: inchangé)
+                - SYNCHRONOUS, CACHE_SIZE, MMAP_SIZE, TEMP_STORE: PRAGMA appliqués à chaque connexion
+                  (par défaut: valeurs de SQLite)
+                - BUSY_TIMEOUT: Attente maximale d'un verrou en secondes (par défaut: 5)
+                - CACHED_STATEMENTS: Requêtes préparées conservées par connexion (par défaut: 100)
+                - READ_ONLY_QUERIES: fetch_data et fetch_iter utilisent des connexions en lecture
+                  seule (mode=ro), dans un pool séparé (par défaut: False)
+                - READ_POOL_MAX_SIZE: Connexions de lecture simultanées (par défaut: POOL_MAX_SIZE)
+        """
+        super().__init__(name, config)
+        self.connection = None
+        self.pool = None
+        self.engine = config.get('ENGINE', 'sqlite').lower()
+        self.db_name = config.get('NAME', ':memory:')
+        self.pool_enabled = config.get('POOL_ENABLED', False)
+        self.pool_lease = config.get('POOL_LEASE', 'operation')
+        self.busy_timeout = config.get('BUSY_TIMEOUT', 5)
+        self.cached_statements = config.get('CACHED_STATEMENTS', 100)
+        # Les connexions en lecture seule ouvrent le fichier : impossible avec une base en mémoire
+        self.read_only_queries = config.get('READ_ONLY_QUERIES', False) and self.db_name != ':memory:'
+        self.read_connection = None
+        self.read_pool = None
+        
+    def connect(self):
+        """
+        Établit une connexion à la base de données SQL
+        
+        Returns:
+            bool: True si la connexion a réussi, False sinon
+        """
+        try:
+            if self.engine != 'sqlite':
+                # Implémentation future pour d'autres moteurs de base de données
+                logger.error(f"Moteur de base de données non supporté: {self.engine}")
+                return False
+            
+            if self.pool_enabled:
+                self.pool = ConnectionPool(
+                    self.name,
+                    self._create_connection,
+                    min_size=self.config.get('POOL_MIN_SIZE', 1),
+                    max_size=self.config.get('POOL_MAX_SIZE', 5),
+                    timeout=self.config.get('POOL_TIMEOUT', 30),
+                    health_check=self._ping,
+                    health_check_interval=self.config.get('POOL_HEALTH_CHECK_INTERVAL', 30)
+                )
+                self.pool.open()
+            else:
+                self.connection = self._create_connection()
+            
+            if self.read_only_queries:
+                # Le fichier et le mode WAL doivent exister avant d'être ouverts en mode ro
+                if not os.path.exists(self.db_name):
+                    self._create_connection().close()
+                read_factory = partial(self._create_connection, read_only=True)
+                if self.pool_enabled:
+                    self.read_pool = ConnectionPool(
+                        f"{self.name}:lecture",
+                        read_factory,
+                        min_size=0,
+                        max_size=self.config.get('READ_POOL_MAX_SIZE', self.config.get('POOL_MAX_SIZE', 5)),
+                        timeout=self.config.get('POOL_TIMEOUT', 30),
+                        health_check=self._ping,
+                        health_check_interval=self.config.get('POOL_HEALTH_CHECK_INTERVAL', 30)
+                    )
+                    self.read_pool.open()
+                else:
+                    self.read_connection = read_factory()
+            
+            self.is_connected = True
+            logger.info(f"Connexion établie à la base de données {self.db_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erreur de connexion à la base de données: {str(e)}")
+            self.is_connected = False
+            return False
+    
+    def disconnect(self):
+        """
+        Ferme la connexion à la base de données
+        
+        Returns:
+            bool: True si la déconnexion a réussi, False sinon
+        """
+        if self.read_pool:
+            self.read_pool.close()
+            self.read_pool = None
+        if self.read_connection:
+            self.read_connection.close()
+            self.read_connection = None
+        if self.pool:
+            try:
+                self.pool.close()
+                self.pool = None
+                self.is_connected = False
+                logger.info("Pool de connexions fermé")
+                return True
+            except Exception as e:
+                logger.error(f"Erreur lors de la fermeture du pool: {str(e)}")
+                return False
+        if self.connection:
+            try:
+                self.connection.close()
+                self.connection = None
+                self.is_connected = False
+                logger.info("Déconnexion de la base de données réussie")
+                return True
+            except Exception as e:
+                logger.error(f"Erreur lors de la déconnexion: {str(e)}")
+                return False
+        return True
+    
+    @contextmanager
+    def lease(self, read_only=False):
+        """
+        Prête une connexion pour la durée d'un bloc with.
+        En mode pool, les appels imbriqués d'un même thread partagent la même connexion :
+        englober le traitement d'une requête HTTP dans ce bloc réserve une connexion par requête.
+        
+        Args:
+            read_only (bool, optional): Connexion en lecture seule si READ_ONLY_QUERIES est actif.
+                Un thread qui détient déjà une connexion d'écriture la réutilise (il voit ainsi
+                ses propres modifications non validées). Par défaut False.
+        
+        Yields:
+            sqlite3.Connection: Connexion à utiliser
+        """
+        if not self.is_connected:
+            if not self.connect():
+                raise ConnectionError("Non connecté à la base de données")
+        
+        pool, connection = self.pool, self.connection
+        if read_only and self.read_only_queries:
+            held = self.pool.current() if self.pool is not None else None
+            if held is None and not (self.connection is not None and self.connection.in_transaction):
+                pool, connection = self.read_pool, self.read_connection
+        
+        if pool is None:
+            yield connection
+            return
+        
+        if self.pool_lease == 'thread':
+            pool.pin()
+        with pool.connection() as connection:
+            yield connection
+    
+    def release_lease(self):
+        """
+        Rend au pool la connexion conservée par le thread courant (mode POOL_LEASE='thread').
+        À appeler en fin de requête, par exemple depuis un gestionnaire teardown_request.
+        """
+        if self.pool is not None:
+            self.pool.unpin()
+        if self.read_pool is not None:
+            self.read_pool.unpin()
+    
+    def fetch_data(self, query, params=None, result_format='rows'):
+        """
+        Exécute une requête SQL et récupère les résultats
+        
+        Args:
+            query (str): Requête SQL à exécuter
+            params (dict, optional): Paramètres pour la requête SQL. Par défaut None.
+            result_format (str, optional): 'rows' (liste de dictionnaires) ou 'columnar'
+                ({colonne: [valeurs]}, sans répéter les noms de colonnes). Par défaut 'rows'.
+            
+        Returns:
+            dict: Résultats de la requête sous forme de dictionnaire
+        """
+        if not self.is_connected:
+            if not self.connect():
+                return {"error": "Non connecté à la base de données"}
+        
+        try:
+            with self.lease(read_only=True) as connection:
+                cursor = connection.cursor()
+                start_time = time.perf_counter()
+                
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                    
+                # Récupération des résultats
+                columns = [column[0] for column in cursor.description] if cursor.description else []
+                
+                if result_format == 'columnar':
+                    columnar = from_tuples(columns, cursor)
+                    execution_time = time.perf_counter() - start_time
+                    self._observe('fetch_data', execution_time)
+                    count = row_count(columnar)
+                    logger.debug(f"Requête exécutée en {execution_time:.3f}s, {count} résultats")
+                    return {
+                        "data": columnar["data"],
+                        "count": count,
+                        "execution_time": execution_time,
+                        "columns": columns,
+                        "format": "columnar"
+                    }
+                
+                results = []
+                
+                # Parcourir le curseur directement plutôt que de matérialiser fetchall()
+                for row in cursor:
+                    # Convertir chaque ligne en dictionnaire
+                    if isinstance(row, sqlite3.Row):
+                        results.append(dict(row))
+                    else:
+                        results.append(dict(zip(columns, row)))
+                
+                execution_time = time.perf_counter() - start_time
+            self._observe('fetch_data', execution_time)
+            logger.debug(f"Requête exécutée en {execution_time:.3f}s, {len(results)} résultats")
+            
+            return {
+                "data": results,
+                "count": len(results),
+                "execution_time": execution_time,
+                "columns": columns
+            }
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de l'exécution de la requête: {str(e)}")
+            return {"error": str(e)}
+    
+    def fetch_iter(self, query, params=None, batch_size=1000):
+        """
+        Exécute une requête SQL et renvoie les lignes au fil de l'eau, par lots de fetchmany.
+        Seul un lot est présent en mémoire à la fois ; la connexion reste prêtée
+        jusqu'à épuisement ou fermeture du générateur.
+        
+        Args:
+            query (str): Requête SQL à exécuter
+            params (dict, optional): Paramètres pour la requête SQL. Par défaut None.
+            batch_size (int, optional): Nombre de lignes lues par appel à fetchmany. Par défaut 1000.
+            
+        Yields:
+            dict: Une ligne de résultat
+            
+        Raises:
+            Exception: Les erreurs SQL sont propagées à l'appelant
+        """
+        with self.lease(read_only=True) as connection:
+            cursor = connection.cursor()
+            start_time = time.perf_counter()
+            count = 0
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                columns = [column[0] for column in cursor.description] if cursor.description else []
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(columns, row))
+                    count += len(rows)
+            finally:
+                cursor.close()
+                execution_time = time.perf_counter() - start_time
+                self._observe('fetch_iter', execution_time)
+                logger.debug(f"Lecture en flux terminée en {execution_time:.3f}s, {count} lignes")
+    
+    def test_connection(self):
+        """
+        Teste si la connexion à la base de données est fonctionnelle
+        
+        Returns:
+            bool: True si la connexion est fonctionnelle, False sinon
+        """
+        if not self.is_connected:
+            return self.connect()
+            
+        try:
+            # Exécute une requête simple pour tester la connexion
+            with self.lease() as connection:
+                return self._ping(connection)
+        except Exception:
+            return False
+    
+    def _observe(self, operation, duration):
+        """Enregistre la durée d'une opération dans l'histogramme des connecteurs"""
+        connector_request_duration.observe(duration, self.name, self.__class__.__name__, operation)
+    
+    def _create_connection(self, read_only=False):
+        """
+        Ouvre une nouvelle connexion SQLite et lui applique les PRAGMA de la configuration
+        
+        Args:
+            read_only (bool, optional): Ouvrir le fichier en lecture seule (URI mode=ro). Par défaut False.
+        
+        Returns:
+            sqlite3.Connection: Connexion configurée
+        """
+        if read_only:
+            database, uri = f"file:{pathname2url(os.path.abspath(self.db_name))}?mode=ro", True
+        else:
+            database, uri = self.db_name, False
+        # En mode pool, une connexion peut être prêtée successivement à plusieurs threads
+        connection = sqlite3.connect(
+            database,
+            uri=uri,
+            timeout=self.busy_timeout,
+            cached_statements=self.cached_statements,
+            check_same_thread=not self.pool_enabled
+        )
+        connection.row_factory = sqlite3.Row
+        
+        for pragma, value in self._pragmas(read_only):
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        return connection
+    
+    def _pragmas(self, read_only=False):
+        """
+        Liste les PRAGMA à appliquer à une connexion. Le mode de journalisation est une propriété
+        du fichier : seule une connexion d'écriture peut le changer.
+        
+        Returns:
+            list: Paires (pragma, valeur)
+        """
+        pragmas = []
+        for key, pragma, kind in (('JOURNAL_MODE', 'journal_mode', str), ('SYNCHRONOUS', 'synchronous', str),
+                                  ('CACHE_SIZE', 'cache_size', int), ('MMAP_SIZE', 'mmap_size', int),
+                                  ('TEMP_STORE', 'temp_store', str)):
+            value = self.config.get(key)
+            if value is None or (read_only and pragma == 'journal_mode'):
+                continue
+            value = kind(value)
+            if kind is str and not value.isalnum():
+                raise ValueError(f"Valeur invalide pour {key}: {value}")
+            pragmas.append((pragma, value))
+        if read_only:
+            pragmas.append(('query_only', 1))
+        return pragmas
+    
+    def _ping(self, connection):
+        """
+        Vérifie qu'une connexion répond à une requête simple
+        
+        Args:
+            connection (sqlite3.Connection): Connexion à vérifier
+            
+        Returns:
+            bool: True si la connexion est fonctionnelle
+        """
+        connection.execute("SELECT 1").fetchone()
+        return True
+    
+    def get_info(self):
+        """
+        Renvoie des informations sur le connecteur
+        
+        Returns:
+            dict: Informations sur le connecteur SQL
+        """
+        info = super().get_info()
+        info.update({
+            "engine": self.engine,
+            "database": self.db_name,
+            "pragmas": dict(self._pragmas()),
+            "read_only_queries": self.read_only_queries
+        })
+        if self.pool is not None:
+            info["pool"] = self.pool.get_stats()
+        if self.read_pool is not None:
+            info["read_pool"] = self.read_pool.get_stats()
+        return info
@@ -0,0 +1 @@
+# __init__.py - Schéma versionné de la base KPI (migrations) et contrôle des plans de requête
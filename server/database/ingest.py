@@ -0,0 +1,441 @@
+# ingest.py - Ingestion en masse des sources API (tickets, incidents) dans la base KPI
+#
+# Utilisation (depuis le dossier server) :
+#   python -m database.ingest --source landesk_tickets
+#   python -m database.ingest --all --batch-size 10000
+import argparse
+import logging
+import threading
+import time
+from datetime import datetime
+
+from database import migrations
+from utils import metrics
+from utils.metrics import CallbackMetric
+
+logger = logging.getLogger(__name__)
+
+# Colonnes converties en date ISO 8601 (heure locale, à la seconde) et colonnes mises en minuscules.
+# deleted_at accepte aussi un booléen (suppression datée de la dernière modification).
+TIMESTAMP_COLUMNS = ('opened_at', 'closed_at', 'updated_at', 'deleted_at')
+LOWERCASE_COLUMNS = ('severity', 'status')
+
+# Colonnes sans lesquelles un enregistrement est rejeté
+REQUIRED_COLUMNS = ('id', 'technology', 'opened_at')
+
+# Table dont les agrégats du tableau de bord sont recalculés après l'ingestion
+ROLLUP_TABLE = 'tickets'
+
+# Formats acceptés en dehors du cas courant 'AAAA-MM-JJTHH:MM:SS'
+_TIMESTAMP_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f',
+                      '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d')
+
+ingest_batch_duration = metrics.registry.histogram(
+    'ingest_batch_write_duration_seconds', "Durée d'écriture d'un lot ingéré (une transaction)", ('source',))
+ingest_records = metrics.registry.counter(
+    'ingest_records_total', "Enregistrements ingérés par résultat (written, stale, rejected, deleted)", ('source', 'outcome'))
+
+# Dernier passage de chaque source : {source: statistiques}
+_last_runs = {}
+_last_runs_lock = threading.Lock()
+
+def _lag_seconds(latest_updated_at):
+    """Ancienneté (secondes) d'une date normalisée par parse_timestamp, None si elle est absente"""
+    if not latest_updated_at:
+        return None
+    latest = datetime.strptime(latest_updated_at, '%Y-%m-%dT%H:%M:%S')
+    return max(0.0, (datetime.now() - latest).total_seconds())
+
+def _lag_values():
+    """Retard de la donnée la plus récente de chaque source, à l'instant de l'export"""
+    with _last_runs_lock:
+        latest = {source: stats.get("latest_updated_at") for source, stats in _last_runs.items()}
+    return {(source,): _lag_seconds(value) for source, value in latest.items() if value}
+
+metrics.registry.register(CallbackMetric(
+    'ingest_lag_seconds', "Ancienneté de la dernière modification ingérée par source", _lag_values,
+    'gauge', ('source',)))
+
+def parse_timestamp(value):
+    """
+    Normalise une date de la source en chaîne ISO 8601 à la seconde, en heure locale sans
+    fuseau (comme les dates écrites par le reste du serveur)
+
+    Args:
+        value (object): Chaîne ISO 8601 (avec ou sans fuseau), horodatage Unix ou datetime
+
+    Returns:
+        str: Date normalisée, ou None si la valeur est vide ou illisible
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        # Cas courant, sans analyse : 'AAAA-MM-JJTHH:MM:SS' (ou séparateur espace), sans fuseau
+        if len(value) == 19 and value[4] == '-' and value[10] in 'T ' and value[13] == ':':
+            return f"{value[:10]}T{value[11:]}"
+        text = value.strip()
+        if text.endswith('Z'):
+            text = text[:-1] + '+0000'
+        if len(text) > 6 and text[-3] == ':' and text[-6] in '+-':
+            text = text[:-3] + text[-2:]  # '+01:00' -> '+0100' (strptime avant Python 3.7)
+        for timestamp_format in _TIMESTAMP_FORMATS:
+            try:
+                value = datetime.strptime(text, timestamp_format)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    elif isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value / 1000 if value > 1e11 else value)  # Millisecondes acceptées
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.strftime('%Y-%m-%dT%H:%M:%S')
+
+class IngestPipeline:
+    """
+    Copie une source API paginée dans une table de la base KPI. Les enregistrements sont lus
+    au fil de l'eau (fetch_pages télécharge les pages suivantes pendant l'écriture), normalisés,
+    puis écrits par lots avec executemany, un lot par transaction. L'écriture est un upsert
+    sur l'identifiant : relancer une ingestion ne crée pas de doublon, et une version plus
+    ancienne d'un enregistrement ne remplace jamais une plus récente.
+    """
+
+    def __init__(self, name, source, api, store, batch_size=5000):
+        """
+        Initialise le pipeline
+
+        Args:
+            name (str): Nom de la source (étiquette des métriques)
+            source (dict): Configuration de la source (ENDPOINT, TABLE, PARAMS, PAGINATION, FIELDS)
+            api (APIConnector): Connecteur de la source
+            store (SQLConnector): Connecteur de la base KPI
+            batch_size (int, optional): Enregistrements par transaction. Par défaut 5000.
+        """
+        self.name = name
+        self.endpoint = source['ENDPOINT']
+        self.table = source['TABLE']
+        self.params = source.get('PARAMS') or {}
+        self.pagination = source.get('PAGINATION') or {}
+        self.api = api
+        self.store = store
+        self.batch_size = max(1, batch_size)
+
+        self.columns = list(source['FIELDS'])
+        self._paths = [tuple(source['FIELDS'][column].split('.')) for column in self.columns]
+        self._timestamps = [index for index, column in enumerate(self.columns) if column in TIMESTAMP_COLUMNS]
+        self._lowercase = [index for index, column in enumerate(self.columns) if column in LOWERCASE_COLUMNS]
+        self._required = [index for index, column in enumerate(self.columns) if column in REQUIRED_COLUMNS]
+        self._updated = self.columns.index('updated_at') if 'updated_at' in self.columns else None
+        self._fallbacks = [self.columns.index(column) for column in ('closed_at', 'opened_at')
+                           if column in self.columns]
+        self._deleted = self.columns.index('deleted_at') if 'deleted_at' in self.columns else None
+        if self._updated is None:
+            self.columns.append('updated_at')
+        self._statement = None
+        self._stamped = False  # synced_at lié en dernier paramètre de chaque ligne
+        self.run_stamp = None  # Valeur de synced_at écrite par le dernier passage
+
+    def normalize(self, record):
+        """
+        Convertit un enregistrement de la source en ligne de la table
+
+        Args:
+            record (dict): Enregistrement JSON de la source
+
+        Returns:
+            tuple: Valeurs dans l'ordre de self.columns, ou None si l'enregistrement est inutilisable
+        """
+        row = []
+        for path in self._paths:
+            value = record
+            for key in path:
+                if not isinstance(value, dict):
+                    value = None
+                    break
+                value = value.get(key)
+            if isinstance(value, (dict, list)):
+                value = None
+            elif value is not None and not isinstance(value, str):
+                value = value if isinstance(value, (int, float)) else str(value)
+            row.append(value)
+
+        deleted_flag = None
+        if self._deleted is not None and isinstance(row[self._deleted], bool):
+            deleted_flag, row[self._deleted] = row[self._deleted], None
+        for index in self._timestamps:
+            row[index] = parse_timestamp(row[index])
+        for index in self._lowercase:
+            if isinstance(row[index], str):
+                row[index] = row[index].strip().lower()
+        for index in self._required:
+            if row[index] is None or row[index] == '':
+                return None
+
+        # Sans date de modification, la date la plus récente connue sert de point de reprise
+        if self._updated is None:
+            row.append(None)
+            updated = len(row) - 1
+        else:
+            updated = self._updated
+        if row[updated] is None:
+            row[updated] = next((row[index] for index in self._fallbacks if row[index] is not None), None)
+        if deleted_flag:
+            row[self._deleted] = row[updated]
+        row[0] = str(row[0])
+        return tuple(row)
+
+    def run(self, params=None, on_page=None):
+        """
+        Ingère la source
+
+        Args:
+            params (dict, optional): Paramètres de requête fusionnés avec PARAMS (query_params
+                'updated_since', jeton de reprise, ...). Par défaut None.
+            on_page (callable, optional): Fonction appelée avec le corps de chaque page. Par défaut None.
+
+        Returns:
+            dict: Statistiques (fetched, written, rejected, stale : versions plus anciennes que la base,
+                batches, seconds, write_seconds, records_per_second, latest_updated_at, lag_seconds),
+                plus "error" en cas d'échec. Les lots écrits avant une erreur restent en base.
+        """
+        params = params or {}
+        request_params = dict(self.params, **params)
+        request_params['query_params'] = dict(self.params.get('query_params') or {},
+                                              **(params.get('query_params') or {}))
+        pagination = dict(self.pagination, on_page=on_page) if on_page else self.pagination
+        stats = {
+            "source": self.name,
+            "table": self.table,
+            "fetched": 0,
+            "written": 0,
+            "rejected": 0,
+            "stale": 0,
+            "batches": 0,
+            "write_seconds": 0.0,
+            "latest_updated_at": None
+        }
+        start = time.perf_counter()
+        try:
+            self._prepare()
+            batch = []
+            for record in self.api.fetch_pages(self.endpoint, request_params, pagination):
+                stats["fetched"] += 1
+                row = self.normalize(record) if isinstance(record, dict) else None
+                if row is None:
+                    stats["rejected"] += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    self._write(batch, stats)
+                    batch = []
+            if batch:
+                self._write(batch, stats)
+            self._after_write(stats["written"])
+        except Exception as e:
+            logger.error(f"Erreur d'ingestion de {self.name}: {str(e)}")
+            stats["error"] = str(e)
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["records_per_second"] = stats["fetched"] / stats["seconds"] if stats["seconds"] else 0.0
+        stats["lag_seconds"] = _lag_seconds(stats["latest_updated_at"])
+        ingest_records.inc(stats["rejected"], self.name, 'rejected')
+
+        with _last_runs_lock:
+            _last_runs[self.name] = stats
+        logger.info(f"Ingestion {self.name}: {stats['written']} enregistrement(s) écrit(s), "
+                    f"{stats['rejected']} rejeté(s) en {stats['seconds']:.1f}s "
+                    f"({stats['records_per_second']:.0f}/s, écriture {stats['write_seconds']:.1f}s)")
+        return stats
+
+    def sweep(self):
+        """
+        Marque supprimés (suppression logique) les enregistrements actifs que le dernier passage
+        n'a pas vus. Réservé aux passages complets réussis d'une source qui alimente seule sa table.
+        updated_at reste celui de la source : un enregistrement qui y reparaît, dans une version
+        au moins aussi récente, est réécrit et redevient actif.
+
+        Returns:
+            int: Nombre d'enregistrements marqués supprimés
+        """
+        if not self.run_stamp:
+            return 0
+        now = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        missing = "deleted_at IS NULL AND (synced_at IS NULL OR synced_at <> ?)"
+        with self.store.lease() as connection:
+            with connection:
+                if self.table == ROLLUP_TABLE:
+                    connection.execute(
+                        f"INSERT OR IGNORE INTO kpi_rollup_pending_days (day) "
+                        f"SELECT DISTINCT date(opened_at) FROM {self.table} WHERE {missing}",
+                        (self.run_stamp,)
+                    )
+                swept = connection.execute(
+                    f"UPDATE {self.table} SET deleted_at = ? WHERE {missing}",
+                    (now, self.run_stamp)
+                ).rowcount
+        if swept:
+            ingest_records.inc(swept, self.name, 'deleted')
+            logger.info(f"Ingestion {self.name}: {swept} enregistrement(s) absent(s) de la source marqué(s) supprimé(s)")
+            self._after_write(swept)
+        return swept
+
+    def _prepare(self):
+        """Met le schéma à jour et construit la requête d'upsert à partir des colonnes de la table"""
+        with self.store.lease() as connection:
+            migrations.migrate(connection)
+            existing = {row[1] for row in connection.execute(f"PRAGMA table_info({self.table})")}
+        if not existing:
+            raise ValueError(f"Table inconnue: {self.table}")
+        unknown = [column for column in self.columns if column not in existing]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues dans {self.table}: {', '.join(unknown)}")
+        if self.columns[0] != 'id':
+            raise ValueError("Le premier champ d'une source doit être 'id'")
+
+        # synced_at reçoit l'horodatage du passage, lié comme les autres valeurs (voir parameters)
+        self.run_stamp = datetime.now().isoformat()
+        columns = list(self.columns)
+        self._stamped = 'synced_at' in existing and 'synced_at' not in columns
+        if self._stamped:
+            columns.append('synced_at')
+        updates = [f"{column} = excluded.{column}" for column in columns[1:]]
+        # Un enregistrement de nouveau servi par la source redevient actif, même si elle ne publie
+        # pas deleted_at (suppression posée par sweep)
+        if 'deleted_at' in existing and 'deleted_at' not in columns:
+            updates.append("deleted_at = NULL")
+        # Une ligne sans updated_at (écrite avant la migration) est toujours remplacée
+        self._statement = (
+            f"INSERT INTO {self.table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT (id) DO UPDATE SET {', '.join(updates)} "
+            f"WHERE excluded.updated_at >= COALESCE({self.table}.updated_at, '')"
+        )
+
+    def parameters(self, rows):
+        """
+        Paramètres de la requête d'upsert pour des lignes normalisées
+
+        Args:
+            rows (list): Lignes produites par normalize
+
+        Returns:
+            list: Lignes complétées de l'horodatage du passage si la table a une colonne synced_at
+        """
+        if not self._stamped:
+            return rows
+        stamp = (self.run_stamp,)
+        return [row + stamp for row in rows]
+
+    def _write(self, rows, stats):
+        """Écrit un lot dans une seule transaction"""
+        updated = self.columns.index('updated_at')
+        started = time.perf_counter()
+        with self.store.lease() as connection:
+            changes = connection.total_changes
+            with connection:
+                connection.executemany(self._statement, self.parameters(rows))
+                changes = connection.total_changes - changes
+                if self.table == ROLLUP_TABLE:
+                    # Jours recalculés au prochain rafraîchissement, même si updated_at est ancien
+                    opened = self.columns.index('opened_at')
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO kpi_rollup_pending_days (day) VALUES (?)",
+                        [(day,) for day in {row[opened][:10] for row in rows}]
+                    )
+        elapsed = time.perf_counter() - started
+        ingest_batch_duration.observe(elapsed, self.name)
+        ingest_records.inc(changes, self.name, 'written')
+        ingest_records.inc(len(rows) - changes, self.name, 'stale')
+
+        latest = max(row[updated] for row in rows)
+        if stats["latest_updated_at"] is None or latest > stats["latest_updated_at"]:
+            stats["latest_updated_at"] = latest
+        stats["written"] += changes
+        stats["stale"] += len(rows) - changes
+        stats["batches"] += 1
+        stats["write_seconds"] += elapsed
+
+    def _after_write(self, written):
+        """Rafraîchit les agrégats du tableau de bord après l'écriture de tickets"""
+        if self.table != ROLLUP_TABLE or not written:
+            return
+        from modules.dashboard import rollups
+        with self.store.lease() as connection:
+            rollups.refresh_rollups(connection)
+
+def create_pipeline(name, api=None, store=None, config=None):
+    """
+    Construit le pipeline d'une source de INGEST_CONFIG
+
+    Args:
+        name (str): Nom de la source
+        api (APIConnector, optional): Connecteur de la source. Par défaut None (DATABASE_CONFIG['API']).
+        store (SQLConnector, optional): Connecteur de la base KPI. Par défaut None (DATABASE_CONFIG['SQL']).
+        config (dict, optional): Configuration d'ingestion. Par défaut None (INGEST_CONFIG).
+
+    Returns:
+        IngestPipeline: Pipeline prêt à être exécuté
+    """
+    from config.settings import DATABASE_CONFIG, INGEST_CONFIG
+
+    config = config or INGEST_CONFIG
+    if name not in config['SOURCES']:
+        raise ValueError(f"Source d'ingestion inconnue: {name}")
+    if api is None:
+        from connectors.api_connector import APIConnector
+        api = APIConnector('kpi_api', DATABASE_CONFIG['API'])
+    if store is None:
+        from connectors.sql_connector import SQLConnector
+        store = SQLConnector('kpi_store', DATABASE_CONFIG['SQL'])
+    return IngestPipeline(name, config['SOURCES'][name], api, store, config.get('BATCH_SIZE', 5000))
+
+def get_last_runs():
+    """
+    Renvoie les statistiques du dernier passage de chaque source
+
+    Returns:
+        dict: {source: statistiques}
+    """
+    with _last_runs_lock:
+        return {source: dict(stats) for source, stats in _last_runs.items()}
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    from config.settings import DATABASE_CONFIG, INGEST_CONFIG
+
+    parser = argparse.ArgumentParser(description="Ingère les sources API dans la base KPI")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--source', choices=sorted(INGEST_CONFIG['SOURCES']), help="Source à ingérer")
+    group.add_argument('--all', action='store_true', help="Ingérer toutes les sources")
+    parser.add_argument('--batch-size', type=int, default=INGEST_CONFIG.get('BATCH_SIZE', 5000),
+                        help="Enregistrements par transaction")
+    parser.add_argument('--database', default=DATABASE_CONFIG['SQL']['NAME'], help="Fichier SQLite cible")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from connectors.api_connector import APIConnector
+    from connectors.sql_connector import SQLConnector
+
+    api = APIConnector('kpi_api', DATABASE_CONFIG['API'])
+    store = SQLConnector('kpi_store', dict(DATABASE_CONFIG['SQL'], NAME=args.database))
+    config = dict(INGEST_CONFIG, BATCH_SIZE=args.batch_size)
+    failed = False
+    try:
+        for name in sorted(config['SOURCES']) if args.all else [args.source]:
+            stats = create_pipeline(name, api, store, config).run()
+            lag = f"{stats['lag_seconds']:.0f}s" if stats["lag_seconds"] is not None else "n/a"
+            print(f"{name}: {stats['written']} écrits, {stats['rejected']} rejetés, "
+                  f"{stats['records_per_second']:.0f}/s, retard {lag}"
+                  + (f", erreur: {stats['error']}" if "error" in stats else ""))
+            failed = failed or "error" in stats
+    finally:
+        api.disconnect()
+        store.disconnect()
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+# migrations.py - Schéma versionné de la base KPI (tickets, incidents, agrégats) et exécution des migrations
+#
+# Utilisation (depuis le dossier server) :
+#   python -m database.migrations
+#   python -m database.migrations --database data/security_kpi.db --check-plans
+import argparse
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Migrations appliquées dans l'ordre : (version, nom, instructions). Une migration publiée
+# n'est jamais modifiée ; toute évolution du schéma ajoute une nouvelle version.
+MIGRATIONS = [
+    (1, 'tickets_et_agregats', [
+        # IF NOT EXISTS : les bases créées avant les migrations sont reprises telles quelles
+        """
+        CREATE TABLE IF NOT EXISTS tickets (
+            id TEXT PRIMARY KEY,
+            technology TEXT NOT NULL,
+            assignee TEXT,
+            severity TEXT,
+            status TEXT,
+            opened_at TEXT NOT NULL,
+            closed_at TEXT,
+            updated_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS kpi_daily_rollup (
+            day TEXT NOT NULL,
+            technology TEXT NOT NULL,
+            assignee TEXT NOT NULL,
+            ticket_count INTEGER NOT NULL,
+            critical_count INTEGER NOT NULL,
+            resolved_count INTEGER NOT NULL,
+            processing_minutes REAL NOT NULL,
+            PRIMARY KEY (day, technology, assignee)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS kpi_rollup_state (
+            name TEXT PRIMARY KEY,
+            high_water_mark TEXT,
+            refreshed_at TEXT
+        )
+        """
+    ]),
+    (2, 'incidents', [
+        """
+        CREATE TABLE IF NOT EXISTS incidents (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            technology TEXT NOT NULL,
+            assignee TEXT,
+            severity TEXT,
+            status TEXT,
+            opened_at TEXT NOT NULL,
+            closed_at TEXT,
+            updated_at TEXT NOT NULL
+        )
+        """
+    ]),
+    (3, 'index_tableau_de_bord', [
+        # Période seule : index couvrants des requêtes du tableau de bord et du recalcul des
+        # agrégats (toutes les colonnes lues sont dans l'index, la table n'est pas consultée)
+        """
+        CREATE INDEX IF NOT EXISTS ix_tickets_period_kpi
+        ON tickets (opened_at, technology, assignee, severity, closed_at)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ix_incidents_period_kpi
+        ON incidents (opened_at, technology, assignee, severity, status, closed_at)
+        """,
+        # Période + technologie et période + personne : égalité d'abord, plage de dates ensuite
+        "CREATE INDEX IF NOT EXISTS ix_tickets_technology_period ON tickets (technology, opened_at)",
+        "CREATE INDEX IF NOT EXISTS ix_tickets_assignee_period ON tickets (assignee, opened_at)",
+        "CREATE INDEX IF NOT EXISTS ix_incidents_technology_period ON incidents (technology, opened_at)",
+        "CREATE INDEX IF NOT EXISTS ix_incidents_assignee_period ON incidents (assignee, opened_at)",
+        # Rafraîchissement incrémental des agrégats (MAX(updated_at) et jours modifiés)
+        "CREATE INDEX IF NOT EXISTS ix_tickets_updated ON tickets (updated_at, opened_at)",
+        "CREATE INDEX IF NOT EXISTS ix_incidents_updated ON incidents (updated_at)"
+    ]),
+    (4, 'synchronisation_incrementale', [
+        # Point de reprise de chaque source : date de modification ou jeton opaque
+        """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            connector TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            high_water_mark TEXT,
+            cursor TEXT,
+            last_sync_at TEXT,
+            last_full_sync_at TEXT,
+            last_status TEXT,
+            last_error TEXT,
+            PRIMARY KEY (connector, endpoint)
+        ) WITHOUT ROWID
+        """,
+        # Suppressions logiques, et passage de synchronisation qui a vu l'enregistrement en dernier
+        "ALTER TABLE tickets ADD COLUMN deleted_at TEXT",
+        "ALTER TABLE tickets ADD COLUMN synced_at TEXT",
+        "ALTER TABLE incidents ADD COLUMN deleted_at TEXT",
+        "ALTER TABLE incidents ADD COLUMN synced_at TEXT",
+        # Les index couvrants ne portent plus que les enregistrements actifs (index partiels)
+        "DROP INDEX IF EXISTS ix_tickets_period_kpi",
+        """
+        CREATE INDEX ix_tickets_period_kpi
+        ON tickets (opened_at, technology, assignee, severity, closed_at)
+        WHERE deleted_at IS NULL
+        """,
+        "DROP INDEX IF EXISTS ix_incidents_period_kpi",
+        """
+        CREATE INDEX ix_incidents_period_kpi
+        ON incidents (opened_at, technology, assignee, severity, status, closed_at)
+        WHERE deleted_at IS NULL
+        """,
+        # Jours à recalculer signalés par l'ingestion (mises à jour tardives et suppressions)
+        "CREATE TABLE IF NOT EXISTS kpi_rollup_pending_days (day TEXT PRIMARY KEY) WITHOUT ROWID"
+    ])
+]
+
+_migrate_lock = threading.Lock()
+
+def current_version(connection):
+    """
+    Renvoie la version du schéma d'une base
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI
+
+    Returns:
+        int: Dernière migration appliquée (0 si aucune)
+    """
+    _ensure_migrations_table(connection)
+    return connection.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+def pending_migrations(connection):
+    """
+    Renvoie les migrations qui restent à appliquer
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI
+
+    Returns:
+        list: Tuples (version, nom, instructions)
+    """
+    version = current_version(connection)
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+def migrate(connection, target=None):
+    """
+    Applique les migrations en attente, chacune dans sa propre transaction. La transaction est
+    ouverte en écriture (BEGIN IMMEDIATE) avant de relire la version : plusieurs workers qui
+    démarrent ensemble n'appliquent pas deux fois la même migration.
+
+    Args:
+        connection (sqlite3.Connection): Connexion en écriture à la base KPI
+        target (int, optional): Version à atteindre. Par défaut None (dernière version).
+
+    Returns:
+        int: Nombre de migrations appliquées
+    """
+    target = MIGRATIONS[-1][0] if target is None else target
+    applied = 0
+    with _migrate_lock:
+        _ensure_migrations_table(connection)
+        for version, name, statements in MIGRATIONS:
+            if version > target:
+                break
+            if connection.in_transaction:
+                connection.commit()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if connection.execute(
+                    "SELECT 1 FROM schema_migrations WHERE version = ?", (version,)
+                ).fetchone():
+                    connection.rollback()
+                    continue
+                for statement in statements:
+                    connection.execute(statement)
+                connection.execute(
+                    "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                    (version, name, datetime.now().isoformat(timespec='seconds'))
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                logger.error(f"Échec de la migration {version} ({name})")
+                raise
+            applied += 1
+            logger.info(f"Migration {version} appliquée: {name}")
+
+    if applied:
+        # Statistiques du planificateur pour les index nouvellement créés
+        connection.execute("PRAGMA optimize")
+    return applied
+
+def _ensure_migrations_table(connection):
+    """Crée la table de suivi des migrations si elle n'existe pas"""
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    connection.commit()
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    from config.settings import DATABASE_CONFIG
+
+    parser = argparse.ArgumentParser(description="Applique les migrations de la base KPI")
+    parser.add_argument('--database', default=DATABASE_CONFIG['SQL']['NAME'], help="Fichier SQLite cible")
+    parser.add_argument('--target', type=int, help="Version à atteindre (par défaut la dernière)")
+    parser.add_argument('--check-plans', action='store_true',
+                        help="Vérifier ensuite qu'aucune requête du tableau de bord ne parcourt une table entière")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    connection = sqlite3.connect(args.database)
+    try:
+        applied = migrate(connection, args.target)
+        print(f"Schéma en version {current_version(connection)} ({applied} migration(s) appliquée(s))")
+        if args.check_plans:
+            from database.query_plans import check_query_plans
+            problems = check_query_plans(connection)
+            for name, detail in problems:
+                print(f"Parcours complet: {name}: {detail}")
+            if problems:
+                raise SystemExit(1)
+            print("Plans de requête conformes")
+    finally:
+        connection.close()
+
+if __name__ == '__main__':
+    main()
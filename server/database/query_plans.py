@@ -0,0 +1,108 @@
+# query_plans.py - Contrôle des plans d'exécution des requêtes du tableau de bord (EXPLAIN QUERY PLAN)
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Tables volumineuses qui ne doivent jamais être parcourues en entier
+LARGE_TABLES = ('tickets', 'incidents', 'kpi_daily_rollup')
+
+# Filtres période + technologie et période + personne (listes des modules tickets et incidents)
+DRILLDOWN_QUERIES = {
+    f"{table}_{column}_period": f"""
+        SELECT id, severity, status, opened_at, closed_at
+        FROM {table}
+        WHERE {column} = :value AND opened_at >= :start AND opened_at < :end AND deleted_at IS NULL
+        ORDER BY opened_at
+    """
+    for table in ('tickets', 'incidents')
+    for column in ('technology', 'assignee')
+}
+
+# Synthèse des incidents d'une période (servie par l'index couvrant)
+INCIDENTS_SUMMARY_QUERY = """
+    SELECT technology, status, COUNT(*), SUM(severity = 'critical'),
+           SUM((julianday(closed_at) - julianday(opened_at)) * 1440)
+    FROM incidents
+    WHERE opened_at >= :start AND opened_at < :end AND deleted_at IS NULL
+    GROUP BY technology, status
+"""
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+def dashboard_queries():
+    """
+    Renvoie les requêtes exécutées par le tableau de bord et le rafraîchissement des agrégats
+
+    Returns:
+        dict: {nom: requête SQL}
+    """
+    from modules.dashboard import TICKETS_EXPORT_QUERY, TICKETS_PERIOD_QUERY
+    from modules.dashboard import rollups
+
+    queries = {
+        "rollups_period": rollups.PERIOD_QUERY,
+        "rollups_high_water_mark": rollups.HIGH_WATER_MARK_QUERY,
+        "rollups_changed_days": rollups.CHANGED_DAYS_QUERY,
+        "rollups_rebuild_days": rollups.REBUILD_DAYS_QUERY,
+        "tickets_period": TICKETS_PERIOD_QUERY,
+        "tickets_export": TICKETS_EXPORT_QUERY,
+        "incidents_summary": INCIDENTS_SUMMARY_QUERY
+    }
+    queries.update(DRILLDOWN_QUERIES)
+    return queries
+
+def explain(connection, query):
+    """
+    Renvoie le plan d'exécution d'une requête, paramètres non liés
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI (schéma à jour)
+        query (str): Requête SQL (paramètres nommés ou positionnels)
+
+    Returns:
+        list: Lignes 'detail' du plan
+    """
+    names = re.findall(r":(\w+)", query)
+    params = {name: None for name in names} if names else (None,) * query.count('?')
+    return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+def full_scans(plan):
+    """
+    Renvoie les étapes d'un plan qui parcourent entièrement une table volumineuse
+    (y compris le parcours complet d'un index : le coût reste proportionnel à la table)
+
+    Args:
+        plan (list): Lignes 'detail' d'EXPLAIN QUERY PLAN
+
+    Returns:
+        list: Étapes fautives
+    """
+    problems = []
+    for detail in plan:
+        match = _SCAN.match(detail)
+        if match and match.group(1) in LARGE_TABLES:
+            problems.append(detail)
+    return problems
+
+def check_query_plans(connection, queries=None):
+    """
+    Vérifie qu'aucune requête du tableau de bord ne parcourt une table entière
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI (schéma à jour)
+        queries (dict, optional): {nom: requête SQL}. Par défaut None (dashboard_queries()).
+
+    Returns:
+        list: Tuples (nom, étape fautive) ; vide si tous les plans utilisent un index
+    """
+    queries = dashboard_queries() if queries is None else queries
+    # Table temporaire lue par le recalcul des agrégats
+    connection.execute("CREATE TEMP TABLE IF NOT EXISTS rollup_days (day TEXT PRIMARY KEY)")
+
+    problems = []
+    for name, query in queries.items():
+        for detail in full_scans(explain(connection, query)):
+            logger.warning(f"Parcours complet dans la requête {name}: {detail}")
+            problems.append((name, detail))
+    return problems
@@ -0,0 +1,257 @@
+# sync.py - Synchronisation incrémentale des sources API avec point de reprise persistant
+#
+# Utilisation (depuis le dossier server) :
+#   python -m database.sync --all
+#   python -m database.sync --source landesk_tickets --full
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from database import migrations
+from database.ingest import create_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Modes de synchronisation : 'since' (date de modification), 'cursor' (jeton opaque d'un flux
+# de modifications) ou 'full' (relecture complète à chaque passage)
+SYNC_MODES = ('since', 'cursor', 'full')
+
+def get_state(connection, connector, endpoint):
+    """
+    Lit le point de reprise d'une source
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI
+        connector (str): Nom du connecteur
+        endpoint (str): Endpoint synchronisé
+
+    Returns:
+        dict: État de la synchronisation, ou None si la source n'a jamais été synchronisée
+    """
+    cursor = connection.execute(
+        """
+        SELECT high_water_mark, cursor, last_sync_at, last_full_sync_at, last_status, last_error
+        FROM sync_state WHERE connector = ? AND endpoint = ?
+        """,
+        (connector, endpoint)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row))
+
+def save_state(connection, connector, endpoint, state):
+    """
+    Enregistre le point de reprise d'une source
+
+    Args:
+        connection (sqlite3.Connection): Connexion en écriture à la base KPI
+        connector (str): Nom du connecteur
+        endpoint (str): Endpoint synchronisé
+        state (dict): high_water_mark, cursor, last_sync_at, last_full_sync_at, last_status, last_error
+    """
+    with connection:
+        connection.execute(
+            """
+            INSERT OR REPLACE INTO sync_state
+                (connector, endpoint, high_water_mark, cursor, last_sync_at, last_full_sync_at,
+                 last_status, last_error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (connector, endpoint, state.get('high_water_mark'), state.get('cursor'), state.get('last_sync_at'),
+             state.get('last_full_sync_at'), state.get('last_status'), state.get('last_error'))
+        )
+
+class DeltaSync:
+    """
+    Synchronise une source en ne demandant que les enregistrements modifiés depuis le dernier
+    passage. Le point de reprise (date de modification ou jeton) est conservé dans sync_state par
+    connecteur et endpoint, et n'avance qu'après un passage réussi.
+
+    - Mises à jour tardives : le paramètre 'since' est reculé d'une fenêtre LOOKBACK, et l'upsert
+      du pipeline ignore les versions déjà connues ou plus anciennes.
+    - Suppressions : champ deleted_at (date ou booléen) fourni par la source, ou, à défaut,
+      relecture complète périodique (FULL_RESYNC_INTERVAL) qui marque supprimés les
+      enregistrements absents de la source.
+    """
+
+    def __init__(self, pipeline, config=None):
+        """
+        Initialise la synchronisation d'une source
+
+        Args:
+            pipeline (IngestPipeline): Pipeline d'ingestion de la source
+            config (dict, optional): Réglages SYNC de la source :
+                - MODE: 'since', 'cursor' ou 'full' (par défaut: 'since')
+                - SINCE_PARAM: Paramètre d'URL de la date de modification (par défaut: 'updated_since')
+                - SINCE_FORMAT: 'iso' ou 'epoch' (par défaut: 'iso')
+                - LOOKBACK: Fenêtre de recouvrement en secondes (par défaut: 300)
+                - CURSOR_PARAM: Paramètre d'URL du jeton de reprise (par défaut: 'sync_token')
+                - CURSOR_KEY: Chemin pointé du jeton dans le corps des pages (par défaut: 'sync_token')
+                - FULL_RESYNC_INTERVAL: Secondes entre deux relectures complètes (par défaut: None, jamais)
+                - SWEEP_DELETED: Marquer supprimés les enregistrements absents d'une relecture
+                  complète (par défaut: True)
+                Par défaut None.
+        """
+        config = config or {}
+        self.pipeline = pipeline
+        self.mode = config.get('MODE', 'since')
+        if self.mode not in SYNC_MODES:
+            raise ValueError(f"Mode de synchronisation non supporté: {self.mode}")
+        self.since_param = config.get('SINCE_PARAM', 'updated_since')
+        self.since_format = config.get('SINCE_FORMAT', 'iso')
+        self.lookback = config.get('LOOKBACK', 300)
+        self.cursor_param = config.get('CURSOR_PARAM', 'sync_token')
+        self.cursor_key = config.get('CURSOR_KEY', 'sync_token')
+        self.full_resync_interval = config.get('FULL_RESYNC_INTERVAL')
+        self.sweep_deleted = config.get('SWEEP_DELETED', True)
+        self.connector = pipeline.api.name
+        self.endpoint = pipeline.endpoint
+
+    def get_state(self):
+        """
+        Renvoie le point de reprise de la source
+
+        Returns:
+            dict: État de la synchronisation, ou None si la source n'a jamais été synchronisée
+        """
+        with self.pipeline.store.lease() as connection:
+            return get_state(connection, self.connector, self.endpoint)
+
+    def needs_full_sync(self, state):
+        """
+        Indique si le prochain passage doit relire toute la source
+
+        Args:
+            state (dict): État de la synchronisation (ou None)
+
+        Returns:
+            bool: True sans point de reprise, en mode 'full', ou si la relecture complète est due
+        """
+        if self.mode == 'full' or state is None or not state.get('last_full_sync_at'):
+            return True
+        if self.mode == 'since' and not state.get('high_water_mark'):
+            return True
+        if self.mode == 'cursor' and not state.get('cursor'):
+            return True
+        if self.full_resync_interval:
+            last_full = datetime.strptime(state['last_full_sync_at'], '%Y-%m-%dT%H:%M:%S')
+            return datetime.now() - last_full >= timedelta(seconds=self.full_resync_interval)
+        return False
+
+    def run(self, full=False):
+        """
+        Exécute un passage de synchronisation
+
+        Args:
+            full (bool, optional): Forcer une relecture complète. Par défaut False.
+
+        Returns:
+            dict: Statistiques du pipeline, plus mode ('delta' ou 'full'), since, deleted et state
+        """
+        # Le schéma (sync_state) est mis à jour avant la première lecture de l'état
+        with self.pipeline.store.lease() as connection:
+            migrations.migrate(connection)
+        state = self.get_state()
+        full = full or self.needs_full_sync(state)
+        new_state = dict(state or {})
+
+        query = {}
+        if not full and self.mode == 'since':
+            since = datetime.strptime(state['high_water_mark'], '%Y-%m-%dT%H:%M:%S') - \
+                timedelta(seconds=self.lookback)
+            query[self.since_param] = int(since.timestamp()) if self.since_format == 'epoch' \
+                else since.strftime('%Y-%m-%dT%H:%M:%S')
+        elif not full and self.mode == 'cursor':
+            query[self.cursor_param] = state['cursor']
+
+        tokens = []
+        on_page = None
+        if self.mode == 'cursor':
+            from connectors.api_connector import lookup_path
+
+            def on_page(body):
+                token = lookup_path(body, self.cursor_key) if isinstance(body, dict) else None
+                if token:
+                    tokens.append(token)
+
+        started_at = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        stats = self.pipeline.run({'query_params': query} if query else None, on_page=on_page)
+        stats.update({"mode": "full" if full else "delta", "since": query.get(self.since_param), "deleted": 0})
+
+        new_state['last_sync_at'] = started_at
+        if "error" in stats:
+            # Point de reprise inchangé : le passage suivant redemande les mêmes modifications
+            new_state.update(last_status='error', last_error=stats["error"])
+        else:
+            if full and self.sweep_deleted:
+                stats["deleted"] = self.pipeline.sweep()
+            latest = stats.get("latest_updated_at")
+            if latest and latest > (new_state.get('high_water_mark') or ''):
+                new_state['high_water_mark'] = latest
+            if tokens:
+                new_state['cursor'] = tokens[-1]
+            if full:
+                new_state['last_full_sync_at'] = started_at
+            new_state.update(last_status='ok', last_error=None)
+
+        with self.pipeline.store.lease() as connection:
+            save_state(connection, self.connector, self.endpoint, new_state)
+        stats["state"] = new_state
+        logger.info(f"Synchronisation {self.pipeline.name} ({stats['mode']}): {stats['written']} écrit(s), "
+                    f"{stats['deleted']} supprimé(s)" + (f", depuis {stats['since']}" if stats['since'] else ""))
+        return stats
+
+def create_sync(name, api=None, store=None, config=None):
+    """
+    Construit la synchronisation d'une source de INGEST_CONFIG
+
+    Args:
+        name (str): Nom de la source
+        api (APIConnector, optional): Connecteur de la source. Par défaut None (DATABASE_CONFIG['API']).
+        store (SQLConnector, optional): Connecteur de la base KPI. Par défaut None (DATABASE_CONFIG['SQL']).
+        config (dict, optional): Configuration d'ingestion. Par défaut None (INGEST_CONFIG).
+
+    Returns:
+        DeltaSync: Synchronisation prête à être exécutée
+    """
+    from config.settings import INGEST_CONFIG
+
+    config = config or INGEST_CONFIG
+    pipeline = create_pipeline(name, api, store, config)
+    return DeltaSync(pipeline, config['SOURCES'][name].get('SYNC'))
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    from config.settings import DATABASE_CONFIG, INGEST_CONFIG
+
+    parser = argparse.ArgumentParser(description="Synchronise les sources API avec la base KPI (modifications seules)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--source', choices=sorted(INGEST_CONFIG['SOURCES']), help="Source à synchroniser")
+    group.add_argument('--all', action='store_true', help="Synchroniser toutes les sources")
+    parser.add_argument('--full', action='store_true', help="Relire toute la source")
+    parser.add_argument('--database', default=DATABASE_CONFIG['SQL']['NAME'], help="Fichier SQLite cible")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from connectors.api_connector import APIConnector
+    from connectors.sql_connector import SQLConnector
+
+    api = APIConnector('kpi_api', DATABASE_CONFIG['API'])
+    store = SQLConnector('kpi_store', dict(DATABASE_CONFIG['SQL'], NAME=args.database))
+    failed = False
+    try:
+        for name in sorted(INGEST_CONFIG['SOURCES']) if args.all else [args.source]:
+            stats = create_sync(name, api, store).run(full=args.full)
+            print(f"{name} ({stats['mode']}): {stats['written']} écrits, {stats['deleted']} supprimés, "
+                  f"{stats['rejected']} rejetés en {stats['seconds']:.1f}s"
+                  + (f", erreur: {stats['error']}" if "error" in stats else ""))
+            failed = failed or "error" in stats
+    finally:
+        api.disconnect()
+        store.disconnect()
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
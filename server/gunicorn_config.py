@@ -0,0 +1,83 @@
+# gunicorn_config.py - Configuration Gunicorn du mode production, lue depuis SERVER_CONFIG
+#
+# Utilisation (depuis le dossier server) :
+#   gunicorn -c gunicorn_config.py wsgi:app
+#   python app.py --production --workers 8 --threads 4
+#
+# Rechargement sans interruption : kill -HUP <pid du maître>. Les nouveaux processus démarrent
+# avant l'arrêt des anciens, qui terminent leurs requêtes (GRACEFUL_TIMEOUT). Avec PRELOAD_APP,
+# le code est chargé par le maître : pour déployer une nouvelle version, kill -USR2 puis -QUIT
+# sur l'ancien maître.
+import logging
+import multiprocessing
+import os
+
+from config.settings import SERVER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def options(workers=None, threads=None):
+    """
+    Construit les paramètres Gunicorn
+
+    Args:
+        workers (int, optional): Nombre de processus. Par défaut SERVER_CONFIG['WORKERS'].
+        threads (int, optional): Threads par processus. Par défaut SERVER_CONFIG['THREADS'].
+
+    Returns:
+        dict: Paramètres Gunicorn (noms de la configuration Gunicorn)
+    """
+    workers = workers or SERVER_CONFIG.get('WORKERS') or multiprocessing.cpu_count() * 2 + 1
+    threads = threads or SERVER_CONFIG.get('THREADS', 1)
+    settings = {
+        'bind': f"{SERVER_CONFIG.get('HOST', '0.0.0.0')}:{SERVER_CONFIG.get('PORT', 5001)}",
+        'chdir': SERVER_DIR,
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': SERVER_CONFIG.get('PRELOAD_APP', True),
+        'timeout': SERVER_CONFIG.get('WORKER_TIMEOUT', 30),
+        'graceful_timeout': SERVER_CONFIG.get('GRACEFUL_TIMEOUT', 30),
+        'keepalive': SERVER_CONFIG.get('KEEPALIVE', 5),
+        'max_requests': SERVER_CONFIG.get('MAX_REQUESTS', 0),
+        'max_requests_jitter': SERVER_CONFIG.get('MAX_REQUESTS_JITTER', 0),
+        'on_reload': on_reload,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit
+    }
+
+    if SERVER_CONFIG.get('ENABLE_HTTPS', True):
+        cert_path = os.path.join(SERVER_DIR, 'config', 'ssl', 'cert.pem')
+        key_path = os.path.join(SERVER_DIR, 'config', 'ssl', 'key.pem')
+        if os.path.exists(cert_path) and os.path.exists(key_path):
+            settings['certfile'] = cert_path
+            settings['keyfile'] = key_path
+    return settings
+
+def on_reload(server):
+    """Signal HUP reçu : les processus sont remplacés un par un"""
+    server.log.info("Rechargement de la configuration et remplacement des processus")
+
+def post_fork(server, worker):
+    """Processus créé par le maître : le planificateur de rafraîchissement démarre dans chaque processus"""
+    server.log.info(f"Processus {worker.pid} démarré")
+    # Les threads ne survivent pas au fork : le planificateur est démarré ici, même avec PRELOAD_APP
+    try:
+        from modules.dashboard.refresh import start_background_refresh
+        start_background_refresh()
+    except Exception as e:
+        server.log.error(f"Planificateur non démarré dans le processus {worker.pid}: {str(e)}")
+    # Surveillance du build frontend (STATIC_INDEX_REFRESH='background') : relancée automatiquement
+    # après le fork depuis Python 3.7 (os.register_at_fork), ici pour Python 3.6
+    from utils.static_index import restart_watchers
+    restart_watchers()
+
+def worker_exit(server, worker):
+    """Processus arrêté : plus aucune tâche planifiée n'est lancée"""
+    from modules.dashboard.refresh import stop_background_refresh
+    stop_background_refresh()
+
+# Lecture directe par « gunicorn -c gunicorn_config.py » : les noms inconnus sont ignorés
+globals().update(options())
@@ -1,14 +1,32 @@
 # __init__.py - Module principal du tableau de bord
+import asyncio
 import logging
+import threading
+import time
 from flask import Blueprint, jsonify, request
 from datetime import datetime, timedelta
 import random
+from config.settings import APP_CONFIG, DATABASE_CONFIG
+from utils import compression, metrics, serializer
+from utils.streaming import stream_response
+from utils.cache import TTLCache
+from utils.columnar import to_columnar
+from . import kpi_engine, rollups
 
 logger = logging.getLogger(__name__)
 
 # Création du Blueprint pour les routes du module
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
+# Cache des réponses JSON déjà sérialisées, indexé par les filtres normalisés
+response_cache = TTLCache(
+    'dashboard',
+    ttl=APP_CONFIG.get('CACHE_TIMEOUT', 300),
+    max_entries=APP_CONFIG.get('CACHE_MAX_ENTRIES', 512),
+    max_bytes=APP_CONFIG.get('CACHE_MAX_BYTES', 32 * 1024 * 1024)
+)
+metrics.registry.track_cache(response_cache)
+
 def get_module_info():
     """
     Retourne les informations sur ce module pour l'enregistrement
@@ -25,6 +43,253 @@ def get_module_info():
         "order": 1  # Premier onglet
     }
 
+# Palette des graphiques, et couleurs attitrées des technologies connues
+COLOR_PALETTE = ["#4299E1", "#48BB78", "#F6AD55", "#F56565", "#9F7AEA", "#ED64A6"]
+TECHNOLOGY_COLORS = {
+    "Firewall": "#4299E1",
+    "VPN": "#48BB78",
+    "EDR": "#F6AD55",
+    "SIEM": "#F56565",
+    "IAM": "#9F7AEA",
+    "DLP": "#ED64A6"
+}
+
+# Tables de référence des données fictives (nombre de tickets et temps de traitement de base)
+MOCK_TECHNOLOGY_TICKETS = {"Firewall": 30, "VPN": 20, "EDR": 15, "SIEM": 25, "IAM": 10, "DLP": 5}
+MOCK_TECHNOLOGY_MINUTES = {"Firewall": 120, "VPN": 45, "EDR": 90, "SIEM": 150, "IAM": 60, "DLP": 30}
+MOCK_PERSONNEL = [
+    ("Alice", "#4299E1", 12),
+    ("Bob", "#48BB78", 8),
+    ("Carol", "#F6AD55", 15),
+    ("David", "#F56565", 10)
+]
+
+# Tickets des périodes courante et précédente (source 'tickets'), servis par l'index couvrant
+# ix_tickets_period_kpi. La période précédente se termine toujours au début de la courante.
+TICKETS_PERIOD_QUERY = """
+    SELECT technology,
+           COALESCE(assignee, '') AS assignee,
+           COALESCE(severity = 'critical', 0) AS critical,
+           (julianday(closed_at) - julianday(opened_at)) * 1440 AS processing_minutes,
+           opened_at >= :start AS current
+    FROM tickets
+    WHERE opened_at >= :previous_start AND opened_at < :end AND deleted_at IS NULL
+"""
+
+# Tickets d'une période, exportés ligne à ligne (recherche sur l'index ix_tickets_period_kpi)
+TICKETS_EXPORT_QUERY = """
+    SELECT id, technology, assignee, severity, status, opened_at, closed_at, updated_at
+    FROM tickets
+    WHERE opened_at >= :start AND opened_at < :end AND deleted_at IS NULL
+    ORDER BY opened_at
+"""
+
+# Formats de l'export des tickets (voir utils.streaming)
+EXPORT_FORMATS = ('ndjson', 'json')
+
+# Connecteur vers la base KPI, créé au premier usage (source 'rollups')
+_store = None
+_api = None  # Connecteur de l'API des tickets, créé au premier usage
+_store_lock = threading.Lock()
+_refresh_lock = threading.Lock()  # Un seul rafraîchissement des agrégats à la fois
+_last_refresh = 0.0
+
+def get_store():
+    """
+    Renvoie le connecteur SQL de la base KPI, en le créant au premier appel
+    
+    Returns:
+        SQLConnector: Connecteur vers la base des tickets et des agrégats
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            from connectors.sql_connector import SQLConnector
+            _store = SQLConnector('kpi_store', DATABASE_CONFIG['SQL'])
+            with _store.lease() as connection:
+                rollups.ensure_schema(connection)
+        return _store
+
+def release_store_lease():
+    """
+    Rend la connexion de la base KPI conservée par le thread courant (POOL_LEASE='thread'), en fin
+    de requête ou de tâche planifiée. Sans effet si la base n'a pas encore été ouverte.
+    """
+    store = _store
+    if store is not None:
+        store.release_lease()
+
+def get_api():
+    """
+    Renvoie le connecteur de l'API des tickets, en le créant au premier appel
+    
+    Returns:
+        APIConnector: Connecteur HTTP, ou None si aucune BASE_URL n'est configurée
+    """
+    global _api
+    if not DATABASE_CONFIG['API'].get('BASE_URL'):
+        return None
+    with _store_lock:
+        if _api is None:
+            from connectors.api_connector import APIConnector
+            _api = APIConnector('kpi_api', DATABASE_CONFIG['API'])
+        return _api
+
+def refresh_store(force=False):
+    """
+    Rafraîchit les agrégats si le dernier rafraîchissement date de plus de ROLLUP_REFRESH_INTERVAL.
+    Si un autre thread rafraîchit déjà, l'appel rend la main sans attendre ; un rafraîchissement
+    forcé attend la fin du précédent, qui a pu lire la base avant les dernières écritures.
+    
+    Args:
+        force (bool, optional): Rafraîchir sans tenir compte de l'intervalle. Par défaut False.
+        
+    Returns:
+        int: Nombre de jours recalculés
+    """
+    global _last_refresh
+    if not _refresh_lock.acquire(blocking=force):
+        return 0
+    try:
+        interval = APP_CONFIG.get('ROLLUP_REFRESH_INTERVAL', 60)
+        if not force and time.monotonic() - _last_refresh < interval:
+            return 0
+        _last_refresh = time.monotonic()
+        with get_store().lease() as connection:
+            return rollups.refresh_rollups(connection)
+    finally:
+        _refresh_lock.release()
+
+def generate_rollup_data(view_type, display_type, week=None, month=None, year=None):
+    """
+    Construit les données du tableau de bord à partir des agrégats journaliers de la base KPI.
+    Les vues hebdomadaire, mensuelle et annuelle sont des sommes de seaux journaliers.
+    
+    Args:
+        view_type (str): Type de vue (weekly, monthly, yearly)
+        display_type (str): Type d'affichage (total, average : moyenne par jour)
+        week (int, optional): Semaine du mois (1-4). Par défaut None.
+        month (int, optional): Numéro de mois. Par défaut None.
+        year (int, optional): Année. Par défaut None.
+        
+    Returns:
+        dict: Données au même format que generate_mock_data
+    """
+    refresh_store()
+    
+    start, end = rollups.period_bounds(view_type, week, month, year)
+    previous = rollups.period_bounds(view_type, *rollups.previous_period(view_type, week, month, year))
+    with get_store().lease(read_only=True) as connection:
+        current = rollups.query_period(connection, start, end)
+        before = rollups.query_period(connection, *previous)
+    
+    return build_payload(current, before, (end - start).days, view_type, display_type, week, month, year)
+
+def generate_ticket_data(view_type, display_type, week=None, month=None, year=None):
+    """
+    Construit les données du tableau de bord directement à partir des tickets des périodes
+    courante et précédente, agrégés en une passe par le moteur vectorisé (kpi_engine)
+    
+    Args:
+        view_type (str): Type de vue (weekly, monthly, yearly)
+        display_type (str): Type d'affichage (total, average : moyenne par jour)
+        week (int, optional): Semaine du mois (1-4). Par défaut None.
+        month (int, optional): Numéro de mois. Par défaut None.
+        year (int, optional): Année. Par défaut None.
+        
+    Returns:
+        dict: Données au même format que generate_mock_data
+    """
+    start, end = rollups.period_bounds(view_type, week, month, year)
+    previous_start, _ = rollups.period_bounds(view_type, *rollups.previous_period(view_type, week, month, year))
+    
+    result = get_store().fetch_data(
+        TICKETS_PERIOD_QUERY,
+        {"start": start.isoformat(), "previous_start": previous_start.isoformat(), "end": end.isoformat()},
+        result_format='columnar'
+    )
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    
+    current, before = kpi_engine.compute_period_totals(result["data"])
+    return build_payload(current, before, (end - start).days, view_type, display_type, week, month, year)
+
+def build_payload(current, before, days, view_type, display_type, week=None, month=None, year=None):
+    """
+    Assemble la réponse du tableau de bord à partir des totalisations de deux périodes
+    
+    Args:
+        current (dict): Totalisations de la période courante (voir rollups.query_period)
+        before (dict): Totalisations de la période précédente, pour les tendances
+        days (int): Nombre de jours de la période courante
+        view_type (str): Type de vue (weekly, monthly, yearly)
+        display_type (str): Type d'affichage (total, average : moyenne par jour)
+        week (int, optional): Semaine du mois. Par défaut None.
+        month (int, optional): Numéro de mois. Par défaut None.
+        year (int, optional): Année. Par défaut None.
+        
+    Returns:
+        dict: Données au même format que generate_mock_data
+    """
+    def scale(value):
+        return round(value / days, 1) if display_type == "average" else value
+    
+    tech_data = []
+    time_data = []
+    for index, (name, totals) in enumerate(sorted(current["by_technology"].items())):
+        color = TECHNOLOGY_COLORS.get(name, COLOR_PALETTE[index % len(COLOR_PALETTE)])
+        tech_data.append({"name": name, "color": color, "value": scale(totals["ticket_count"])})
+        time_data.append({"name": name, "color": color, "value": _average_minutes(totals)})
+    
+    personnel_data = [
+        {"name": name, "color": COLOR_PALETTE[index % len(COLOR_PALETTE)], "value": scale(totals["ticket_count"])}
+        for index, (name, totals) in enumerate(sorted(current["by_assignee"].items()))
+    ]
+    
+    current_summary = _summary(current["totals"])
+    previous_summary = _summary(before["totals"])
+    trends = {key: _trend(value, previous_summary[key]) for key, value in current_summary.items()}
+    
+    summary_data = dict(current_summary)
+    summary_data["total_tickets"] = scale(summary_data["total_tickets"])
+    summary_data["critical_incidents"] = scale(summary_data["critical_incidents"])
+    
+    return {
+        "tech_data": tech_data,
+        "personnel_data": personnel_data,
+        "time_data": time_data,
+        "summary_data": summary_data,
+        "trends": trends,
+        "period": {
+            "view_type": view_type,
+            "display_type": display_type,
+            "week": week,
+            "month": month,
+            "year": year
+        }
+    }
+
+def _average_minutes(totals):
+    """Temps de traitement moyen (minutes) des tickets résolus"""
+    if not totals["resolved_count"]:
+        return 0
+    return int(totals["processing_minutes"] / totals["resolved_count"])
+
+def _summary(totals):
+    """Indicateurs du tableau de synthèse pour une totalisation"""
+    return {
+        "total_tickets": totals["ticket_count"],
+        "avg_processing_time": _average_minutes(totals),
+        "critical_incidents": totals["critical_count"],
+        "resolution_rate": int(100 * totals["resolved_count"] / totals["ticket_count"]) if totals["ticket_count"] else 0
+    }
+
+def _trend(current, previous):
+    """Évolution en pourcentage par rapport à la période précédente"""
+    if not previous:
+        return 0
+    return int(round(100 * (current - previous) / previous))
+
 # Données fictives pour le tableau de bord
 def generate_mock_data(view_type, display_type, week=None, month=None, year=None):
     """
@@ -40,23 +305,9 @@ def generate_mock_data(view_type, display_type, week=None, month=None, year=None
     Returns:
         dict: Données générées
     """
-    # Configuration des technologies
-    tech_data = [
-        {"name": "Firewall", "color": "#4299E1"},
-        {"name": "VPN", "color": "#48BB78"},
-        {"name": "EDR", "color": "#F6AD55"},
-        {"name": "SIEM", "color": "#F56565"},
-        {"name": "IAM", "color": "#9F7AEA"},
-        {"name": "DLP", "color": "#ED64A6"}
-    ]
-    
-    # Configuration du personnel
-    personnel_data = [
-        {"name": "Alice", "color": "#4299E1"},
-        {"name": "Bob", "color": "#48BB78"},
-        {"name": "Carol", "color": "#F6AD55"},
-        {"name": "David", "color": "#F56565"}
-    ]
+    # Configuration des technologies et du personnel
+    tech_data = [{"name": name, "color": color} for name, color in TECHNOLOGY_COLORS.items()]
+    personnel_data = [{"name": name, "color": color} for name, color, _ in MOCK_PERSONNEL]
     
     # Générer des valeurs aléatoires basées sur les paramètres
     # Modifier les plages en fonction de la vue et du type d'affichage
@@ -69,7 +320,8 @@ def generate_mock_data(view_type, display_type, week=None, month=None, year=None
     if display_type == "average":
         multiplier *= 0.1
     
-    # Facteur d'aléatoire basé sur les paramètres pour rendre les données cohérentes
+    # Facteur d'aléatoire basé sur les paramètres pour rendre les données cohérentes.
+    # Un générateur propre à l'appel évite de partager l'état global du module random entre threads.
     seed = 0
     if year:
         seed += year * 1000
@@ -77,53 +329,31 @@ def generate_mock_data(view_type, display_type, week=None, month=None, year=None
         seed += month * 100
     if week:
         seed += week * 10
-    random.seed(seed)
+    rng = random.Random(seed)
     
     # Générer les données pour les technologies
     for tech in tech_data:
         # Valeur de base basée sur la technologie (certaines ont plus de tickets que d'autres)
-        base_value = {
-            "Firewall": 30,
-            "VPN": 20,
-            "EDR": 15,
-            "SIEM": 25,
-            "IAM": 10,
-            "DLP": 5
-        }.get(tech["name"], 10)
+        base_value = MOCK_TECHNOLOGY_TICKETS.get(tech["name"], 10)
         
         # Appliquer des variations aléatoires
-        variation = random.uniform(0.7, 1.3)
+        variation = rng.uniform(0.7, 1.3)
         tech["value"] = int(base_value * multiplier * variation)
     
     # Générer les données pour le personnel
-    for person in personnel_data:
-        # Valeur de base basée sur la personne
-        base_value = {
-            "Alice": 12,
-            "Bob": 8,
-            "Carol": 15,
-            "David": 10
-        }.get(person["name"], 10)
-        
+    for person, (_, _, base_value) in zip(personnel_data, MOCK_PERSONNEL):
         # Appliquer des variations aléatoires
-        variation = random.uniform(0.8, 1.2)
+        variation = rng.uniform(0.8, 1.2)
         person["value"] = int(base_value * multiplier * variation)
     
     # Données de temps de traitement (en minutes)
     time_data = []
     for tech in tech_data:
         # Temps de base basé sur la technologie
-        base_time = {
-            "Firewall": 120,
-            "VPN": 45,
-            "EDR": 90,
-            "SIEM": 150,
-            "IAM": 60,
-            "DLP": 30
-        }.get(tech["name"], 60)
+        base_time = MOCK_TECHNOLOGY_MINUTES.get(tech["name"], 60)
         
         # Appliquer des variations aléatoires
-        variation = random.uniform(0.9, 1.1)
+        variation = rng.uniform(0.9, 1.1)
         time_data.append({
             "name": tech["name"],
             "value": int(base_time * variation),
@@ -134,16 +364,16 @@ def generate_mock_data(view_type, display_type, week=None, month=None, year=None
     summary_data = {
         "total_tickets": sum(tech["value"] for tech in tech_data),
         "avg_processing_time": sum(t["value"] for t in time_data) // len(time_data),
-        "critical_incidents": random.randint(5, 15),
-        "resolution_rate": random.randint(90, 99)
+        "critical_incidents": rng.randint(5, 15),
+        "resolution_rate": rng.randint(90, 99)
     }
     
     # Tendances (augmentation ou diminution en pourcentage)
     trends = {
-        "total_tickets": random.choice([-1, 1]) * random.randint(5, 15),
-        "avg_processing_time": random.choice([-1, 1]) * random.randint(1, 10),
-        "critical_incidents": random.choice([-1, 1]) * random.randint(10, 30),
-        "resolution_rate": random.choice([-1, 1]) * random.randint(1, 5)
+        "total_tickets": rng.choice([-1, 1]) * rng.randint(5, 15),
+        "avg_processing_time": rng.choice([-1, 1]) * rng.randint(1, 10),
+        "critical_incidents": rng.choice([-1, 1]) * rng.randint(10, 30),
+        "resolution_rate": rng.choice([-1, 1]) * rng.randint(1, 5)
     }
     
     # Assembler toutes les données
@@ -162,6 +392,57 @@ def generate_mock_data(view_type, display_type, week=None, month=None, year=None
         }
     }
 
+def to_columnar_payload(data):
+    """
+    Convertit les séries du tableau de bord au format colonnes
+    
+    Args:
+        data (dict): Données produites par generate_mock_data
+        
+    Returns:
+        dict: Mêmes données, avec tech_data, personnel_data et time_data en colonnes
+    """
+    columnar = dict(data)
+    for series in ("tech_data", "personnel_data", "time_data"):
+        columnar[series] = to_columnar(data[series], ["name", "value", "color"])
+    return columnar
+
+def render_entry(view_type, display_type, week, month, year, output_format='rows'):
+    """
+    Calcule et sérialise la réponse du tableau de bord pour une combinaison de filtres
+    (requêtes et pré-chauffage du cache par le planificateur)
+    
+    Args:
+        view_type (str): Type de vue (weekly, monthly, yearly)
+        display_type (str): Type d'affichage (total, average)
+        week (int): Semaine du mois (1-4)
+        month (int): Numéro de mois
+        year (int): Année
+        output_format (str, optional): Format des séries (rows, columnar). Par défaut 'rows'.
+        
+    Returns:
+        tuple: (corps JSON sérialisé, ETag), entrée de response_cache
+    """
+    # Générer les données en fonction des paramètres
+    source = APP_CONFIG.get('DASHBOARD_SOURCE', 'mock')
+    if source == 'rollups':
+        data = generate_rollup_data(view_type, display_type, week, month, year)
+    elif source == 'tickets':
+        data = generate_ticket_data(view_type, display_type, week, month, year)
+    else:
+        data = generate_mock_data(view_type, display_type, week, month, year)
+    if output_format == 'columnar':
+        data = to_columnar_payload(data)
+    with metrics.json_serialization_duration.time('dashboard'):
+        body = serializer.dumps(data)
+    # L'ETag est calculé une fois et conservé avec la réponse sérialisée
+    return body, compression.content_etag(body)
+
+# Fin de chaque requête de l'application : la connexion prêtée au thread retourne au pool
+@dashboard_bp.teardown_app_request
+def release_request_lease(exception=None):
+    release_store_lease()
+
 # Route pour récupérer les données du tableau de bord
 @dashboard_bp.route('/data', methods=['GET'])
 def get_dashboard_data():
@@ -174,6 +455,7 @@ def get_dashboard_data():
         week (int): Numéro de semaine (1-4)
         month (int): Numéro de mois (1-12)
         year (int): Année
+        format (str): Format des séries (rows, columnar). Par défaut rows.
         
     Returns:
         JSON: Données du tableau de bord
@@ -181,6 +463,7 @@ def get_dashboard_data():
     # Récupérer les paramètres de la requête
     view_type = request.args.get('view_type', 'monthly')
     display_type = request.args.get('display_type', 'total')
+    output_format = request.args.get('format', 'rows')
     
     # Convertir les valeurs numériques
     try:
@@ -202,11 +485,131 @@ def get_dashboard_data():
         
     if month < 1 or month > 12:
         return jsonify({"error": "Numéro de mois invalide"}), 400
+        
+    if output_format not in ['rows', 'columnar']:
+        return jsonify({"error": "Format invalide"}), 400
     
-    # Générer les données en fonction des paramètres
-    data = generate_mock_data(view_type, display_type, week, month, year)
+    # Servir directement la réponse déjà sérialisée si elle est en cache
+    cache_key = (view_type, display_type, week, month, year, output_format)
+    entry = response_cache.get(cache_key)
+    cache_status = "HIT"
+    
+    if entry is None:
+        entry = render_entry(view_type, display_type, week, month, year, output_format)
+        response_cache.set(cache_key, entry, size=len(entry[0]))
+        cache_status = "MISS"
+    
+    body, etag = entry
+    response = serializer.json_response(body, headers={'X-Cache': cache_status, 'Cache-Control': 'no-cache'})
+    response.set_etag(etag)
+    return response
+
+# Route d'export des tickets d'une période, diffusée en flux
+@dashboard_bp.route('/tickets/export', methods=['GET'])
+def export_tickets():
+    """
+    Endpoint pour exporter les tickets d'une période depuis la base KPI. Les lignes sont lues par
+    lots (SQLConnector.fetch_iter) et envoyées par morceaux : la mémoire du processus reste bornée
+    quelle que soit la taille de la période.
+    
+    Query params:
+        view_type (str): Type de vue (weekly, monthly, yearly)
+        week (int): Numéro de semaine (1-4)
+        month (int): Numéro de mois (1-12)
+        year (int): Année
+        format (str): Format du flux (ndjson : un ticket par ligne, json : tableau). Par défaut ndjson.
+        
+    Returns:
+        Response: Tickets de la période, diffusés en flux
+    """
+    view_type = request.args.get('view_type', 'monthly')
+    output_format = request.args.get('format', 'ndjson')
+    
+    try:
+        week = int(request.args.get('week', 1))
+        month = int(request.args.get('month', datetime.now().month))
+        year = int(request.args.get('year', datetime.now().year))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Paramètres numériques invalides"}), 400
+    
+    if view_type not in ['weekly', 'monthly', 'yearly']:
+        return jsonify({"error": "Type de vue invalide"}), 400
+        
+    if week < 1 or week > 4:
+        return jsonify({"error": "Numéro de semaine invalide"}), 400
+        
+    if month < 1 or month > 12:
+        return jsonify({"error": "Numéro de mois invalide"}), 400
+        
+    if output_format not in EXPORT_FORMATS:
+        return jsonify({"error": "Format invalide"}), 400
+    
+    start, end = rollups.period_bounds(view_type, week, month, year)
+    rows = get_store().fetch_iter(
+        TICKETS_EXPORT_QUERY,
+        {"start": start.isoformat(), "end": end.isoformat()},
+        batch_size=APP_CONFIG.get('EXPORT_BATCH_SIZE', 1000)
+    )
+    response = stream_response(rows, output_format)
+    response.headers['Content-Disposition'] = (
+        f"attachment; filename=tickets-{start:%Y%m%d}-{end:%Y%m%d}.{output_format}")
+    return response
+
+# Route pour consulter les statistiques du cache
+@dashboard_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Endpoint pour consulter l'état du cache des réponses du tableau de bord
+    
+    Returns:
+        JSON: Statistiques du cache (succès, échecs, évictions, occupation)
+    """
+    return jsonify(response_cache.get_stats())
+
+# Route pour consulter l'état du rafraîchissement en arrière-plan
+@dashboard_bp.route('/refresh/status', methods=['GET'])
+def get_refresh_status():
+    """
+    Endpoint pour consulter les tâches du planificateur de ce processus (synchronisations,
+    pré-chauffage du cache)
+    
+    Returns:
+        JSON: {"running": bool, "jobs": {tâche: statistiques}}
+    """
+    from .refresh import get_scheduler
+    scheduler = get_scheduler()
+    return jsonify({
+        "running": scheduler is not None and scheduler.is_running(),
+        "jobs": scheduler.get_stats() if scheduler is not None else {}
+    })
+
+# Route asynchrone : les sources sont testées en parallèle
+@dashboard_bp.route('/sources/status', methods=['GET'])
+async def get_sources_status():
+    """
+    Endpoint pour vérifier l'état des sources de données configurées (base KPI, API)
+    
+    Returns:
+        JSON: {source: {"type", "connected", "latency"}}, latence en secondes
+    """
+    sources = {}
+    if APP_CONFIG.get('DASHBOARD_SOURCE', 'mock') != 'mock':
+        sources['kpi_store'] = get_store()
+    api = get_api()
+    if api is not None:
+        sources['kpi_api'] = api
+    
+    async def probe(connector):
+        start = time.perf_counter()
+        connected = await connector.test_connection_async()
+        return {
+            "type": connector.__class__.__name__,
+            "connected": connected,
+            "latency": time.perf_counter() - start
+        }
     
-    return jsonify(data)
+    results = await asyncio.gather(*(probe(connector) for connector in sources.values()))
+    return serializer.json_response(dict(zip(sources, results)))
 
 # Fonction pour enregistrer les routes du module
 def register_routes(app):
@@ -0,0 +1,156 @@
+# kpi_engine.py - Calcul vectorisé des KPI du tableau de bord à partir des colonnes de tickets
+import logging
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli sur la version en Python pur
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Colonnes attendues en entrée (résultat colonnes, voir utils.columnar)
+COLUMNS = ("technology", "assignee", "critical", "processing_minutes", "current")
+
+def compute_period_totals(columns):
+    """
+    Calcule en une passe les totalisations des périodes courante et précédente
+
+    Args:
+        columns (dict): Colonnes de même longueur :
+            - technology: technologie du ticket (ou tuple (valeurs distinctes, codes) déjà encodé)
+            - assignee: personne assignée, '' si non attribué (même format que technology)
+            - critical: 1 si le ticket est critique, 0 sinon
+            - processing_minutes: temps de traitement en minutes, None / NaN si non résolu
+            - current: 1 si le ticket appartient à la période courante, 0 pour la précédente
+
+    Returns:
+        tuple: (courante, précédente), chacune au format de rollups.query_period :
+            {"by_technology": {...}, "by_assignee": {...}, "totals": {...}}
+    """
+    if np is None:
+        return compute_period_totals_python(columns)
+    return compute_period_totals_numpy(columns)
+
+def compute_period_totals_numpy(columns):
+    """
+    Version NumPy : chaque série est un np.bincount sur un index combiné (période, groupe)
+
+    Args:
+        columns (dict): Colonnes décrites dans compute_period_totals
+
+    Returns:
+        tuple: (courante, précédente)
+    """
+    technology_names, technology_codes = _factorize(columns["technology"])
+    assignee_names, assignee_codes = _factorize(columns["assignee"])
+    # Une gravité absente (NULL) est lue comme NaN : comptée non critique, comme en Python pur
+    critical = np.nan_to_num(np.asarray(columns["critical"], dtype=np.float64))
+    minutes = np.asarray(columns["processing_minutes"], dtype=np.float64)
+    period = 1 - np.asarray(columns["current"], dtype=np.int64)  # 0 = courante, 1 = précédente
+
+    resolved = ~np.isnan(minutes)
+    minutes = np.where(resolved, minutes, 0.0)
+    resolved = resolved.astype(np.float64)
+
+    results = ({}, {})
+    for key, names, codes in (("by_technology", technology_names, technology_codes),
+                              ("by_assignee", assignee_names, assignee_codes)):
+        size = 2 * len(names)
+        index = period * len(names) + codes
+        series = {
+            "ticket_count": np.bincount(index, minlength=size),
+            "critical_count": np.bincount(index, weights=critical, minlength=size),
+            "resolved_count": np.bincount(index, weights=resolved, minlength=size),
+            "processing_minutes": np.bincount(index, weights=minutes, minlength=size)
+        }
+        for period_index, result in enumerate(results):
+            groups = {}
+            offset = period_index * len(names)
+            for position, name in enumerate(names):
+                count = int(series["ticket_count"][offset + position])
+                if count:
+                    groups[name] = {
+                        "ticket_count": count,
+                        "critical_count": int(series["critical_count"][offset + position]),
+                        "resolved_count": int(series["resolved_count"][offset + position]),
+                        "processing_minutes": float(series["processing_minutes"][offset + position])
+                    }
+            result[key] = groups
+
+    for result in results:
+        result["by_assignee"].pop('', None)
+        result["totals"] = _sum_groups(result["by_technology"])
+    return results
+
+def compute_period_totals_python(columns):
+    """
+    Version de référence en Python pur, une itération par ticket
+
+    Args:
+        columns (dict): Colonnes décrites dans compute_period_totals
+
+    Returns:
+        tuple: (courante, précédente)
+    """
+    results = ({"by_technology": {}, "by_assignee": {}}, {"by_technology": {}, "by_assignee": {}})
+    rows = zip(_decode(columns["technology"]), _decode(columns["assignee"]), columns["critical"],
+               columns["processing_minutes"], columns["current"])
+    for technology, assignee, critical, minutes, current in rows:
+        result = results[0 if current else 1]
+        resolved = minutes is not None and not math.isnan(minutes)
+        for groups, name in ((result["by_technology"], technology), (result["by_assignee"], assignee)):
+            totals = groups.get(name)
+            if totals is None:
+                totals = groups[name] = _empty_totals()
+            totals["ticket_count"] += 1
+            totals["critical_count"] += 1 if critical else 0
+            if resolved:
+                totals["resolved_count"] += 1
+                totals["processing_minutes"] += minutes
+
+    for result in results:
+        result["by_assignee"].pop('', None)
+        result["totals"] = _sum_groups(result["by_technology"])
+    return results
+
+def _factorize(values):
+    """
+    Encode une colonne catégorielle en codes entiers.
+    Une colonne déjà encodée peut être fournie sous la forme (valeurs distinctes, codes).
+
+    Returns:
+        tuple: (liste des valeurs distinctes, tableau des codes)
+    """
+    if isinstance(values, tuple):
+        names, codes = values
+        return list(names), np.asarray(codes, dtype=np.int64)
+
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        names, codes = np.unique(values, return_inverse=True)
+        return [str(name) for name in names], codes.astype(np.int64)
+
+    # Liste Python (résultat SQL) : un dictionnaire évite la conversion en tableau de chaînes et le tri
+    mapping = {}
+    codes = np.fromiter((mapping.setdefault(value, len(mapping)) for value in values),
+                        dtype=np.int64, count=len(values))
+    return list(mapping), codes
+
+def _decode(values):
+    """Renvoie les valeurs d'une colonne catégorielle, éventuellement fournie encodée"""
+    if isinstance(values, tuple):
+        names, codes = values
+        return (names[code] for code in codes)
+    return values
+
+def _sum_groups(groups):
+    """Additionne les totalisations de tous les groupes"""
+    totals = _empty_totals()
+    for group in groups.values():
+        for key in totals:
+            totals[key] += group[key]
+    return totals
+
+def _empty_totals():
+    """Renvoie une totalisation vide"""
+    return {"ticket_count": 0, "critical_count": 0, "resolved_count": 0, "processing_minutes": 0.0}
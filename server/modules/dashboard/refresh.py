@@ -0,0 +1,228 @@
+# refresh.py - Rafraîchissement en arrière-plan : synchronisations planifiées et pré-chauffage du cache
+#
+# Démarré dans chaque processus du serveur (gunicorn_config.post_fork, serveur de développement),
+# ou à part, pour les seules synchronisations (depuis le dossier server) :
+#   python -m modules.dashboard.refresh
+#   python -m modules.dashboard.refresh --once
+import argparse
+import logging
+import signal
+import threading
+from datetime import datetime
+
+from config.settings import APP_CONFIG, DATA_DIR, INGEST_CONFIG, SCHEDULER_CONFIG
+from utils.scheduler import Job, Scheduler, SkipRun, lock_path
+
+logger = logging.getLogger(__name__)
+
+# Tâche de pré-chauffage du cache des réponses
+WARM_JOB = 'warm_dashboard'
+
+VIEW_TYPES = ('weekly', 'monthly', 'yearly')
+DISPLAY_TYPES = ('total', 'average')
+
+# Planificateur du processus, créé par start_background_refresh
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def current_filters(now=None):
+    """
+    Combinaisons de filtres de la période courante, avec les clés utilisées par get_dashboard_data.
+    Les vues mensuelle et annuelle reçoivent aussi la semaine sélectionnée dans l'interface :
+    les quatre valeurs sont pré-calculées.
+
+    Args:
+        now (datetime, optional): Instant de référence. Par défaut maintenant.
+
+    Returns:
+        list: Tuples (view_type, display_type, week, month, year)
+    """
+    now = now or datetime.now()
+    current_week = min((now.day - 1) // 7 + 1, 4)
+    filters = []
+    for view_type in VIEW_TYPES:
+        weeks = [current_week] if view_type == 'weekly' else range(1, 5)
+        for display_type in DISPLAY_TYPES:
+            filters.extend((view_type, display_type, week, now.month, now.year) for week in weeks)
+    return filters
+
+def warm_cache(formats=None, ttl=None, now=None):
+    """
+    Recalcule les réponses de la période courante et remplace celles du cache : les requêtes
+    interactives sur ces filtres sont servies sans calcul
+
+    Args:
+        formats (list, optional): Formats des séries. Par défaut SCHEDULER_CONFIG['WARM_FORMATS'].
+        ttl (float, optional): Durée de vie des entrées. Par défaut celle du cache.
+        now (datetime, optional): Instant de référence. Par défaut maintenant.
+
+    Returns:
+        int: Nombre de réponses pré-calculées
+    """
+    from modules import dashboard
+
+    formats = formats or SCHEDULER_CONFIG.get('WARM_FORMATS', ['rows'])
+    warmed = 0
+    try:
+        if APP_CONFIG.get('DASHBOARD_SOURCE', 'mock') == 'rollups':
+            dashboard.refresh_store(force=True)
+        for view_type, display_type, week, month, year in current_filters(now):
+            for output_format in formats:
+                entry = dashboard.render_entry(view_type, display_type, week, month, year, output_format)
+                key = (view_type, display_type, week, month, year, output_format)
+                if dashboard.response_cache.set(key, entry, size=len(entry[0]), ttl=ttl):
+                    warmed += 1
+    finally:
+        dashboard.release_store_lease()
+    logger.debug(f"Cache du tableau de bord pré-chauffé: {warmed} réponse(s)")
+    return warmed
+
+def _warm_ttl(config):
+    """Durée de vie des entrées pré-chauffées : au moins deux intervalles, pour ne jamais expirer entre deux passages"""
+    ttl = APP_CONFIG.get('CACHE_TIMEOUT', 300)
+    if not ttl:
+        return None
+    interval = config.get('WARM_INTERVAL', 60) * (1 + config.get('JITTER', 0.1))
+    return max(ttl, 2 * interval)
+
+def _sync_job(scheduler, name, interval, config):
+    """
+    Construit la fonction de synchronisation planifiée d'une source
+
+    La synchronisation est sautée si un autre processus (worker, commande à part) l'a déjà
+    exécutée pendant l'intervalle courant, d'après sync_state. Si elle a écrit ou supprimé des
+    enregistrements, le cache de ce processus est pré-chauffé aussitôt.
+    """
+    state = {}
+    min_age = interval * (1 - config.get('JITTER', 0.1))
+
+    def run():
+        from database.sync import create_sync
+        from modules import dashboard
+
+        if "sync" not in state:
+            state["sync"] = create_sync(name, dashboard.get_api(), dashboard.get_store())
+        sync = state["sync"]
+        try:
+            previous = sync.get_state()
+            if previous and previous.get('last_sync_at'):
+                age = (datetime.now() - datetime.strptime(previous['last_sync_at'], '%Y-%m-%dT%H:%M:%S')).total_seconds()
+                if age < min_age:
+                    raise SkipRun(f"synchronisée il y a {age:.0f}s")
+            stats = sync.run()
+        finally:
+            dashboard.release_store_lease()
+        if "error" in stats:
+            raise RuntimeError(stats["error"])
+        if (stats["written"] or stats["deleted"]) and WARM_JOB in scheduler.jobs:
+            scheduler.run_job(WARM_JOB)
+    return run
+
+def build_scheduler(config=None, sync=None, warm=True):
+    """
+    Construit le planificateur : une tâche de synchronisation par source de INGEST_CONFIG (à
+    l'intervalle SYNC['INTERVAL'] de la source) et le pré-chauffage du cache
+
+    Args:
+        config (dict, optional): Réglages du planificateur. Par défaut SCHEDULER_CONFIG.
+        sync (bool, optional): Planifier les synchronisations. Par défaut config['SYNC_IN_PROCESS'].
+            Sans BASE_URL d'API configurée, aucune synchronisation n'est planifiée.
+        warm (bool, optional): Planifier le pré-chauffage du cache. Par défaut True.
+
+    Returns:
+        Scheduler: Planificateur prêt à être démarré
+    """
+    from modules import dashboard
+
+    config = config or SCHEDULER_CONFIG
+    jitter = config.get('JITTER', 0.1)
+    scheduler = Scheduler('refresh', max_workers=config.get('MAX_WORKERS', 2))
+    if sync is None:
+        sync = config.get('SYNC_IN_PROCESS', True)
+    api = None
+    if sync:
+        try:
+            api = dashboard.get_api()
+        except Exception as e:
+            # Le pré-chauffage du cache ne dépend pas de l'API : seules les synchronisations sont écartées
+            logger.error(f"Connecteur API indisponible, synchronisations non planifiées: {str(e)}")
+    if api is not None:
+        for name, source in sorted(INGEST_CONFIG['SOURCES'].items()):
+            interval = source.get('SYNC', {}).get('INTERVAL')
+            if not interval:
+                continue
+            job_name = f"sync_{name}"
+            scheduler.add(Job(job_name, _sync_job(scheduler, name, interval, config), interval, jitter,
+                              lock_path=lock_path(DATA_DIR, job_name)))
+    if warm:
+        ttl = _warm_ttl(config)
+        # Premier passage immédiat : les premières requêtes trouvent déjà le cache chaud
+        scheduler.add(Job(WARM_JOB, lambda: warm_cache(ttl=ttl), config.get('WARM_INTERVAL', 60), jitter,
+                          initial_delay=0))
+    return scheduler
+
+def start_background_refresh():
+    """
+    Démarre le planificateur du processus (sans effet s'il tourne déjà ou si SCHEDULER_CONFIG['ENABLED']
+    est faux). À appeler dans chaque processus qui sert des requêtes, après le fork.
+
+    Returns:
+        Scheduler: Planificateur démarré, ou None
+    """
+    global _scheduler
+    if not SCHEDULER_CONFIG.get('ENABLED', True):
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = build_scheduler()
+        _scheduler.start()
+        return _scheduler
+
+def stop_background_refresh():
+    """Arrête le planificateur du processus (les tâches en cours se terminent)"""
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.stop()
+
+def get_scheduler():
+    """
+    Renvoie le planificateur du processus
+
+    Returns:
+        Scheduler: Planificateur, ou None s'il n'a pas été démarré
+    """
+    return _scheduler
+
+def main():
+    """Point d'entrée en ligne de commande : synchronisations seules (le cache est propre à chaque processus du serveur)"""
+    parser = argparse.ArgumentParser(description="Synchronise les sources API à intervalles réguliers")
+    parser.add_argument('--once', action='store_true',
+                        help="Exécuter chaque synchronisation une fois (sauf si un autre processus vient de la faire)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    scheduler = build_scheduler(sync=True, warm=False)
+    if not scheduler.jobs:
+        raise SystemExit("Aucune source à synchroniser (DATABASE_CONFIG['API']['BASE_URL'] ou SYNC['INTERVAL'] absent)")
+    if args.once:
+        outcomes = {name: scheduler.run_job(name) for name in sorted(scheduler.jobs)}
+        for name, outcome in outcomes.items():
+            print(f"{name}: {outcome}")
+        if 'error' in outcomes.values():
+            raise SystemExit(1)
+        return
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    scheduler.start()
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    scheduler.stop(wait=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+# rollups.py - Agrégats KPI pré-calculés par jour, technologie et personne
+import logging
+import threading
+from datetime import date, datetime, timedelta
+
+from database import migrations
+
+logger = logging.getLogger(__name__)
+
+# Nom de l'agrégat dans la table d'état (point de reprise du rafraîchissement incrémental)
+ROLLUP_NAME = 'kpi_daily'
+
+# Recalcul des seaux d'une liste de jours à partir des tickets
+REBUILD_DAYS_QUERY = """
+    INSERT INTO kpi_daily_rollup
+        (day, technology, assignee, ticket_count, critical_count, resolved_count, processing_minutes)
+    SELECT date(opened_at), technology, COALESCE(assignee, ''),
+           COUNT(*),
+           COALESCE(SUM(severity = 'critical'), 0),  -- NULL si aucune sévérité n'est renseignée
+           SUM(closed_at IS NOT NULL),
+           COALESCE(SUM((julianday(closed_at) - julianday(opened_at)) * 1440), 0)
+    FROM tickets
+    WHERE opened_at >= :first_day AND opened_at < date(:last_day, '+1 day')
+      AND deleted_at IS NULL
+      AND date(opened_at) IN (SELECT day FROM temp.rollup_days)
+    GROUP BY date(opened_at), technology, COALESCE(assignee, '')
+"""
+
+# Point de reprise : date de la dernière modification de ticket
+HIGH_WATER_MARK_QUERY = "SELECT MAX(updated_at) FROM tickets"
+
+# Jours touchés par les tickets modifiés depuis le dernier passage
+CHANGED_DAYS_QUERY = """
+    SELECT DISTINCT date(opened_at) FROM tickets
+    WHERE updated_at > ? AND updated_at <= ?
+"""
+
+# Somme des seaux journaliers d'une période
+PERIOD_QUERY = """
+    SELECT technology, assignee,
+           SUM(ticket_count), SUM(critical_count), SUM(resolved_count), SUM(processing_minutes)
+    FROM kpi_daily_rollup
+    WHERE day >= ? AND day < ?
+    GROUP BY technology, assignee
+"""
+
+_refresh_lock = threading.Lock()
+
+def ensure_schema(connection):
+    """
+    Met le schéma de la base KPI à jour (tickets, incidents, agrégats et leurs index)
+
+    Args:
+        connection (sqlite3.Connection): Connexion en écriture à la base KPI
+    """
+    migrations.migrate(connection)
+
+def refresh_rollups(connection, full=False):
+    """
+    Met à jour les agrégats journaliers à partir des tickets modifiés depuis le dernier passage.
+    Seuls les jours touchés par des tickets dont updated_at dépasse le point de reprise, et les
+    jours signalés par l'ingestion (kpi_rollup_pending_days : mises à jour tardives, suppressions),
+    sont recalculés, dans une transaction unique.
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI
+        full (bool, optional): Recalculer tous les jours (après une correction massive ou un
+            changement de date d'ouverture). Par défaut False.
+
+    Returns:
+        int: Nombre de jours recalculés
+    """
+    with _refresh_lock:
+        state = connection.execute(
+            "SELECT high_water_mark FROM kpi_rollup_state WHERE name = ?", (ROLLUP_NAME,)
+        ).fetchone()
+        high_water_mark = None if full or state is None else state[0]
+
+        new_mark = connection.execute(HIGH_WATER_MARK_QUERY).fetchone()[0]
+        changed = new_mark is not None and (high_water_mark is None or new_mark > high_water_mark)
+        pending = connection.execute("SELECT EXISTS (SELECT 1 FROM kpi_rollup_pending_days)").fetchone()[0]
+        if not changed and not pending:
+            return 0
+
+        try:
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS rollup_days (day TEXT PRIMARY KEY)")
+            connection.execute("DELETE FROM temp.rollup_days")
+            if high_water_mark is None:
+                connection.execute("INSERT INTO temp.rollup_days SELECT DISTINCT date(opened_at) FROM tickets")
+                connection.execute("DELETE FROM kpi_daily_rollup")
+            else:
+                if changed:
+                    connection.execute(
+                        f"INSERT INTO temp.rollup_days {CHANGED_DAYS_QUERY}",
+                        (high_water_mark, new_mark)
+                    )
+                connection.execute("INSERT OR IGNORE INTO temp.rollup_days SELECT day FROM kpi_rollup_pending_days")
+                connection.execute(
+                    "DELETE FROM kpi_daily_rollup WHERE day IN (SELECT day FROM temp.rollup_days)"
+                )
+            # Jours signalés pendant le recalcul : conservés pour le passage suivant
+            connection.execute(
+                "DELETE FROM kpi_rollup_pending_days WHERE day IN (SELECT day FROM temp.rollup_days)"
+            )
+
+            first_day, last_day, days = connection.execute(
+                "SELECT MIN(day), MAX(day), COUNT(*) FROM temp.rollup_days"
+            ).fetchone()
+            if days:
+                connection.execute(REBUILD_DAYS_QUERY, {"first_day": first_day, "last_day": last_day})
+
+            new_mark = max(new_mark or '', high_water_mark or '') or None
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO kpi_rollup_state (name, high_water_mark, refreshed_at)
+                VALUES (?, ?, ?)
+                """,
+                (ROLLUP_NAME, new_mark, datetime.now().isoformat(timespec='seconds'))
+            )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+        logger.info(f"Agrégats KPI rafraîchis: {days} jour(s) recalculé(s) jusqu'à {new_mark}")
+        return days
+
+def period_bounds(view_type, week=None, month=None, year=None):
+    """
+    Calcule les bornes d'une période du tableau de bord
+
+    Args:
+        view_type (str): Type de vue (weekly, monthly, yearly)
+        week (int, optional): Semaine du mois (1-4, la 4e s'étend jusqu'à la fin du mois)
+        month (int, optional): Numéro de mois
+        year (int, optional): Année
+
+    Returns:
+        tuple: (premier jour inclus, dernier jour exclu) sous forme de date
+    """
+    if view_type == 'yearly':
+        return date(year, 1, 1), date(year + 1, 1, 1)
+
+    month_start = date(year, month, 1)
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    if view_type == 'monthly':
+        return month_start, next_month
+
+    start = month_start + timedelta(days=7 * (week - 1))
+    end = next_month if week >= 4 else start + timedelta(days=7)
+    return start, end
+
+def previous_period(view_type, week=None, month=None, year=None):
+    """
+    Renvoie les paramètres de la période précédente (pour le calcul des tendances)
+
+    Returns:
+        tuple: (week, month, year) de la période précédente
+    """
+    if view_type == 'yearly':
+        return week, month, year - 1
+    if view_type == 'monthly' or week <= 1:
+        previous_week = 4 if view_type == 'weekly' else week
+        if month == 1:
+            return previous_week, 12, year - 1
+        return previous_week, month - 1, year
+    return week - 1, month, year
+
+def query_period(connection, start, end):
+    """
+    Additionne les agrégats journaliers d'une période ; le coût dépend du nombre de seaux,
+    pas du nombre de tickets
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI
+        start (date): Premier jour inclus
+        end (date): Dernier jour exclu
+
+    Returns:
+        dict: Totaux par technologie ("by_technology"), par personne ("by_assignee") et globaux ("totals").
+            Chaque totalisation contient ticket_count, critical_count, resolved_count, processing_minutes.
+    """
+    rows = connection.execute(PERIOD_QUERY, (start.isoformat(), end.isoformat())).fetchall()
+
+    by_technology = {}
+    by_assignee = {}
+    totals = _empty_totals()
+    for technology, assignee, tickets, critical, resolved, minutes in rows:
+        for group in (by_technology.setdefault(technology, _empty_totals()),
+                      by_assignee.setdefault(assignee, _empty_totals()),
+                      totals):
+            group["ticket_count"] += tickets
+            group["critical_count"] += critical
+            group["resolved_count"] += resolved
+            group["processing_minutes"] += minutes
+
+    by_assignee.pop('', None)  # Tickets non attribués
+    return {"by_technology": by_technology, "by_assignee": by_assignee, "totals": totals}
+
+def _empty_totals():
+    """Renvoie une totalisation vide"""
+    return {"ticket_count": 0, "critical_count": 0, "resolved_count": 0, "processing_minutes": 0.0}
@@ -0,0 +1,207 @@
+# synthetic.py - Génération reproductible de tickets synthétiques pour les tests de charge
+#
+# Utilisation (depuis le dossier server) :
+#   python -m modules.dashboard.synthetic --count 1000000 --start 2024-01-01 --end 2025-01-01 --seed 42
+import argparse
+import logging
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli sur random.Random
+    np = None
+
+from . import rollups
+
+logger = logging.getLogger(__name__)
+
+# Répartition des tickets : (technologie, poids relatif, temps de traitement moyen en minutes)
+TECHNOLOGIES = [
+    ("Firewall", 30, 120),
+    ("VPN", 20, 45),
+    ("EDR", 15, 90),
+    ("SIEM", 25, 150),
+    ("IAM", 10, 60),
+    ("DLP", 5, 30)
+]
+PERSONNEL = [("Alice", 12), ("Bob", 8), ("Carol", 15), ("David", 10), (None, 2)]
+SEVERITIES = [("low", 50), ("medium", 30), ("high", 14), ("critical", 6)]
+
+# Probabilité qu'un ticket soit résolu, et forme de la loi gamma des temps de traitement
+RESOLUTION_RATE = 0.92
+PROCESSING_SHAPE = 2.0
+
+INSERT_TICKET = """
+    INSERT OR REPLACE INTO tickets
+        (id, technology, assignee, severity, status, opened_at, closed_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def generate_tickets(count, start, end, seed=0, batch_size=100000, first_id=0):
+    """
+    Génère des tickets synthétiques par lots. Le résultat ne dépend que des paramètres :
+    chaque appel utilise son propre générateur, sans état global partagé.
+
+    Args:
+        count (int): Nombre de tickets
+        start (datetime): Première date d'ouverture possible
+        end (datetime): Date d'ouverture maximale (exclue)
+        seed (int, optional): Graine du générateur. Par défaut 0.
+        batch_size (int, optional): Nombre de tickets par lot. Par défaut 100000.
+        first_id (int, optional): Numéro du premier ticket. Par défaut 0.
+
+    Yields:
+        list: Lot de tuples (id, technology, assignee, severity, status, opened_at, closed_at, updated_at)
+    """
+    span_seconds = int((end - start).total_seconds())
+    if np is not None:
+        generator = np.random.default_rng(seed)
+        batch = _numpy_batch
+    else:
+        generator = random.Random(seed)
+        batch = _python_batch
+
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        yield batch(generator, size, start, span_seconds, first_id + offset)
+
+def load_tickets(connection, count, start, end, seed=0, batch_size=100000, first_id=0):
+    """
+    Insère des tickets synthétiques dans la base KPI, un lot par transaction
+
+    Args:
+        connection (sqlite3.Connection): Connexion à la base KPI
+        count (int): Nombre de tickets
+        start (datetime): Première date d'ouverture possible
+        end (datetime): Date d'ouverture maximale (exclue)
+        seed (int, optional): Graine du générateur. Par défaut 0.
+        batch_size (int, optional): Nombre de tickets par lot. Par défaut 100000.
+        first_id (int, optional): Numéro du premier ticket. Par défaut 0.
+
+    Returns:
+        int: Nombre de tickets insérés
+    """
+    rollups.ensure_schema(connection)
+    start_time = time.perf_counter()
+    inserted = 0
+    for rows in generate_tickets(count, start, end, seed, batch_size, first_id):
+        with connection:
+            connection.executemany(INSERT_TICKET, rows)
+        inserted += len(rows)
+
+    elapsed = time.perf_counter() - start_time
+    logger.info(f"{inserted} tickets synthétiques insérés en {elapsed:.1f}s "
+                f"({inserted / elapsed if elapsed else 0:.0f} tickets/s)")
+    return inserted
+
+def _weights(table, column=1):
+    """Renvoie les valeurs et les probabilités normalisées d'une table de répartition"""
+    total = float(sum(row[column] for row in table))
+    return [row[0] for row in table], [row[column] / total for row in table]
+
+def _numpy_batch(generator, size, start, span_seconds, first_id):
+    """Génère un lot de tickets avec un numpy.random.Generator"""
+    technologies, technology_p = _weights(TECHNOLOGIES)
+    assignees, assignee_p = _weights(PERSONNEL)
+    severities, severity_p = _weights(SEVERITIES)
+    mean_minutes = np.array([row[2] for row in TECHNOLOGIES], dtype=np.float64)
+
+    technology_codes = generator.choice(len(technologies), size=size, p=technology_p)
+    assignee_codes = generator.choice(len(assignees), size=size, p=assignee_p)
+    severity_codes = generator.choice(len(severities), size=size, p=severity_p)
+
+    base = np.datetime64(start.replace(microsecond=0), 's')
+    opened = base + generator.integers(0, span_seconds, size=size).astype('timedelta64[s]')
+    minutes = generator.gamma(PROCESSING_SHAPE, mean_minutes[technology_codes] / PROCESSING_SHAPE)
+    resolved = generator.random(size) < RESOLUTION_RATE
+    closed = opened + (np.maximum(minutes, 1) * 60).astype('timedelta64[s]')
+
+    opened_at = np.datetime_as_string(opened, unit='s').tolist()
+    closed_at = np.datetime_as_string(closed, unit='s').tolist()
+    resolved = resolved.tolist()
+
+    rows = []
+    for index, (technology, assignee, severity) in enumerate(zip(technology_codes.tolist(),
+                                                                 assignee_codes.tolist(),
+                                                                 severity_codes.tolist())):
+        is_resolved = resolved[index]
+        closed_value = closed_at[index] if is_resolved else None
+        rows.append((
+            f"SYN-{first_id + index:09d}",
+            technologies[technology],
+            assignees[assignee],
+            severities[severity],
+            "closed" if is_resolved else "open",
+            opened_at[index],
+            closed_value,
+            closed_value or opened_at[index]
+        ))
+    return rows
+
+def _python_batch(generator, size, start, span_seconds, first_id):
+    """Génère un lot de tickets avec un random.Random (sans NumPy)"""
+    technologies, technology_p = _weights(TECHNOLOGIES)
+    assignees, assignee_p = _weights(PERSONNEL)
+    severities, severity_p = _weights(SEVERITIES)
+    mean_minutes = {row[0]: row[2] for row in TECHNOLOGIES}
+
+    technology_values = generator.choices(technologies, technology_p, k=size)
+    assignee_values = generator.choices(assignees, assignee_p, k=size)
+    severity_values = generator.choices(severities, severity_p, k=size)
+
+    rows = []
+    for index in range(size):
+        technology = technology_values[index]
+        opened = start + timedelta(seconds=generator.randrange(span_seconds))
+        minutes = generator.gammavariate(PROCESSING_SHAPE, mean_minutes[technology] / PROCESSING_SHAPE)
+        opened_at = opened.isoformat()
+        closed_at = None
+        if generator.random() < RESOLUTION_RATE:
+            closed_at = (opened + timedelta(seconds=int(max(minutes, 1) * 60))).isoformat()
+        rows.append((
+            f"SYN-{first_id + index:09d}",
+            technology,
+            assignee_values[index],
+            severity_values[index],
+            "closed" if closed_at else "open",
+            opened_at,
+            closed_at,
+            closed_at or opened_at
+        ))
+    return rows
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    from config.settings import DATABASE_CONFIG
+
+    parser = argparse.ArgumentParser(description="Génère des tickets synthétiques dans la base KPI")
+    parser.add_argument('--count', type=int, default=100000, help="Nombre de tickets")
+    parser.add_argument('--start', default='2024-01-01', help="Première date d'ouverture (AAAA-MM-JJ)")
+    parser.add_argument('--end', default='2025-01-01', help="Date d'ouverture maximale exclue (AAAA-MM-JJ)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du générateur")
+    parser.add_argument('--batch-size', type=int, default=100000, help="Tickets par transaction")
+    parser.add_argument('--database', default=DATABASE_CONFIG['SQL']['NAME'], help="Fichier SQLite cible")
+    parser.add_argument('--refresh-rollups', action='store_true', help="Recalculer les agrégats après l'insertion")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    connection = sqlite3.connect(args.database)
+    try:
+        load_tickets(
+            connection,
+            args.count,
+            datetime.strptime(args.start, '%Y-%m-%d'),
+            datetime.strptime(args.end, '%Y-%m-%d'),
+            seed=args.seed,
+            batch_size=args.batch_size
+        )
+        if args.refresh_rollups:
+            rollups.refresh_rollups(connection, full=True)
+    finally:
+        connection.close()
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,23 @@
 # module_registry.py - Registre central pour tous les modules
+import hashlib
+import json
 import logging
 import os
 import importlib
 import pkgutil
 import inspect
+import threading
+from flask import Blueprint
+from config.settings import DATA_DIR
+from utils import metrics, serializer
+from utils.compression import content_etag
 
 logger = logging.getLogger(__name__)
 
+# Manifeste de la dernière découverte (informations et préfixes d'URL de chaque module)
+MANIFEST_PATH = os.path.join(DATA_DIR, 'modules_manifest.json')
+MANIFEST_VERSION = 1
+
 class ModuleRegistry:
     """
     Gère l'enregistrement et le suivi de tous les modules disponibles.
@@ -17,6 +28,9 @@ class ModuleRegistry:
         """Initialise le registre des modules"""
         self.modules = {}  # Dictionnaire des modules enregistrés {nom: info_module}
         self.initialized = False
+        self.version = 0  # Incrémentée à chaque modification du registre
+        self._snapshot = None  # (version, JSON de get_modules_info, ETag)
+        self._snapshot_lock = threading.Lock()
     
     def register_module(self, module_name, module_info):
         """
@@ -30,43 +44,99 @@ class ModuleRegistry:
             logger.warning(f"Module {module_name} déjà enregistré, mise à jour des informations")
         
         self.modules[module_name] = module_info
+        self._invalidate()
         logger.info(f"Module enregistré: {module_name}")
     
-    def discover_modules(self):
+    def discover_modules(self, app=None):
         """
-        Découvre automatiquement tous les modules dans le répertoire 'modules'
+        Découvre automatiquement tous les modules dans le répertoire 'modules', en une seule passe :
+        chaque package est importé une fois, ses informations enregistrées et, si une application
+        est fournie, ses routes ajoutées. Le résultat est écrit dans le manifeste.
+        
+        Args:
+            app (Flask, optional): Application dans laquelle enregistrer les routes. Par défaut None.
         """
         logger.info("Découverte automatique des modules...")
-        current_dir = os.path.dirname(os.path.abspath(__file__))
+        entries = []
         
-        for _, module_name, is_pkg in pkgutil.iter_modules([current_dir]):
-            if is_pkg and module_name != "__pycache__":  # C'est un package (dossier)
-                try:
+        for module_name in _module_names():
+            try:
+                with metrics.module_registration_duration.time(module_name):
                     # Importer le module dynamiquement
                     module = importlib.import_module(f"modules.{module_name}")
+                    has_routes = hasattr(module, "register_routes")
+                    if app is not None:
+                        if has_routes:
+                            logger.info(f"Enregistrement du module: {module_name}")
+                            module.register_routes(app)
+                        else:
+                            logger.warning(f"Module {module_name} n'a pas de fonction register_routes")
+                
+                # Vérifier si le module a une fonction get_module_info
+                if hasattr(module, "get_module_info"):
+                    module_info = module.get_module_info()
+                else:
+                    # Créer des informations de base sur le module
+                    module_info = {
+                        "name": module_name,
+                        "title": module_name.capitalize(),
+                        "description": f"Module {module_name}",
+                        "enabled": True,
+                        "icon": "module",
+                        "order": 999  # Ordre par défaut
+                    }
+                self.register_module(module_name, module_info)
+                entries.append({
+                    "name": module_name,
+                    "info": module_info,
+                    "has_routes": has_routes,
+                    "url_prefixes": _url_prefixes(module)
+                })
                     
-                    # Vérifier si le module a une fonction get_module_info
-                    if hasattr(module, "get_module_info"):
-                        module_info = module.get_module_info()
-                        self.register_module(module_name, module_info)
-                    else:
-                        # Créer des informations de base sur le module
-                        module_info = {
-                            "name": module_name,
-                            "title": module_name.capitalize(),
-                            "description": f"Module {module_name}",
-                            "enabled": True,
-                            "icon": "module",
-                            "order": 999  # Ordre par défaut
-                        }
-                        self.register_module(module_name, module_info)
-                        
-                except Exception as e:
-                    logger.error(f"Erreur lors de la découverte du module {module_name}: {str(e)}")
+            except Exception as e:
+                logger.error(f"Erreur lors de la découverte du module {module_name}: {str(e)}")
         
-        # Trier les modules par ordre
+        self._finish_discovery()
+        _write_manifest(entries)
+    
+    def setup(self, app, lazy=True):
+        """
+        Enregistre les modules dans l'application. Si le manifeste correspond aux sources actuelles,
+        les informations en sont lues sans importer les modules, et chaque module n'est importé qu'à
+        la première requête visant l'un de ses préfixes d'URL. Sinon, découverte complète.
+        
+        Args:
+            app (Flask): Application Flask
+            lazy (bool, optional): Différer l'import des modules. Par défaut True.
+            
+        Returns:
+            LazyModuleLoader: Middleware de chargement différé, ou None si tout a été importé
+        """
+        manifest = _read_manifest() if lazy else None
+        if manifest is None:
+            self.discover_modules(app)
+            return None
+        
+        loader = LazyModuleLoader(app.wsgi_app, app)
+        for entry in manifest["modules"]:
+            self.register_module(entry["name"], entry["info"])
+            if not entry["has_routes"]:
+                continue
+            if entry["url_prefixes"]:
+                loader.add(entry["name"], entry["url_prefixes"])
+            else:
+                # Routes sans préfixe connu : import immédiat
+                _load_module(app, entry["name"])
+        self._finish_discovery()
+        app.wsgi_app = loader
+        logger.info(f"Modules lus depuis le manifeste, import différé: {', '.join(loader.pending_modules()) or 'aucun'}")
+        return loader
+    
+    def _finish_discovery(self):
+        """Trie les modules par ordre et marque le registre comme initialisé"""
         sorted_modules = sorted(self.modules.items(), key=lambda x: x[1].get("order", 999))
         self.modules = dict(sorted_modules)
+        self._invalidate()
         
         self.initialized = True
         logger.info(f"Découverte terminée. {len(self.modules)} modules trouvés.")
@@ -90,6 +160,35 @@ class ModuleRegistry:
             
         return modules_list
     
+    def get_modules_snapshot(self):
+        """
+        Renvoie la liste des modules déjà sérialisée en JSON. L'instantané est calculé une fois
+        par version du registre ; les modifications passent par register_module et enable_module.
+        
+        Returns:
+            tuple: (JSON encodé en UTF-8, ETag dérivé de la version et du contenu)
+        """
+        if not self.initialized:
+            self.discover_modules()
+        
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == self.version:
+            return snapshot[1], snapshot[2]
+        
+        with self._snapshot_lock:
+            version = self.version
+            snapshot = self._snapshot
+            if snapshot is None or snapshot[0] != version:
+                with metrics.json_serialization_duration.time('modules'):
+                    body = serializer.dumps(self.get_modules_info())
+                snapshot = (version, body, f"v{version}-{content_etag(body)[:16]}")
+                self._snapshot = snapshot
+        return snapshot[1], snapshot[2]
+    
+    def _invalidate(self):
+        """Marque l'instantané JSON comme périmé"""
+        self.version += 1
+    
     def get_module(self, module_name):
         """
         Obtient les informations sur un module spécifique
@@ -140,9 +239,143 @@ class ModuleRegistry:
             return False
             
         self.modules[module_name]["enabled"] = enabled
+        self._invalidate()
         logger.info(f"Module {module_name} {'activé' if enabled else 'désactivé'}")
         return True
 
+class LazyModuleLoader:
+    """
+    Middleware WSGI qui importe un module et enregistre ses routes à la première requête
+    dont le chemin commence par l'un de ses préfixes d'URL
+    """
+    
+    def __init__(self, wsgi_app, app):
+        """
+        Args:
+            wsgi_app (callable): Application WSGI enveloppée
+            app (Flask): Application Flask dans laquelle enregistrer les routes
+        """
+        self.wsgi_app = wsgi_app
+        self.app = app
+        self._pending = {}  # {préfixe: nom du module}
+        self._lock = threading.Lock()
+    
+    def add(self, module_name, url_prefixes):
+        """Déclare un module à importer à la première requête sur l'un de ses préfixes"""
+        with self._lock:
+            for prefix in url_prefixes:
+                self._pending[prefix.rstrip('/')] = module_name
+    
+    def pending_modules(self):
+        """Renvoie les noms des modules pas encore importés"""
+        with self._lock:
+            return sorted(set(self._pending.values()))
+    
+    def load_all(self):
+        """Importe tous les modules en attente (préchargement avant fork des workers)"""
+        for module_name in self.pending_modules():
+            self._load(module_name)
+    
+    def __call__(self, environ, start_response):
+        # Lecture sans verrou : une fois tous les modules importés, les requêtes ne le prennent plus
+        if self._pending:
+            self._load_for_path(environ.get('PATH_INFO', ''))
+        return self.wsgi_app(environ, start_response)
+    
+    def _load_for_path(self, path):
+        """
+        Importe le module dont l'un des préfixes couvre le chemin. La recherche du préfixe et
+        l'enregistrement des routes (modification de app.url_map) se font sous le même verrou :
+        les requêtes simultanées attendent la fin de l'enregistrement au lieu de le répéter.
+        """
+        with self._lock:
+            for prefix, module_name in self._pending.items():
+                if path == prefix or path.startswith(prefix + '/'):
+                    break
+            else:
+                return
+            self._register(module_name)
+    
+    def _load(self, module_name):
+        """Importe un module une seule fois, même si plusieurs requêtes arrivent en même temps"""
+        with self._lock:
+            if module_name in self._pending.values():
+                self._register(module_name)
+    
+    def _register(self, module_name):
+        """Importe un module et retire ses préfixes des modules en attente (le verrou doit être détenu)"""
+        _load_module(self.app, module_name)
+        for prefix in [prefix for prefix, name in self._pending.items() if name == module_name]:
+            del self._pending[prefix]
+
+def _module_names():
+    """Liste les packages du dossier modules"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return [module_name for _, module_name, is_pkg in pkgutil.iter_modules([current_dir])
+            if is_pkg and module_name != "__pycache__"]
+
+def _load_module(app, module_name):
+    """Importe un module et enregistre ses routes dans l'application"""
+    try:
+        with metrics.module_registration_duration.time(module_name):
+            module = importlib.import_module(f"modules.{module_name}")
+            logger.info(f"Enregistrement du module: {module_name}")
+            module.register_routes(app)
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement du module {module_name}: {str(e)}")
+
+def _url_prefixes(module):
+    """Préfixes d'URL des Blueprints définis par un module"""
+    return sorted({
+        value.url_prefix for value in vars(module).values()
+        if isinstance(value, Blueprint) and value.url_prefix
+    })
+
+def _sources_fingerprint():
+    """
+    Empreinte des sources des modules (chemins, tailles et dates de modification des fichiers .py) :
+    le manifeste n'est réutilisé que si aucun fichier n'a changé
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1()
+    for module_name in _module_names():
+        for directory, subdirectories, files in os.walk(os.path.join(current_dir, module_name)):
+            subdirectories[:] = sorted(name for name in subdirectories if name != '__pycache__')
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    stat = os.stat(os.path.join(directory, name))
+                    relative = os.path.relpath(os.path.join(directory, name), current_dir)
+                    digest.update(f"{relative}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def _read_manifest():
+    """
+    Lit le manifeste s'il existe et correspond aux sources actuelles
+    
+    Returns:
+        dict: Manifeste, ou None s'il est absent, illisible ou périmé
+    """
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("fingerprint") != _sources_fingerprint():
+        logger.info("Manifeste des modules périmé, nouvelle découverte")
+        return None
+    return manifest
+
+def _write_manifest(entries):
+    """Écrit le manifeste de façon atomique (fichier temporaire puis renommage)"""
+    manifest = {"version": MANIFEST_VERSION, "fingerprint": _sources_fingerprint(), "modules": entries}
+    temporary_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+        os.replace(temporary_path, MANIFEST_PATH)
+    except (OSError, TypeError) as e:
+        logger.warning(f"Impossible d'écrire le manifeste des modules: {str(e)}")
+
 # Créer une instance singleton du registre
 module_registry = ModuleRegistry()
 
@@ -155,6 +388,10 @@ def get_modules_info():
     """Obtient les informations sur tous les modules"""
     return module_registry.get_modules_info()
 
+def get_modules_snapshot():
+    """Obtient la liste des modules sérialisée et son ETag"""
+    return module_registry.get_modules_snapshot()
+
 def get_module(module_name):
     """Obtient les informations sur un module spécifique"""
     return module_registry.get_module(module_name)
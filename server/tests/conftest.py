@@ -0,0 +1,129 @@
+# conftest.py - Configuration commune des tests (imports depuis le dossier server, base KPI temporaire)
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+@pytest.fixture
+def kpi_connection():
+    """Connexion SQLite en mémoire, au schéma de la base KPI à jour"""
+    from database import migrations
+
+    connection = sqlite3.connect(':memory:')
+    migrations.migrate(connection)
+    yield connection
+    connection.close()
+
+@pytest.fixture
+def server_app(monkeypatch):
+    """Application du serveur (app.create_app) sans les modules : routes propres et hooks seulement"""
+    from config.settings import APP_CONFIG
+    import app
+
+    monkeypatch.setitem(APP_CONFIG, 'MODULES_ENABLED', False)
+    server_app = app.create_app()
+    yield server_app
+    server_app.extensions['static_index'].stop_watcher()
+
+class FakeAPI:
+    """Source paginée en mémoire : chaque appel à fetch_pages sert les pages de 'pages'"""
+
+    name = 'fake_api'
+
+    def __init__(self, pages=None):
+        self.pages = pages or []
+        self.requests = []
+
+    def fetch_pages(self, endpoint, params=None, pagination=None):
+        self.requests.append(params or {})
+        on_page = (pagination or {}).get('on_page')
+        for body in self.pages:
+            if on_page:
+                on_page(body)
+            for record in body["data"]:
+                yield record
+
+@pytest.fixture
+def kpi_store(tmp_path):
+    """Connecteur SQL vers une base KPI temporaire"""
+    from config.settings import DATABASE_CONFIG
+    from connectors.sql_connector import SQLConnector
+
+    store = SQLConnector('test_store', dict(DATABASE_CONFIG['SQL'], NAME=str(tmp_path / 'kpi.db')))
+    yield store
+    store.disconnect()
+
+@pytest.fixture
+def fake_api():
+    """Source paginée en mémoire"""
+    return FakeAPI()
+
+def ticket_record(ticket_id, updated_at, status='open', priority='HIGH', category='VPN'):
+    """Ticket au format de la source 'landesk_tickets'"""
+    return {"id": ticket_id, "category": category, "assignee": {"name": "Bob"}, "priority": priority,
+            "status": status, "created_at": "2024-03-01T08:00:00", "closed_at": None, "updated_at": updated_at}
+
+class StubAPI:
+    """
+    Serveur HTTP local (werkzeug, un thread par connexion) : chaque chemin de 'routes' est servi par
+    une fonction recevant la requête et renvoyant une Response. Les requêtes reçues et les
+    connexions TCP utilisées sont enregistrées.
+    """
+
+    def __init__(self):
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class KeepAliveHandler(WSGIRequestHandler):
+            protocol_version = 'HTTP/1.1'  # connexions persistantes, comme une API réelle
+
+        self.routes = {}
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self.server = make_server('127.0.0.1', 0, self.application, threaded=True,
+                                  request_handler=KeepAliveHandler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def route(self, path):
+        """Décorateur : enregistre la fonction qui sert 'path'"""
+        def register(handler):
+            self.routes[path] = handler
+            return handler
+        return register
+
+    def application(self, environ, start_response):
+        from werkzeug.wrappers import Request, Response
+
+        request = Request(environ)
+        with self._lock:
+            self.requests.append(request)
+            self.connections.add(environ.get('REMOTE_PORT'))
+        handler = self.routes.get(request.path)
+        if handler is None:
+            response = Response('{"error": "absent"}', status=404, mimetype='application/json')
+        else:
+            response = handler(request)
+        return response(environ, start_response)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_api():
+    """Serveur HTTP local pour les tests du connecteur API"""
+    stub = StubAPI()
+    yield stub
+    stub.close()
+
+def json_response(body, status=200, headers=None):
+    """Réponse JSON du serveur local"""
+    from werkzeug.wrappers import Response
+
+    return Response(json.dumps(body), status=status, headers=headers, mimetype='application/json')
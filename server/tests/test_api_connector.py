@@ -0,0 +1,320 @@
+# test_api_connector.py - Nouvelles tentatives, disjoncteur, appels parallèles et pagination du connecteur API
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from conftest import json_response
+from connectors import api_connector as api_module
+from connectors.api_connector import APIConnector, PaginationError
+
+def make_response(status_code, body=None, headers=None):
+    """Réponse HTTP construite sans serveur"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body if body is not None else {}).encode('utf-8')
+    response.headers['Content-Type'] = 'application/json'
+    response.headers.update(headers or {})
+    response.url = f"http://api.test/{status_code}"
+    return response
+
+class FakeSession:
+    """Session HTTP rejouant une suite de réponses (ou d'exceptions à lever)"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        with self._lock:
+            self.calls += 1
+            outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+def make_connector(outcomes, **config):
+    settings = {'BASE_URL': 'http://api.test', 'HTTP_CACHE_ENABLED': False,
+                'BACKOFF_BASE': 0, 'BACKOFF_MAX': 0, 'BREAKER_FAILURE_THRESHOLD': 2}
+    settings.update(config)
+    connector = APIConnector('test_api', settings)
+    connector.session = FakeSession(outcomes)
+    connector.is_connected = True
+    return connector
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(api_module.time, 'sleep', lambda delay: None)
+
+def test_transient_errors_are_retried():
+    connector = make_connector([make_response(503), make_response(200, {"ok": True})], RETRIES=2)
+    result = connector.fetch_data('/tickets')
+    assert result["data"] == {"ok": True}
+    assert connector.session.calls == 2
+    info = connector.get_info()["requests"]
+    assert (info["count"], info["retries"]) == (1, 1)
+    assert connector.circuit_breaker.state == 'closed'
+
+def test_client_errors_do_not_open_the_breaker():
+    connector = make_connector([make_response(404)])
+    for _ in range(5):
+        assert connector.fetch_data('/absent')["status_code"] == 404
+    assert connector.session.calls == 5
+    assert connector.circuit_breaker.state == 'closed'
+
+@pytest.mark.parametrize('outcome', [ValueError("réponse illisible"), make_response(500)])
+def test_other_errors_open_the_breaker(outcome):
+    connector = make_connector([outcome], RETRIES=0)
+    assert "error" in connector.fetch_data('/tickets')
+    assert "error" in connector.fetch_data('/tickets')
+    assert connector.circuit_breaker.state == 'open'
+    result = connector.fetch_data('/tickets')
+    assert result["circuit_open"]
+    assert connector.session.calls == 2
+
+def test_unsupported_method_is_not_sent():
+    connector = make_connector([make_response(200)])
+    result = connector.fetch_data('/tickets', {'method': 'PATCH'})
+    assert result == {"error": "Méthode HTTP non supportée: PATCH"}
+    assert connector.session.calls == 0
+    assert connector.circuit_breaker.get_stats()["consecutive_failures"] == 0
+
+def test_concurrent_callers_share_one_executor():
+    connector = make_connector([make_response(200)])
+    barrier = threading.Barrier(8)
+    executors = []
+
+    def get_executor():
+        barrier.wait()
+        executors.append(connector._get_executor())
+
+    threads = [threading.Thread(target=get_executor) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(executor) for executor in executors}) == 1
+    connector.disconnect()
+    assert connector.executor is None
+
+def test_counters_under_parallel_calls():
+    connector = make_connector([make_response(200, {"ok": True})], MAX_WORKERS=8)
+    results = connector.fetch_many([f'/tickets/{i}' for i in range(200)])
+    assert len(results) == 200
+    assert connector.get_info()["requests"]["count"] == 200
+    connector.disconnect()
+
+def stub_connector(stub, **config):
+    """Connecteur vers le serveur local"""
+    settings = {'BASE_URL': stub.base_url, 'HTTP_CACHE_ENABLED': False, 'RETRIES': 0}
+    settings.update(config)
+    connector = APIConnector('stub_api', settings)
+    connector.connect()
+    return connector
+
+def slow_route(stub):
+    @stub.route('/slow')
+    def slow(request):
+        threading.Event().wait(float(request.args.get('delay', 0)))  # time.sleep est neutralisé (no_sleep)
+        return json_response({"delay": request.args.get('delay')})
+
+def test_fetch_many_costs_the_slowest_call(stub_api):
+    slow_route(stub_api)
+    connector = stub_connector(stub_api, MAX_WORKERS=4)
+    endpoints = {name: ('/slow', {'query_params': {'delay': 0.2}}) for name in ('siem', 'edr', 'iam', 'dlp')}
+    try:
+        start = time.monotonic()
+        results = connector.fetch_many(endpoints, deadline=5)
+        elapsed = time.monotonic() - start
+    finally:
+        connector.disconnect()
+    assert all(result["status_code"] == 200 for result in results.values())
+    assert 0.2 <= elapsed < 0.6  # séquentiellement : 0,8 s
+
+def test_fetch_many_deadline_fails_only_slow_calls(stub_api):
+    slow_route(stub_api)
+    connector = stub_connector(stub_api, MAX_WORKERS=4)
+    endpoints = [('/slow', {'query_params': {'delay': 0}}), ('/slow', {'query_params': {'delay': 2}}),
+                 ('/slow', {'query_params': {'delay': 0.05}})]
+    try:
+        start = time.monotonic()
+        fast, slow, quick = connector.fetch_many(endpoints, deadline=0.5)
+        elapsed = time.monotonic() - start
+    finally:
+        connector.disconnect()
+    assert fast["status_code"] == 200 and quick["status_code"] == 200
+    assert "error" in slow
+    assert elapsed < 1.5
+
+def test_sequential_calls_reuse_a_keep_alive_connection(stub_api):
+    slow_route(stub_api)
+    connector = stub_connector(stub_api)
+    try:
+        for _ in range(5):
+            assert connector.fetch_data('/slow')["status_code"] == 200
+    finally:
+        connector.disconnect()
+    assert len(stub_api.requests) == 5
+    assert len(stub_api.connections) == 1
+
+def test_per_host_pool_keeps_pool_maxsize_connections(stub_api):
+    slow_route(stub_api)
+    connector = stub_connector(stub_api, MAX_WORKERS=6, POOL_MAXSIZE=2)
+    try:
+        results = connector.fetch_many([('/slow', {'query_params': {'delay': 0.1}})] * 6, deadline=5)
+        assert all(result["status_code"] == 200 for result in results)
+        pool = connector.session.get_adapter(stub_api.base_url).poolmanager.connection_from_url(stub_api.base_url)
+        kept = [connection for connection in pool.pool.queue if connection is not None]
+        assert pool.pool.maxsize == 2 and len(kept) == 2
+        # Les appels suivants repartent des connexions conservées
+        before = len(stub_api.connections)
+        connector.fetch_many([('/slow', {'query_params': {'delay': 0}})] * 2, deadline=5)
+        assert len(stub_api.connections) - before <= 1
+    finally:
+        connector.disconnect()
+
+def conditional_route(stub):
+    """Route servant un ETag et une date de modification, avec 304 sur requête conditionnelle"""
+    @stub.route('/alerts')
+    def alerts(request):
+        etag = '"v1"'
+        headers = {'ETag': etag, 'Last-Modified': 'Fri, 01 Mar 2024 00:00:00 GMT'}
+        if request.headers.get('If-None-Match') == etag:
+            return json_response(None, status=304, headers=headers)
+        return json_response({"alerts": [{"id": 1, "severity": "high"}]}, headers=headers)
+
+def test_second_get_is_conditional_and_served_from_cache(stub_api):
+    conditional_route(stub_api)
+    connector = stub_connector(stub_api, HTTP_CACHE_ENABLED=True)
+    try:
+        first = connector.fetch_data('/alerts')
+        second = connector.fetch_data('/alerts')
+        info = connector.get_info()
+    finally:
+        connector.disconnect()
+    assert 'If-None-Match' not in stub_api.requests[0].headers
+    assert stub_api.requests[1].headers['If-None-Match'] == '"v1"'
+    assert stub_api.requests[1].headers['If-Modified-Since'] == 'Fri, 01 Mar 2024 00:00:00 GMT'
+    assert second["status_code"] == 304 and second["from_cache"] is True
+    assert second["data"] == first["data"] == {"alerts": [{"id": 1, "severity": "high"}]}
+    assert info["http_cache"]["not_modified"] == 1
+
+def test_cached_body_is_not_shared_with_callers(stub_api):
+    conditional_route(stub_api)
+    connector = stub_connector(stub_api, HTTP_CACHE_ENABLED=True)
+    try:
+        connector.fetch_data('/alerts')["data"]["alerts"].clear()
+        served = connector.fetch_data('/alerts')
+        served["data"]["alerts"][0]["severity"] = "low"
+        served["headers"].clear()
+        again = connector.fetch_data('/alerts')
+    finally:
+        connector.disconnect()
+    assert again["from_cache"] is True
+    assert again["data"] == {"alerts": [{"id": 1, "severity": "high"}]}
+    assert again["headers"]["ETag"] == '"v1"'
+
+def paged_route(stub, total, fail_from=None):
+    """
+    Ressource paginée '/items' : offset/limit, curseur (corps 'next_cursor') et en-tête Link.
+    Les pages commençant à partir de 'fail_from' renvoient une erreur 500.
+    """
+    @stub.route('/items')
+    def items(request):
+        limit = int(request.args.get('limit', 10))
+        start = int(request.args.get('offset', request.args.get('cursor', 0)))
+        if fail_from is not None and start >= fail_from:
+            return json_response({"error": "indisponible"}, status=500)
+        end = min(start + limit, total)
+        more = end < total
+        headers = {'Link': f'<{stub.base_url}/items?cursor={end}&limit={limit}>; rel="next"'} if more else None
+        body = {"data": [{"id": i} for i in range(start, end)], "next_cursor": str(end) if more else None}
+        return json_response(body, headers=headers)
+
+def wait_for_requests(stub, count, timeout=2):
+    """Attend que le serveur local ait reçu 'count' requêtes, puis laisse passer les suivantes éventuelles"""
+    deadline = time.monotonic() + timeout
+    while len(stub.requests) < count and time.monotonic() < deadline:
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.2)
+    return len(stub.requests)
+
+@pytest.mark.parametrize('style', ['offset', 'cursor', 'link'])
+def test_fetch_pages_walks_every_style(stub_api, style):
+    paged_route(stub_api, 25)
+    connector = stub_connector(stub_api)
+    try:
+        records = list(connector.fetch_pages('/items', pagination={
+            'style': style, 'records_key': 'data', 'page_size': 10}))
+    finally:
+        connector.disconnect()
+    assert [record["id"] for record in records] == list(range(25))
+    if style == 'offset':
+        # Les pages anticipées au-delà de la fin peuvent aussi avoir été demandées
+        assert {'0', '10', '20'} <= {request.args['offset'] for request in stub_api.requests}
+    else:
+        assert [request.args.get('cursor') for request in stub_api.requests] == [None, '10', '20']
+
+@pytest.mark.parametrize('style', ['offset', 'cursor', 'link'])
+def test_fetch_pages_stops_at_max_pages(stub_api, style):
+    paged_route(stub_api, 100)
+    connector = stub_connector(stub_api)
+    try:
+        records = list(connector.fetch_pages('/items', pagination={
+            'style': style, 'records_key': 'data', 'page_size': 10, 'max_pages': 2}))
+    finally:
+        connector.disconnect()
+    assert [record["id"] for record in records] == list(range(20))
+    assert len(stub_api.requests) == 2
+
+def test_offset_prefetch_window(stub_api):
+    paged_route(stub_api, 100)
+    connector = stub_connector(stub_api, MAX_WORKERS=8)
+    pages = connector.fetch_pages('/items', pagination={
+        'style': 'offset', 'records_key': 'data', 'page_size': 10, 'prefetch': 2})
+    try:
+        assert next(pages) == {"id": 0}
+        # La page lue et deux pages d'avance, pas davantage tant que le consommateur n'avance pas
+        assert wait_for_requests(stub_api, 3) == 3
+        assert sorted(int(request.args['offset']) for request in stub_api.requests) == [0, 10, 20]
+        for _ in range(10):
+            next(pages)
+        assert wait_for_requests(stub_api, 4) == 4
+    finally:
+        pages.close()
+        connector.disconnect()
+
+def test_chained_producer_is_bounded_by_its_queue(stub_api):
+    paged_route(stub_api, 100)
+    connector = stub_connector(stub_api)
+    pages = connector.fetch_pages('/items', pagination={
+        'style': 'cursor', 'records_key': 'data', 'page_size': 10, 'prefetch': 2})
+    try:
+        assert next(pages) == {"id": 0}
+        # Page consommée, deux pages en file, une page téléchargée en attente de place
+        assert wait_for_requests(stub_api, 4) == 4
+    finally:
+        pages.close()
+    # Le producteur s'arrête avec le consommateur
+    assert wait_for_requests(stub_api, 5, timeout=0.3) == 4
+    connector.disconnect()
+
+@pytest.mark.parametrize('style', ['offset', 'cursor', 'link'])
+def test_failed_page_raises_pagination_error(stub_api, style):
+    paged_route(stub_api, 100, fail_from=20)
+    connector = stub_connector(stub_api)
+    received = []
+    try:
+        with pytest.raises(PaginationError):
+            for record in connector.fetch_pages('/items', pagination={
+                    'style': style, 'records_key': 'data', 'page_size': 10}):
+                received.append(record["id"])
+    finally:
+        connector.disconnect()
+    assert received == list(range(20))
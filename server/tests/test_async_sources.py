@@ -0,0 +1,127 @@
+# test_async_sources.py - Variantes asynchrones des connecteurs et route /api/dashboard/sources/status
+import asyncio
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from conftest import json_response
+from connectors.api_connector import APIConnector
+from modules import dashboard
+
+def delayed_route(stub, path='/slow'):
+    """Route du serveur local répondant après ?delay= secondes (0,3 s pour la racine)"""
+    @stub.route(path)
+    def delayed(request):
+        threading.Event().wait(float(request.args.get('delay', 0.3 if path == '/' else 0)))
+        return json_response({"delay": request.args.get('delay')})
+
+def api_connector(stub, **config):
+    settings = {'BASE_URL': stub.base_url, 'HTTP_CACHE_ENABLED': False, 'RETRIES': 0, 'MAX_WORKERS': 4}
+    settings.update(config)
+    connector = APIConnector('async_api', settings)
+    connector.connect()
+    return connector
+
+def test_fetch_data_async_calls_overlap(stub_api):
+    delayed_route(stub_api)
+    connector = api_connector(stub_api)
+
+    async def fetch_all():
+        return await asyncio.gather(*(connector.fetch_data_async('/slow', {'query_params': {'delay': 0.2}})
+                                      for _ in range(4)))
+    try:
+        start = time.monotonic()
+        results = asyncio.run(fetch_all())
+        elapsed = time.monotonic() - start
+    finally:
+        connector.disconnect()
+    assert [result["status_code"] for result in results] == [200] * 4
+    assert elapsed < 0.6  # séquentiellement : 0,8 s
+
+def test_fetch_many_async_keeps_the_loop_free_and_applies_the_deadline(stub_api):
+    delayed_route(stub_api)
+    connector = api_connector(stub_api)
+    ticks = []
+
+    async def ticker(stop):
+        while not stop.is_set():
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        stop = asyncio.Event()
+        ticking = asyncio.ensure_future(ticker(stop))
+        results = await connector.fetch_many_async({
+            'fast': ('/slow', {'query_params': {'delay': 0.05}}),
+            'medium': ('/slow', {'query_params': {'delay': 0.2}}),
+            'late': ('/slow', {'query_params': {'delay': 2}})
+        }, deadline=0.5)
+        stop.set()
+        await ticking
+        return results
+    try:
+        start = time.monotonic()
+        results = asyncio.run(scenario())
+        elapsed = time.monotonic() - start
+    finally:
+        connector.disconnect()
+    assert results['fast']["status_code"] == 200 and results['medium']["status_code"] == 200
+    assert results['late'] == {"error": "Délai global dépassé"}
+    assert elapsed < 1.5
+    assert len(ticks) >= 20  # la boucle a continué de tourner pendant les appels
+
+def test_sql_fetch_data_async_forwards_options(kpi_store):
+    async def query():
+        return await asyncio.gather(
+            kpi_store.fetch_data_async("SELECT 1 AS one, 'a' AS letter"),
+            kpi_store.fetch_data_async("SELECT 1 AS one, 'a' AS letter", result_format='columnar'),
+            kpi_store.test_connection_async())
+
+    rows, columns, connected = asyncio.run(query())
+    assert rows["data"] == [{"one": 1, "letter": "a"}]
+    assert columns["data"] == {"one": [1], "letter": ["a"]}
+    assert connected is True
+
+@pytest.fixture
+def status_client(monkeypatch, stub_api, kpi_store):
+    """Route des sources avec la base KPI et l'API du serveur local, chacune répondant en 0,3 s"""
+    delayed_route(stub_api, '/')
+    api = api_connector(stub_api)
+    ping = kpi_store._ping
+
+    def slow_ping(connection):
+        threading.Event().wait(0.3)
+        return ping(connection)
+
+    monkeypatch.setattr(kpi_store, '_ping', slow_ping)
+    monkeypatch.setitem(dashboard.APP_CONFIG, 'DASHBOARD_SOURCE', 'rollups')
+    monkeypatch.setattr(dashboard, 'get_store', lambda: kpi_store)
+    monkeypatch.setattr(dashboard, 'get_api', lambda: api)
+
+    app = Flask(__name__)
+    app.register_blueprint(dashboard.dashboard_bp)
+    yield app.test_client()
+    api.disconnect()
+
+def test_sources_status_probes_sources_in_parallel(status_client, kpi_store):
+    kpi_store.connect()
+    start = time.monotonic()
+    response = status_client.get('/api/dashboard/sources/status')
+    elapsed = time.monotonic() - start
+    assert response.status_code == 200
+    status = response.get_json()
+    assert set(status) == {'kpi_store', 'kpi_api'}
+    assert status['kpi_store']["type"] == 'SQLConnector' and status['kpi_api']["type"] == 'APIConnector'
+    assert all(source["connected"] is True and source["latency"] >= 0.3 for source in status.values())
+    assert elapsed < 0.55  # séquentiellement : 0,6 s
+
+def test_sources_status_reports_a_failing_source(status_client, stub_api):
+    @stub_api.route('/')
+    def unavailable(request):
+        return json_response({"error": "maintenance"}, status=503)
+
+    status = status_client.get('/api/dashboard/sources/status').get_json()
+    assert status['kpi_api']["connected"] is False
+    assert status['kpi_store']["connected"] is True
@@ -0,0 +1,67 @@
+# test_cache.py - Cache mémoire LRU avec expiration et limite de taille
+from utils import cache as cache_module
+from utils.cache import TTLCache
+
+class Clock:
+    """Horloge monotone pilotée par le test"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    cache = TTLCache('test', ttl=10)
+    cache.set('a', b'1')
+    cache.set('b', b'2', ttl=100)
+    clock.now += 11
+    assert cache.get('a') is None
+    assert cache.get('b') == b'2'
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache('test', ttl=None, max_entries=2)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    assert cache.get('a') == b'1'  # 'b' devient la moins récemment utilisée
+    cache.set('c', b'3')
+    assert 'b' not in cache
+    assert cache.get('a') == b'1' and cache.get('c') == b'3'
+    assert cache.get_stats()["evictions"] == 1
+
+def test_size_limit_in_bytes():
+    cache = TTLCache('test', ttl=None, max_entries=10, max_bytes=10)
+    assert cache.set('a', b'x' * 6)
+    assert cache.set('b', b'y' * 6)
+    assert 'a' not in cache
+    assert cache.get_stats()["bytes"] == 6
+    assert not cache.set('trop', b'z' * 11)
+    assert 'trop' not in cache
+
+def test_replacing_an_entry_updates_size():
+    cache = TTLCache('test', ttl=None)
+    cache.set('a', b'x' * 10)
+    cache.set('a', b'x' * 3)
+    assert len(cache) == 1 and cache.get_stats()["bytes"] == 3
+    assert cache.delete('a') and not cache.delete('a')
+    assert cache.get_stats()["bytes"] == 0
+
+def test_dashboard_response_is_cached_with_etag():
+    from flask import Flask
+    from modules import dashboard
+
+    app = Flask(__name__)
+    app.register_blueprint(dashboard.dashboard_bp)
+    client = app.test_client()
+    dashboard.response_cache.clear()
+    query = "/api/dashboard/data?view_type=monthly&month=3&year=2019"
+    first = client.get(query)
+    second = client.get(query)
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert first.data == second.data and first.headers["ETag"] == second.headers["ETag"]
+    assert client.get(query.replace("monthly", "daily")).status_code == 400
+    dashboard.response_cache.clear()
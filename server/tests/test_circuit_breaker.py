@@ -0,0 +1,73 @@
+# test_circuit_breaker.py - Disjoncteur et temporisation des nouvelles tentatives
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from connectors import circuit_breaker as breaker_module
+from connectors.circuit_breaker import CircuitBreaker, backoff_delay, parse_retry_after
+
+class Clock:
+    """Horloge monotone pilotée par le test"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30)
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    breaker.record_success()  # un succès remet le compte à zéro
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow_request()
+    breaker.record_failure("boom")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    stats = breaker.get_stats()
+    assert (stats["times_opened"], stats["short_circuited"], stats["last_failure"]) == (1, 1, "boom")
+
+def test_half_open_allows_a_single_probe(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, 'monotonic', clock)
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure("boom")
+    assert breaker.retry_in() == 30
+    clock.now += 31
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # l'appel de test est toujours en cours
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+
+def test_failed_probe_reopens(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, 'monotonic', clock)
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=10)
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    clock.now += 11
+    assert breaker.allow_request()
+    breaker.record_failure("toujours en panne")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in() == 10
+    assert breaker.get_stats()["times_opened"] == 2
+
+def test_backoff_delay_is_bounded():
+    for attempt in range(1, 10):
+        ceiling = min(5.0, 0.2 * 2 ** (attempt - 1))
+        for _ in range(50):
+            assert 0 <= backoff_delay(attempt, 0.2, 5.0) <= ceiling
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('pas une date') is None
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('-5') == 0.0
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+    assert 100 < parse_retry_after(retry_at) <= 120
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=120), usegmt=True)
+    assert parse_retry_after(past) == 0.0
@@ -0,0 +1,33 @@
+# test_columnar.py - Résultats au format colonnes (connecteur SQL et séries du tableau de bord)
+import json
+
+from modules import dashboard
+from utils.columnar import from_tuples, row_count, to_columnar
+
+def test_conversions_keep_column_order():
+    rows = [{"name": "VPN", "value": 3}, {"name": "EDR", "value": None}]
+    assert to_columnar(rows) == {"columns": ["name", "value"], "data": {"name": ["VPN", "EDR"], "value": [3, None]}}
+    assert to_columnar(rows, ["value"]) == {"columns": ["value"], "data": {"value": [3, None]}}
+    assert to_columnar([]) == {"columns": [], "data": {}}
+    columnar = from_tuples(["name", "value"], iter([("VPN", 3), ("EDR", None)]))
+    assert columnar == to_columnar(rows)
+    assert row_count(columnar) == 2 and row_count({"columns": [], "data": {}}) == 0
+
+def test_sql_fetch_data_columnar_matches_rows(kpi_store):
+    with kpi_store.lease() as connection:
+        connection.execute("CREATE TABLE t (name TEXT, value INTEGER)")
+        connection.executemany("INSERT INTO t VALUES (?, ?)", [("VPN", 3), ("EDR", None), ("IAM", 1)])
+        connection.commit()
+    rows = kpi_store.fetch_data("SELECT name, value FROM t ORDER BY name")
+    columnar = kpi_store.fetch_data("SELECT name, value FROM t ORDER BY name", result_format='columnar')
+    assert columnar["format"] == "columnar" and columnar["count"] == 3
+    assert columnar["columns"] == ["name", "value"]
+    assert to_columnar(rows["data"], columnar["columns"])["data"] == columnar["data"]
+
+def test_dashboard_columnar_payload_is_smaller():
+    data = dashboard.generate_mock_data('monthly', 'total', 1, 1, 2024)
+    columnar = dashboard.to_columnar_payload(data)
+    for series in ("tech_data", "personnel_data", "time_data"):
+        assert columnar[series]["columns"] == ["name", "value", "color"]
+        assert columnar[series]["data"]["name"] == [row["name"] for row in data[series]]
+    assert len(json.dumps(columnar)) < len(json.dumps(data))
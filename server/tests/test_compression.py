@@ -0,0 +1,135 @@
+# test_compression.py - Compression négociée, seuil de taille, ETag forts par encodage et réponses 304
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from config.settings import SERVER_CONFIG
+from utils import compression
+
+# Remplaçant de brotli pour la négociation : le contenu est seulement préfixé
+FAKE_BROTLI = SimpleNamespace(compress=lambda body, quality: b'BR' + body)
+
+@pytest.fixture(autouse=True)
+def empty_compressed_cache():
+    compression.compressed_cache.clear()
+    yield
+    compression.compressed_cache.clear()
+
+@pytest.fixture
+def client(server_app):
+    @server_app.route('/api/test-compression/<int:size>')
+    def sized(size):
+        return server_app.response_class(json.dumps({"value": "x" * size}), mimetype='application/json')
+
+    @server_app.route('/api/test-compression/image')
+    def image():
+        return server_app.response_class(b'\x89PNG' + b'\x00' * 4096, mimetype='image/png')
+
+    @server_app.route('/api/test-compression/tagged')
+    def tagged():
+        response = server_app.response_class(json.dumps({"value": "x" * 4096}), mimetype='application/json')
+        response.set_etag('rollups-42')
+        return response
+
+    return server_app.test_client()
+
+@pytest.mark.parametrize('header, with_brotli, expected', [
+    (None, True, None),
+    ('identity', True, None),
+    ('gzip, deflate', True, 'gzip'),
+    ('gzip, deflate, br', True, 'br'),
+    ('gzip, deflate, br', False, 'gzip'),
+    ('br;q=0.5, gzip;q=0.8', True, 'gzip'),
+    ('gzip;q=0, br;q=0', True, None),
+    ('*', True, 'br'),
+    ('*;q=0.5, br;q=0', True, 'gzip'),
+    ('GZIP;q=bad, gzip', True, 'gzip'),
+])
+def test_negotiate_encoding(monkeypatch, header, with_brotli, expected):
+    monkeypatch.setattr(compression, 'brotli', FAKE_BROTLI)
+    assert compression.negotiate_encoding(header, allow_brotli=with_brotli) == expected
+
+def test_br_is_not_offered_without_the_brotli_package(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert compression.negotiate_encoding('br') is None
+    assert compression.negotiate_encoding('br, gzip') == 'gzip'
+
+def test_gzip_output_is_deterministic():
+    body = b'{"value": "' + b'x' * 4096 + b'"}'
+    assert compression.compress(body, 'gzip') == compression.compress(body, 'gzip')
+    assert gzip.decompress(compression.compress(body, 'gzip')) == body
+
+def test_small_responses_are_not_compressed(client):
+    assert SERVER_CONFIG['COMPRESSION_MIN_SIZE'] > 200
+    response = client.get('/api/test-compression/100', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' not in response.headers.get('Vary', '')
+    assert response.get_etag() == (compression.content_etag(response.get_data()), False)
+
+def test_threshold_follows_the_configuration(client, monkeypatch):
+    monkeypatch.setitem(SERVER_CONFIG, 'COMPRESSION_MIN_SIZE', 50)
+    response = client.get('/api/test-compression/100', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+def test_large_responses_are_gzipped_with_their_own_etag(client):
+    identity = client.get('/api/test-compression/4096')
+    compressed = client.get('/api/test-compression/4096', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert 'Content-Encoding' not in identity.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.get_data()) == identity.get_data()
+
+    etag, weak = identity.get_etag()
+    assert not weak and etag == compression.content_etag(identity.get_data())
+    assert compressed.get_etag() == (f"{etag}-gzip", False)
+
+def test_brotli_variant_has_its_own_etag(client, monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', FAKE_BROTLI)
+    identity = client.get('/api/test-compression/4096')
+    response = client.get('/api/test-compression/4096', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.get_data() == b'BR' + identity.get_data()
+    assert response.get_etag() == (f"{identity.get_etag()[0]}-br", False)
+
+    monkeypatch.setitem(SERVER_CONFIG, 'BROTLI_ENABLED', False)
+    assert client.get('/api/test-compression/4096', headers={'Accept-Encoding': 'gzip, br'}) \
+        .headers['Content-Encoding'] == 'gzip'
+
+def test_brotli_round_trip(client):
+    brotli = pytest.importorskip('brotli')
+    identity = client.get('/api/test-compression/4096')
+    response = client.get('/api/test-compression/4096', headers={'Accept-Encoding': 'br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.get_data()) == identity.get_data()
+
+def test_if_none_match_is_checked_per_encoding(client):
+    compressed = client.get('/api/test-compression/4096', headers={'Accept-Encoding': 'gzip'})
+    etag = compressed.get_etag()[0]
+
+    revalidated = client.get('/api/test-compression/4096',
+                             headers={'Accept-Encoding': 'gzip', 'If-None-Match': f'"{etag}"'})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+    assert revalidated.get_etag() == (etag, False)
+    assert 'Content-Encoding' not in revalidated.headers
+
+    # Le même ETag ne vaut pas pour la variante non compressée
+    identity = client.get('/api/test-compression/4096', headers={'If-None-Match': f'"{etag}"'})
+    assert identity.status_code == 200 and 'Content-Encoding' not in identity.headers
+
+def test_view_etag_is_kept_and_variants_are_cached(client):
+    hits = compression.compressed_cache.get_stats()["hits"]
+    for _ in range(2):
+        response = client.get('/api/test-compression/tagged', headers={'Accept-Encoding': 'gzip'})
+        assert response.get_etag() == ('rollups-42-gzip', False)
+    assert compression.compressed_cache.get_stats()["hits"] == hits + 1
+    assert client.get('/api/test-compression/tagged',
+                      headers={'If-None-Match': '"rollups-42"'}).status_code == 304
+
+def test_incompressible_types_are_left_alone(client):
+    response = client.get('/api/test-compression/image', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data().startswith(b'\x89PNG')
+    assert response.get_etag()[0] == compression.content_etag(response.get_data())
@@ -0,0 +1,141 @@
+# test_connection_pool.py - Pool de connexions : bornes, attente, contrôles de santé, prêts imbriqués
+import sqlite3
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from connectors.connection_pool import ConnectionPool, PoolTimeoutError
+from connectors.sql_connector import SQLConnector
+
+class FakeConnection:
+    """Connexion factice : numérotée, fermable, déclarée défaillante à la demande"""
+
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def make_pool(**options):
+    created = []
+
+    def factory():
+        created.append(FakeConnection(len(created)))
+        return created[-1]
+
+    pool = ConnectionPool('test', factory, health_check=lambda connection: connection.healthy, **options)
+    pool.open()
+    return pool, created
+
+def test_min_and_max_size():
+    pool, created = make_pool(min_size=2, max_size=3, timeout=0.05)
+    assert len(created) == 2 and pool.get_stats()["idle"] == 2
+    held = [pool.acquire() for _ in range(3)]
+    assert len(created) == 3
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    stats = pool.get_stats()
+    assert (stats["size"], stats["in_use"], stats["idle"], stats["timeouts"]) == (3, 3, 0, 1)
+    for connection in held:
+        pool.release(connection)
+    assert pool.get_stats()["in_use"] == 0 and pool.get_stats()["idle"] == 3
+
+def test_waiting_borrower_gets_the_released_connection():
+    pool, _ = make_pool(min_size=1, max_size=1, timeout=5)
+    connection = pool.acquire()
+    threading.Timer(0.05, pool.release, (connection,)).start()
+    assert pool.acquire() is connection
+    stats = pool.get_stats()
+    assert stats["waits"] == 1 and stats["checkouts"] == 2
+    assert 0.03 <= stats["max_wait_time"] < 5
+    assert stats["avg_wait_time"] == stats["total_wait_time"]
+
+def test_unhealthy_idle_connection_is_replaced():
+    pool, created = make_pool(min_size=1, max_size=2, health_check_interval=0)
+    created[0].healthy = False
+    connection = pool.acquire()
+    assert connection is created[1]
+    assert created[0].closed
+    stats = pool.get_stats()
+    assert (stats["discarded"], stats["size"], stats["created"]) == (1, 1, 2)
+
+def test_failed_lease_checks_the_connection():
+    pool, created = make_pool(min_size=1, max_size=1, health_check_interval=3600)
+    with pytest.raises(ValueError):
+        with pool.connection() as connection:
+            connection.healthy = False
+            raise ValueError("échec de la requête")
+    assert created[0].closed
+    assert pool.get_stats()["discarded"] == 1
+    with pool.connection() as connection:
+        assert connection is created[1]
+
+def test_nested_leases_share_one_connection():
+    pool, _ = make_pool(min_size=0, max_size=1, timeout=0.05)
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer and pool.current() is outer
+        assert pool.get_stats()["in_use"] == 1
+    assert pool.current() is None
+    assert pool.get_stats()["in_use"] == 0 and pool.get_stats()["checkouts"] == 1
+
+def test_pinned_connection_survives_leases_until_unpin():
+    pool, _ = make_pool(min_size=0, max_size=2)
+    pinned = pool.pin()
+    with pool.connection() as connection:
+        assert connection is pinned
+    assert pool.current() is pinned and pool.get_stats()["in_use"] == 1
+    pool.unpin()
+    assert pool.current() is None and pool.get_stats()["in_use"] == 0
+    pool.unpin()  # sans effet sans connexion associée
+    assert pool.get_stats()["idle"] == 1
+
+def test_open_transaction_is_rolled_back_on_release(tmp_path):
+    database = str(tmp_path / 'pool.db')
+    pool = ConnectionPool('sqlite', lambda: sqlite3.connect(database, timeout=0.1, check_same_thread=False),
+                          min_size=1, max_size=1)
+    pool.open()
+    with pool.connection() as connection:
+        connection.execute("CREATE TABLE t (x INTEGER)")
+        connection.commit()
+        connection.execute("INSERT INTO t VALUES (1)")  # jamais validée
+    other = sqlite3.connect(database, timeout=0.1)
+    other.execute("INSERT INTO t VALUES (2)")  # le verrou d'écriture a été libéré
+    other.commit()
+    other.close()
+    with pool.connection() as connection:
+        assert not connection.in_transaction
+        assert connection.execute("SELECT x FROM t").fetchall() == [(2,)]
+    pool.close()
+
+def test_sql_connector_reports_pool_stats(kpi_store):
+    with kpi_store.lease():
+        info = kpi_store.get_info()
+    assert info["pool"]["in_use"] == 1
+    assert info["pool"]["max_size"] == kpi_store.config['POOL_MAX_SIZE']
+    assert kpi_store.get_info()["pool"]["in_use"] == 0
+
+def test_thread_leases_are_released_at_request_teardown(tmp_path, monkeypatch):
+    from config.settings import DATABASE_CONFIG
+    from modules import dashboard
+
+    store = SQLConnector('thread_store', dict(DATABASE_CONFIG['SQL'], NAME=str(tmp_path / 'kpi.db'),
+                                              POOL_LEASE='thread', READ_ONLY_QUERIES=False))
+    monkeypatch.setattr(dashboard, '_store', store)
+    app = Flask(__name__)
+    app.register_blueprint(dashboard.dashboard_bp)
+
+    @app.route('/probe')
+    def probe():
+        store.fetch_data("SELECT 1")
+        return str(store.pool.get_stats()["in_use"])
+
+    try:
+        assert app.test_client().get('/probe').get_data() == b'1'  # conservée pendant la requête
+        assert store.pool.get_stats()["in_use"] == 0
+    finally:
+        store.disconnect()
@@ -0,0 +1,79 @@
+# test_ingest.py - Upsert du pipeline d'ingestion : idempotence, versions anciennes, horodatage du passage
+from config.settings import INGEST_CONFIG
+from database.ingest import IngestPipeline, parse_timestamp
+
+from conftest import ticket_record
+
+def make_pipeline(api, store):
+    return IngestPipeline('landesk_tickets', INGEST_CONFIG['SOURCES']['landesk_tickets'], api, store, batch_size=2)
+
+def ticket(store, ticket_id):
+    with store.lease() as connection:
+        return connection.execute(
+            "SELECT status, updated_at, synced_at FROM tickets WHERE id = ?", (ticket_id,)).fetchone()
+
+def test_rerun_is_idempotent(fake_api, kpi_store):
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00"), ticket_record(2, "2024-03-01T09:00:00"),
+                                ticket_record(3, "2024-03-01T10:00:00")]}]
+    pipeline = make_pipeline(fake_api, kpi_store)
+    first = pipeline.run()
+    assert (first["written"], first["stale"], first["batches"]) == (3, 0, 2)
+    assert first["latest_updated_at"] == "2024-03-01T10:00:00"
+
+    # Même version : la ligne est réécrite (synced_at du passage, pour sweep) sans doublon
+    second = pipeline.run()
+    assert (second["written"], second["stale"]) == (3, 0)
+    with kpi_store.lease() as connection:
+        assert connection.execute("SELECT COUNT(*) FROM tickets").fetchone()[0] == 3
+
+def test_older_version_never_replaces_newer(fake_api, kpi_store):
+    pipeline = make_pipeline(fake_api, kpi_store)
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-02T09:00:00", status='closed')]}]
+    pipeline.run()
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00", status='open')]}]
+    stats = pipeline.run()
+    assert (stats["written"], stats["stale"]) == (0, 1)
+    assert ticket(kpi_store, "1")[:2] == ("closed", "2024-03-02T09:00:00")
+
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-03T09:00:00", status='reopened')]}]
+    assert pipeline.run()["written"] == 1
+    assert ticket(kpi_store, "1")[0] == "reopened"
+
+def test_row_without_updated_at_is_replaced(fake_api, kpi_store):
+    # Table créée avant les migrations, sans contrainte sur updated_at
+    with kpi_store.lease() as connection:
+        with connection:
+            connection.execute("CREATE TABLE tickets (id TEXT PRIMARY KEY, technology TEXT NOT NULL, assignee TEXT, "
+                               "severity TEXT, status TEXT, opened_at TEXT NOT NULL, closed_at TEXT, updated_at TEXT)")
+            connection.execute("INSERT INTO tickets (id, technology, status, opened_at) "
+                               "VALUES ('1', 'VPN', 'open', '2024-03-01T08:00:00')")
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00", status='closed')]}]
+    stats = make_pipeline(fake_api, kpi_store).run()
+    assert stats["written"] == 1
+    assert ticket(kpi_store, "1")[:2] == ("closed", "2024-03-01T09:00:00")
+
+def test_run_stamp_is_written_and_sweep_soft_deletes(fake_api, kpi_store):
+    pipeline = make_pipeline(fake_api, kpi_store)
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00"), ticket_record(2, "2024-03-01T09:00:00")]}]
+    pipeline.run()
+    assert ticket(kpi_store, "1")[2] == pipeline.run_stamp
+
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00")]}]
+    pipeline.run()
+    assert pipeline.sweep() == 1
+    with kpi_store.lease() as connection:
+        deleted = dict(connection.execute("SELECT id, deleted_at IS NOT NULL FROM tickets"))
+    assert deleted == {"1": 0, "2": 1}
+
+def test_invalid_records_are_rejected(fake_api, kpi_store):
+    record = ticket_record(2, "2024-03-01T09:00:00")
+    del record["category"]
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00"), record, "pas un objet"]}]
+    stats = make_pipeline(fake_api, kpi_store).run()
+    assert (stats["fetched"], stats["written"], stats["rejected"]) == (3, 1, 2)
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp("2024-03-01T09:00:00") == "2024-03-01T09:00:00"
+    assert parse_timestamp("2024-03-01 09:00:00") == "2024-03-01T09:00:00"
+    assert parse_timestamp("2024-03-01") == "2024-03-01T00:00:00"
+    assert parse_timestamp(None) is None
@@ -0,0 +1,52 @@
+# test_kpi_engine.py - Concordance des versions NumPy et Python pur du moteur KPI
+import pytest
+
+from modules.dashboard import kpi_engine
+
+np = pytest.importorskip('numpy')
+
+def tickets_columns():
+    """Tickets des deux périodes, avec gravité et temps de traitement absents (NULL)"""
+    return {
+        "technology": ["Firewall", "VPN", "Firewall", "EDR", "VPN", "Firewall"],
+        "assignee": ["Alice", "", "Bob", "Alice", "Bob", ""],
+        "critical": [1, None, 0, None, 1, 1],
+        "processing_minutes": [30.0, None, 90.0, 45.5, None, 10.0],
+        "current": [1, 1, 1, 0, 0, 1]
+    }
+
+def test_numpy_matches_python_with_nulls():
+    assert kpi_engine.compute_period_totals_numpy(tickets_columns()) == \
+        kpi_engine.compute_period_totals_python(tickets_columns())
+
+def test_null_severity_is_not_critical():
+    current, before = kpi_engine.compute_period_totals_numpy(tickets_columns())
+    assert current["totals"] == {"ticket_count": 4, "critical_count": 2, "resolved_count": 3,
+                                 "processing_minutes": 130.0}
+    assert before["by_technology"]["EDR"]["critical_count"] == 0
+    assert "" not in current["by_assignee"]
+
+def test_encoded_columns_match_python():
+    columns = tickets_columns()
+    names = ["Firewall", "VPN", "EDR"]
+    columns["technology"] = (names, [names.index(value) for value in columns["technology"]])
+    assert kpi_engine.compute_period_totals_numpy(columns) == \
+        kpi_engine.compute_period_totals_python(columns)
+
+def test_ticket_query_counts_null_severity_as_zero(kpi_connection):
+    from modules.dashboard import TICKETS_PERIOD_QUERY
+
+    with kpi_connection:
+        kpi_connection.executemany(
+            "INSERT INTO tickets (id, technology, assignee, severity, status, opened_at, closed_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [("t1", "VPN", None, None, "open", "2024-03-02T10:00:00", None, "2024-03-02T10:00:00"),
+             ("t2", "VPN", "Bob", "critical", "closed", "2024-03-03T10:00:00", "2024-03-03T11:00:00",
+              "2024-03-03T11:00:00")])
+    cursor = kpi_connection.execute(TICKETS_PERIOD_QUERY, {
+        "start": "2024-03-01", "previous_start": "2024-02-01", "end": "2024-04-01"})
+    names = [column[0] for column in cursor.description]
+    rows = cursor.fetchall()
+    columns = {name: [row[index] for row in rows] for index, name in enumerate(names)}
+    assert columns["critical"] == [0, 1]
+    assert kpi_engine.compute_period_totals_numpy(columns) == kpi_engine.compute_period_totals_python(columns)
@@ -0,0 +1,78 @@
+# test_metrics.py - Export Prometheus : format texte, intervalles des histogrammes, endpoint /api/metrics
+import re
+
+from utils import metrics
+
+# Ligne d'échantillon du format texte 0.0.4 : nom, étiquettes facultatives, valeur
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? \S+$')
+
+def assert_exposition_format(text):
+    assert text.endswith('\n')
+    for line in text.rstrip('\n').split('\n'):
+        if line.startswith('#'):
+            assert re.match(r'^# (HELP|TYPE) [a-zA-Z_:][a-zA-Z0-9_:]* .+$', line), line
+        else:
+            assert SAMPLE_LINE.match(line), line
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = metrics.Histogram('job_seconds', "Durée", ('job',), buckets=(0.5, 0.1, 1.0))
+    for value in (0.05, 0.1, 0.3, 0.5, 2.0):
+        histogram.observe(value, 'sync')
+    lines = histogram.collect()
+    assert lines[:2] == ["# HELP job_seconds Durée", "# TYPE job_seconds histogram"]
+    assert lines[2:] == [
+        'job_seconds_bucket{job="sync",le="0.1"} 2',  # la borne est incluse (le = inférieur ou égal)
+        'job_seconds_bucket{job="sync",le="0.5"} 4',
+        'job_seconds_bucket{job="sync",le="1.0"} 4',
+        'job_seconds_bucket{job="sync",le="+Inf"} 5',
+        'job_seconds_sum{job="sync"} 2.95',
+        'job_seconds_count{job="sync"} 5',
+    ]
+
+def test_series_are_sorted_and_labels_escaped():
+    counter = metrics.Counter('errors_total', "Erreurs", ('source',))
+    counter.inc(2, 'siem')
+    counter.inc(1, 'a "b"\\c\nd')
+    counter.inc(1.5, 'siem')
+    assert counter.collect()[2:] == [
+        'errors_total{source="a \\"b\\"\\\\c\\nd"} 1',
+        'errors_total{source="siem"} 3.5',
+    ]
+
+def test_failing_callback_metric_exports_its_header_only():
+    def broken():
+        raise RuntimeError("pool fermé")
+    gauge = metrics.CallbackMetric('pool_size', "Taille du pool", broken)
+    assert gauge.collect() == ["# HELP pool_size Taille du pool", "# TYPE pool_size gauge"]
+
+def test_registry_keeps_the_first_metric_of_a_name():
+    registry = metrics.MetricsRegistry()
+    first = registry.histogram('x_seconds', "x")
+    assert registry.histogram('x_seconds', "x", buckets=(1,)) is first
+    assert registry.counter('x_seconds', "x") is first
+
+def test_metrics_endpoint_exposes_request_durations(server_app):
+    @server_app.route('/api/test-metrics/<int:item>')
+    def item(item):
+        return {"item": item}
+
+    client = server_app.test_client()
+    for number in range(3):
+        assert client.get(f'/api/test-metrics/{number}').status_code == 200
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+
+    text = response.get_data(as_text=True)
+    assert_exposition_format(text)
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    # Série étiquetée par la règle de routage, pas par l'URL
+    series = 'method="GET",route="/api/test-metrics/<int:item>",status="200"'
+    buckets = re.findall(r'^http_request_duration_seconds_bucket\{' + re.escape(series) + r',le="([^"]+)"\} (\d+)$',
+                         text, re.M)
+    assert [bound for bound, _ in buckets] == [str(bound) for bound in metrics.DEFAULT_BUCKETS] + ['+Inf']
+    counts = [int(count) for _, count in buckets]
+    assert counts == sorted(counts) and counts[-1] == 3
+    assert f'http_request_duration_seconds_count{{{series}}} 3' in text
+    assert 'cache_hits_total{cache="compressed"}' in text
@@ -0,0 +1,44 @@
+# test_migrations.py - Schéma versionné de la base KPI et plans des requêtes du tableau de bord
+import sqlite3
+
+import pytest
+
+from database import migrations
+from database.query_plans import check_query_plans, dashboard_queries
+
+def test_dashboard_queries_use_indexes(kpi_connection):
+    assert check_query_plans(kpi_connection) == []
+
+def test_missing_index_is_reported(kpi_connection):
+    kpi_connection.execute("DROP INDEX ix_tickets_period_kpi")
+    failures = check_query_plans(kpi_connection)
+    assert failures
+    assert all(step.startswith("SCAN") for _, step in failures)
+    assert {name for name, _ in failures} <= set(dashboard_queries())
+
+def test_migrate_is_idempotent(kpi_connection):
+    assert migrations.current_version(kpi_connection) == migrations.MIGRATIONS[-1][0]
+    assert migrations.pending_migrations(kpi_connection) == []
+    assert migrations.migrate(kpi_connection) == 0
+
+def test_upgrade_keeps_existing_rows():
+    connection = sqlite3.connect(':memory:')
+    assert migrations.migrate(connection, target=3) == 3
+    with connection:
+        connection.execute("INSERT INTO tickets (id, technology, opened_at, updated_at) "
+                           "VALUES ('1', 'VPN', '2024-03-01T08:00:00', '2024-03-01T08:00:00')")
+    assert [migration[0] for migration in migrations.pending_migrations(connection)] == [4]
+    assert migrations.migrate(connection) == 1
+    assert connection.execute("SELECT id, deleted_at, synced_at FROM tickets").fetchall() == [('1', None, None)]
+    connection.close()
+
+def test_failed_migration_is_rolled_back(monkeypatch):
+    connection = sqlite3.connect(':memory:')
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS[:1] + [
+        (2, 'invalide', ["CREATE TABLE partielle (id INTEGER)", "INSERT INTO table_absente VALUES (1)"])])
+    with pytest.raises(sqlite3.OperationalError):
+        migrations.migrate(connection)
+    assert migrations.current_version(connection) == 1
+    assert connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'partielle'").fetchone()[0] == 0
+    connection.close()
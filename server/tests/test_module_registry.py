@@ -0,0 +1,112 @@
+# test_module_registry.py - Import différé des modules à la première requête, instantané de /api/modules
+import threading
+import time
+
+import json
+
+import pytest
+from flask import Blueprint, Flask
+
+from modules import module_registry
+from modules.module_registry import LazyModuleLoader, ModuleRegistry
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registre vide, déjà initialisé (sans découverte du dossier modules)"""
+    registry = ModuleRegistry()
+    registry.initialized = True
+    registry.register_module('dashboard', {"name": "Dashboard", "order": 1, "enabled": True})
+    monkeypatch.setattr(module_registry, 'module_registry', registry)
+    return registry
+
+def make_loader(monkeypatch):
+    """Application dont le module 'slow' enregistre ses routes lentement, à la première requête"""
+    app = Flask(__name__)
+    registrations = []
+
+    def slow_load(app, module_name):
+        registrations.append(module_name)
+        time.sleep(0.05)  # laisse aux autres requêtes le temps d'arriver pendant l'enregistrement
+        blueprint = Blueprint(module_name, __name__, url_prefix=f'/api/{module_name}')
+        blueprint.add_url_rule('/ping', 'ping', lambda: 'pong')
+        app.register_blueprint(blueprint)
+
+    monkeypatch.setattr(module_registry, '_load_module', slow_load)
+    loader = LazyModuleLoader(app.wsgi_app, app)
+    loader.add('slow', ['/api/slow/'])
+    loader.add('other', ['/api/other'])
+    app.wsgi_app = loader
+    return app, loader, registrations
+
+def test_concurrent_first_requests_register_once(monkeypatch):
+    app, loader, registrations = make_loader(monkeypatch)
+    barrier = threading.Barrier(8)
+    statuses = []
+
+    def first_request():
+        client = app.test_client()
+        barrier.wait()
+        statuses.append(client.get('/api/slow/ping').status_code)
+
+    threads = [threading.Thread(target=first_request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert statuses == [200] * 8
+    assert registrations == ['slow']
+    assert loader.pending_modules() == ['other']
+
+def test_only_matching_prefixes_load_a_module(monkeypatch):
+    app, loader, registrations = make_loader(monkeypatch)
+    client = app.test_client()
+    assert client.get('/api/slowly').status_code == 404
+    assert registrations == []
+    loader.load_all()
+    assert registrations == ['other', 'slow']
+    assert loader.pending_modules() == []
+    assert client.get('/api/other/ping').status_code == 200
+
+def test_snapshot_is_serialized_once_per_version(registry):
+    body, etag = registry.get_modules_snapshot()
+    assert json.loads(body) == [{"id": "dashboard", "name": "Dashboard", "order": 1, "enabled": True}]
+    assert etag.startswith(f"v{registry.version}-")
+    again, same_etag = registry.get_modules_snapshot()
+    assert again is body and same_etag == etag
+
+def test_registry_changes_bump_the_version(registry):
+    _, etag = registry.get_modules_snapshot()
+    version = registry.version
+
+    registry.register_module('reports', {"name": "Rapports", "order": 2, "enabled": False})
+    assert registry.version == version + 1
+    body, registered_etag = registry.get_modules_snapshot()
+    assert registered_etag != etag
+    assert [module["id"] for module in json.loads(body)] == ['dashboard', 'reports']
+
+    assert registry.enable_module('reports')
+    assert registry.version == version + 2
+    body, enabled_etag = registry.get_modules_snapshot()
+    assert enabled_etag not in (etag, registered_etag)
+    assert json.loads(body)[1]["enabled"] is True
+
+    assert not registry.enable_module('absent')
+    assert registry.version == version + 2
+
+def test_modules_endpoint_revalidates_with_the_snapshot_etag(server_app, registry):
+    client = server_app.test_client()
+    response = client.get('/api/modules')
+    etag, weak = response.get_etag()
+    assert response.status_code == 200 and not weak
+    assert etag == registry.get_modules_snapshot()[1]
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert response.get_json() == [{"id": "dashboard", "name": "Dashboard", "order": 1, "enabled": True}]
+
+    revalidated = client.get('/api/modules', headers={'If-None-Match': f'"{etag}"'})
+    assert revalidated.status_code == 304 and revalidated.get_data() == b''
+
+    registry.register_module('reports', {"name": "Rapports", "order": 2})
+    changed = client.get('/api/modules', headers={'If-None-Match': f'"{etag}"'})
+    assert changed.status_code == 200
+    assert changed.get_etag()[0] != etag
+    assert [module["id"] for module in changed.get_json()] == ['dashboard', 'reports']
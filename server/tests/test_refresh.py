@@ -0,0 +1,47 @@
+# test_refresh.py - Planificateur de rafraîchissement : pré-chauffage du cache, sources indisponibles
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from modules import dashboard
+from modules.dashboard import refresh
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(dashboard.dashboard_bp)
+    dashboard.response_cache.clear()
+    yield app.test_client()
+    dashboard.response_cache.clear()
+
+def test_current_filters_cover_interface_defaults():
+    filters = refresh.current_filters(datetime(2024, 3, 30))
+    assert ('weekly', 'total', 4, 3, 2024) in filters
+    assert ('monthly', 'average', 1, 3, 2024) in filters
+    assert ('yearly', 'total', 3, 3, 2024) in filters
+    assert len(filters) == 18
+
+def test_warmed_requests_hit_the_cache(client):
+    assert refresh.warm_cache(formats=['rows', 'columnar']) == 36
+    now = datetime.now()
+    for query in ("", f"view_type=weekly&week={min((now.day - 1) // 7 + 1, 4)}&month={now.month}&year={now.year}",
+                  "view_type=yearly&display_type=average&week=2&format=columnar"):
+        response = client.get(f"/api/dashboard/data?{query}")
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "HIT"
+    assert client.get("/api/dashboard/data?year=2001").headers["X-Cache"] == "MISS"
+
+def test_unavailable_api_only_skips_sync_jobs(monkeypatch):
+    def broken_api():
+        raise ImportError("connecteur introuvable")
+    monkeypatch.setattr(dashboard, 'get_api', broken_api)
+    scheduler = refresh.build_scheduler(sync=True)
+    assert list(scheduler.jobs) == [refresh.WARM_JOB]
+
+def test_sync_jobs_follow_source_intervals(monkeypatch):
+    monkeypatch.setattr(dashboard, 'get_api', lambda: object())
+    scheduler = refresh.build_scheduler(sync=True)
+    assert scheduler.jobs["sync_landesk_tickets"].interval == 300
+    assert scheduler.jobs["sync_siem_incidents"].interval == 120
+    assert scheduler.jobs[refresh.WARM_JOB].next_run <= scheduler.jobs["sync_landesk_tickets"].next_run
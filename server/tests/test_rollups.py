@@ -0,0 +1,124 @@
+# test_rollups.py - Agrégats journaliers : rafraîchissement incrémental, mises à jour tardives, suppressions
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+import modules.dashboard as dashboard
+from modules.dashboard import TICKETS_PERIOD_QUERY, kpi_engine, rollups, synthetic
+
+MONTHS = [(date(2024, month, 1), date(2024, month + 1, 1)) for month in (1, 2)]
+
+@pytest.fixture
+def loaded(kpi_connection):
+    synthetic.load_tickets(kpi_connection, 2000, datetime(2024, 1, 1), datetime(2024, 3, 1), seed=7)
+    rollups.refresh_rollups(kpi_connection, full=True)
+    return kpi_connection
+
+def ticket_totals(connection, start, end):
+    """Totalisations calculées directement sur les tickets (référence)"""
+    cursor = connection.execute(TICKETS_PERIOD_QUERY, {
+        "start": start.isoformat(), "previous_start": start.isoformat(), "end": end.isoformat()})
+    names = [column[0] for column in cursor.description]
+    rows = cursor.fetchall()
+    current, _ = kpi_engine.compute_period_totals_python(
+        {name: [row[index] for row in rows] for index, name in enumerate(names)})
+    return current
+
+def assert_matches_tickets(connection):
+    for start, end in MONTHS:
+        expected = ticket_totals(connection, start, end)
+        actual = rollups.query_period(connection, start, end)
+        for key in ("by_technology", "by_assignee"):
+            assert set(actual[key]) == set(expected[key])
+            for name, totals in expected[key].items():
+                assert actual[key][name]["ticket_count"] == totals["ticket_count"]
+                assert actual[key][name]["critical_count"] == totals["critical_count"]
+                assert actual[key][name]["resolved_count"] == totals["resolved_count"]
+                assert actual[key][name]["processing_minutes"] == pytest.approx(totals["processing_minutes"])
+
+def update_ticket(connection, sql, params):
+    with connection:
+        connection.execute(sql, params)
+
+def test_full_refresh_matches_tickets(loaded):
+    assert_matches_tickets(loaded)
+    assert rollups.refresh_rollups(loaded) == 0
+
+def test_incremental_refresh_recomputes_changed_days_only(loaded):
+    ticket_id, opened_at = loaded.execute(
+        "SELECT id, opened_at FROM tickets WHERE closed_at IS NULL ORDER BY id LIMIT 1").fetchone()
+    update_ticket(loaded, "UPDATE tickets SET closed_at = datetime(opened_at, '+2 hours'), status = 'closed', "
+                          "severity = 'critical', updated_at = '2030-01-01T00:00:00' WHERE id = ?", (ticket_id,))
+    assert rollups.refresh_rollups(loaded) == 1
+    assert_matches_tickets(loaded)
+    assert loaded.execute("SELECT high_water_mark FROM kpi_rollup_state").fetchone()[0] == "2030-01-01T00:00:00"
+
+def test_late_update_is_picked_up_through_pending_days(loaded):
+    update_ticket(loaded, "UPDATE tickets SET updated_at = '2030-01-01T00:00:00' WHERE id = (SELECT MIN(id) FROM tickets)", ())
+    rollups.refresh_rollups(loaded)
+    # Modification datée avant le point de reprise : seule l'ingestion peut signaler le jour
+    ticket_id, day = loaded.execute("SELECT id, date(opened_at) FROM tickets ORDER BY id DESC LIMIT 1").fetchone()
+    update_ticket(loaded, "UPDATE tickets SET technology = 'OT', updated_at = '2024-01-01T00:00:00' WHERE id = ?",
+                  (ticket_id,))
+    assert rollups.refresh_rollups(loaded) == 0
+    update_ticket(loaded, "INSERT INTO kpi_rollup_pending_days (day) VALUES (?)", (day,))
+    assert rollups.refresh_rollups(loaded) == 1
+    assert_matches_tickets(loaded)
+    assert loaded.execute("SELECT COUNT(*) FROM kpi_rollup_pending_days").fetchone()[0] == 0
+
+def test_deleted_tickets_are_excluded(loaded):
+    before = rollups.query_period(loaded, *MONTHS[0])["totals"]["ticket_count"]
+    day = loaded.execute("SELECT date(MIN(opened_at)) FROM tickets").fetchone()[0]
+    update_ticket(loaded, "UPDATE tickets SET deleted_at = '2030-01-01T00:00:00', updated_at = '2030-01-01T00:00:00' "
+                          "WHERE date(opened_at) = ?", (day,))
+    deleted = loaded.execute("SELECT COUNT(*) FROM tickets WHERE deleted_at IS NOT NULL").fetchone()[0]
+    assert deleted and rollups.refresh_rollups(loaded) == 1
+    assert rollups.query_period(loaded, *MONTHS[0])["totals"]["ticket_count"] == before - deleted
+    assert_matches_tickets(loaded)
+
+def test_period_bounds_and_previous_period():
+    assert rollups.period_bounds('weekly', 4, 2, 2024) == (date(2024, 2, 22), date(2024, 3, 1))
+    assert rollups.period_bounds('monthly', 1, 12, 2024) == (date(2024, 12, 1), date(2025, 1, 1))
+    assert rollups.previous_period('weekly', 1, 1, 2024) == (4, 12, 2023)
+    assert rollups.previous_period('yearly', 1, 5, 2024) == (1, 5, 2023)
+
+@contextmanager
+def fake_lease():
+    yield 'connection'
+
+def test_refresh_store_runs_one_refresh_at_a_time(monkeypatch):
+    running, overlaps = [], []
+    started, finish = threading.Event(), threading.Event()
+
+    def refresh(connection):
+        overlaps.append(len(running))
+        running.append(connection)
+        started.set()
+        finish.wait(2)
+        running.pop()
+        return 1
+
+    monkeypatch.setitem(dashboard.APP_CONFIG, 'ROLLUP_REFRESH_INTERVAL', 0)
+    monkeypatch.setattr(dashboard, 'get_store', lambda: SimpleNamespace(lease=fake_lease))
+    monkeypatch.setattr(rollups, 'refresh_rollups', refresh)
+
+    first = threading.Thread(target=dashboard.refresh_store)
+    first.start()
+    assert started.wait(2)
+    # Intervalle écoulé, mais un rafraîchissement est en cours : l'appel rend la main
+    assert dashboard.refresh_store() == 0
+
+    # Un rafraîchissement forcé attend la fin du précédent
+    forced = []
+    second = threading.Thread(target=lambda: forced.append(dashboard.refresh_store(force=True)))
+    second.start()
+    second.join(0.1)
+    assert second.is_alive()
+    finish.set()
+    first.join(2)
+    second.join(2)
+    assert forced == [1]
+    assert overlaps == [0, 0]
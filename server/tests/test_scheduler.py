@@ -0,0 +1,67 @@
+# test_scheduler.py - Tâches planifiées : non-chevauchement, sauts, échecs, gigue
+import threading
+import time
+
+from utils.scheduler import Job, Scheduler, SkipRun
+
+def test_running_job_is_not_started_twice():
+    release = threading.Event()
+    scheduler = Scheduler('test')
+    job = scheduler.add(Job('lent', lambda: release.wait(5), 60, initial_delay=0))
+    worker = threading.Thread(target=scheduler.run_job, args=(job,))
+    worker.start()
+    while not job.running:
+        time.sleep(0.001)
+    assert scheduler.run_job(job) == 'skipped'
+    release.set()
+    worker.join()
+    assert (job.runs, job.skipped) == (1, 1)
+    assert scheduler.run_job(job) == 'ok'
+
+def test_skip_and_error_outcomes():
+    def fresh():
+        raise SkipRun("déjà à jour")
+
+    def broken():
+        raise ValueError("panne")
+
+    scheduler = Scheduler('test')
+    scheduler.add(Job('frais', fresh, 60))
+    scheduler.add(Job('panne', broken, 60))
+    assert scheduler.run_job('frais') == 'skipped'
+    assert scheduler.run_job('panne') == 'error'
+    stats = scheduler.get_stats()
+    assert (stats['frais']['runs'], stats['frais']['skipped']) == (0, 1)
+    assert (stats['panne']['failures'], stats['panne']['last_error']) == (1, "panne")
+
+def test_file_lock_held_elsewhere_skips(tmp_path):
+    import fcntl
+    path = str(tmp_path / 'job.lock')
+    scheduler = Scheduler('test')
+    scheduler.add(Job('verrou', lambda: None, 60, lock_path=path))
+    with open(path, 'a') as other:
+        fcntl.flock(other, fcntl.LOCK_EX)
+        # Même processus mais descripteur distinct : flock le traite comme un autre détenteur
+        assert scheduler.run_job('verrou') == 'skipped'
+    assert scheduler.run_job('verrou') == 'ok'
+
+def test_jitter_bounds():
+    job = Job('gigue', None, 100, jitter=0.1)
+    assert job.next_run - time.monotonic() <= 10
+    delays = []
+    for _ in range(500):
+        job.schedule_next()
+        delays.append(job.next_run - time.monotonic())
+    assert 89.9 <= min(delays) and max(delays) <= 110
+    assert max(delays) - min(delays) > 5
+
+def test_background_thread_runs_due_jobs():
+    done = threading.Event()
+    scheduler = Scheduler('test')
+    scheduler.add(Job('immédiate', done.set, 60, initial_delay=0))
+    scheduler.start()
+    try:
+        assert done.wait(2)
+    finally:
+        scheduler.stop(wait=True)
+    assert not scheduler.is_running()
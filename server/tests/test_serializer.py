@@ -0,0 +1,94 @@
+# test_serializer.py - Sérialisation JSON : repli orjson -> json et parité avec l'encodeur de jsonify
+import array
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from flask import jsonify
+
+from utils import serializer
+
+BACKENDS = ['json', pytest.param('orjson', marks=pytest.mark.skipif(
+    serializer.orjson is None, reason="orjson n'est pas installé"))]
+
+def payload():
+    """Valeurs rencontrées dans les réponses : dates, décimaux, colonnes, agrégats à clés entières"""
+    value = {
+        "opened_at": datetime(2024, 3, 1, 8, 30, 15, 250000),
+        "day": date(2024, 3, 1),
+        "slot": time(23, 59),
+        "ratio": Decimal('0.25'),
+        "tags": {"vpn"},
+        "bounds": (1, 2),
+        "counts": array.array('l', [3, 4]),
+        "raw": b"caf\xc3\xa9",
+        "by_day": {1: 10, 2: 20},
+        "label": "résolu",
+        "nested": [{"empty": None, "flag": True}]
+    }
+    if serializer.np is not None:
+        value["series"] = serializer.np.array([1.5, 2.5])
+        value["total"] = serializer.np.int64(7)
+    return value
+
+EXPECTED = {
+    "opened_at": "2024-03-01T08:30:15.250000",
+    "day": "2024-03-01",
+    "slot": "23:59:00",
+    "ratio": 0.25,
+    "tags": ["vpn"],
+    "bounds": [1, 2],
+    "counts": [3, 4],
+    "raw": "café",
+    "by_day": {"1": 10, "2": 20},
+    "label": "résolu",
+    "nested": [{"empty": None, "flag": True}]
+}
+if serializer.np is not None:
+    EXPECTED.update(series=[1.5, 2.5], total=7)
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend = serializer.get_backend()
+    yield
+    serializer.set_backend(backend)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps_converts_every_supported_type(backend):
+    assert serializer.set_backend(backend) == backend
+    body = serializer.dumps(payload())
+    assert isinstance(body, bytes)
+    assert json.loads(body) == EXPECTED
+    assert 'résolu'.encode('utf-8') in body  # UTF-8, sans échappement \u
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_unsupported_type_raises_type_error(backend):
+    serializer.set_backend(backend)
+    with pytest.raises(TypeError):
+        serializer.dumps({"value": object()})
+
+def test_backends_produce_the_same_document():
+    if serializer.orjson is None:
+        pytest.skip("orjson n'est pas installé")
+    serializer.set_backend('orjson')
+    fast = serializer.dumps(payload())
+    serializer.set_backend('json')
+    assert serializer.dumps(payload()) == fast
+
+def test_missing_orjson_falls_back_to_json(monkeypatch, caplog):
+    monkeypatch.setattr(serializer, 'orjson', None)
+    assert serializer.set_backend('auto') == 'json'
+    with caplog.at_level(logging.WARNING, logger=serializer.__name__):
+        assert serializer.set_backend('orjson') == 'json'
+    assert "orjson n'est pas installé" in caplog.text
+    assert json.loads(serializer.dumps(payload())) == EXPECTED
+
+def test_jsonify_matches_dumps(server_app):
+    with server_app.app_context():
+        assert server_app.json_encoder is serializer.APIJSONEncoder
+        assert json.loads(jsonify(payload()).get_data()) == EXPECTED
+        response = serializer.json_response(b'{"ready":true}', status=202)
+    assert response.status_code == 202 and response.mimetype == serializer.MIMETYPE
+    assert response.get_data() == b'{"ready":true}'  # octets déjà sérialisés transmis tels quels
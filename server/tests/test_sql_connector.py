@@ -0,0 +1,98 @@
+# test_sql_connector.py - Réglages SQLite (WAL, PRAGMA) et pool de lecture en mode ro du connecteur SQL
+import sqlite3
+import threading
+
+import pytest
+
+from config.settings import DATABASE_CONFIG
+from connectors.sql_connector import SQLConnector
+
+def pragma(connection, name):
+    return connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+def create_table(store):
+    with store.lease() as connection:
+        with connection:
+            connection.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, label TEXT)")
+            connection.execute("INSERT INTO events (label) VALUES ('vpn')")
+
+def test_write_connections_apply_the_configured_pragmas(kpi_store):
+    config = DATABASE_CONFIG['SQL']
+    with kpi_store.lease() as connection:
+        assert pragma(connection, 'journal_mode') == 'wal'
+        assert pragma(connection, 'synchronous') == 1  # NORMAL
+        assert pragma(connection, 'cache_size') == config['CACHE_SIZE']
+        assert pragma(connection, 'mmap_size') == config['MMAP_SIZE']
+        assert pragma(connection, 'temp_store') == 2  # MEMORY
+        assert pragma(connection, 'busy_timeout') == config['BUSY_TIMEOUT'] * 1000
+        assert pragma(connection, 'query_only') == 0
+    assert kpi_store.get_info()["pragmas"]["journal_mode"] == 'wal'
+
+def test_read_pool_is_read_only(kpi_store):
+    create_table(kpi_store)
+    with kpi_store.lease(read_only=True) as connection:
+        assert pragma(connection, 'query_only') == 1
+        assert pragma(connection, 'journal_mode') == 'wal'
+        assert pragma(connection, 'cache_size') == DATABASE_CONFIG['SQL']['CACHE_SIZE']
+    assert kpi_store.read_pool is not None and kpi_store.read_pool.get_stats()["created"] == 1
+
+    result = kpi_store.fetch_data("INSERT INTO events (label) VALUES ('edr')")
+    assert "readonly" in result["error"]
+    result = kpi_store.fetch_data("DELETE FROM events")
+    assert "readonly" in result["error"]
+    assert kpi_store.fetch_data("SELECT label FROM events")["data"] == [{"label": "vpn"}]
+
+def test_read_only_file_connection_rejects_writes_without_query_only(kpi_store):
+    create_table(kpi_store)
+    connection = kpi_store._create_connection(read_only=True)
+    try:
+        connection.execute("PRAGMA query_only = 0")
+        # URI mode=ro : le fichier lui-même est ouvert en lecture
+        with pytest.raises(sqlite3.OperationalError, match='readonly'):
+            connection.execute("INSERT INTO events (label) VALUES ('edr')")
+    finally:
+        connection.close()
+
+def test_readers_are_not_blocked_by_an_open_write(kpi_store):
+    create_table(kpi_store)
+    writing, done = threading.Event(), threading.Event()
+
+    def writer():
+        with kpi_store.lease() as connection:
+            connection.execute("INSERT INTO events (label) VALUES ('edr')")  # transaction laissée ouverte
+            writing.set()
+            done.wait(2)
+            connection.rollback()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert writing.wait(2)
+        result = kpi_store.fetch_data("SELECT label FROM events")
+        assert result["data"] == [{"label": "vpn"}]
+        assert result["execution_time"] < 1  # sans attente du verrou (BUSY_TIMEOUT)
+    finally:
+        done.set()
+        thread.join()
+
+def test_reads_inside_a_write_lease_see_pending_changes(kpi_store):
+    create_table(kpi_store)
+    with kpi_store.lease() as connection:
+        connection.execute("INSERT INTO events (label) VALUES ('edr')")
+        assert kpi_store.fetch_data("SELECT COUNT(*) AS total FROM events")["data"] == [{"total": 2}]
+        connection.rollback()
+    assert kpi_store.fetch_data("SELECT COUNT(*) AS total FROM events")["data"] == [{"total": 1}]
+
+def test_memory_database_has_no_read_pool():
+    store = SQLConnector('memory_store', dict(DATABASE_CONFIG['SQL'], NAME=':memory:'))
+    try:
+        assert store.connect()
+        assert store.read_only_queries is False and store.read_pool is None
+    finally:
+        store.disconnect()
+
+def test_invalid_pragma_value_is_rejected(tmp_path):
+    store = SQLConnector('bad_store', dict(DATABASE_CONFIG['SQL'], NAME=str(tmp_path / 'bad.db'),
+                                           JOURNAL_MODE='wal; DROP TABLE events'))
+    assert store.connect() is False
+    assert store.is_connected is False
@@ -0,0 +1,101 @@
+# test_static_index.py - Index en mémoire du build frontend et modes de rafraîchissement
+import os
+import time
+
+import pytest
+
+from utils import static_index
+from utils.static_index import StaticIndex
+
+@pytest.fixture
+def build(tmp_path):
+    (tmp_path / 'static' / 'js').mkdir(parents=True)
+    (tmp_path / 'index.html').write_text('<html>' + 'x' * 2000 + '</html>')
+    (tmp_path / 'static' / 'js' / 'main.1234.js').write_text('console.log(1);')
+    return tmp_path
+
+def add_file(build):
+    (build / 'static' / 'js' / 'chunk.5678.js').write_text('console.log(2);')
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_index_is_built_at_startup(build):
+    index = StaticIndex(str(build), {'STATIC_INDEX_REFRESH_INTERVAL': 60})
+    try:
+        assert index.lookup('') is index.lookup('index.html')
+        assert index.lookup('index.html').cache_control == 'no-cache'
+        assert 'immutable' in index.lookup('static/js/main.1234.js').cache_control
+        assert 'gzip' in index.lookup('index.html').variants
+        stats = index.get_stats()
+        assert (stats["files"], stats["refresh_mode"], stats["refreshes"]) == (2, 'background', 1)
+    finally:
+        index.stop_watcher()
+
+def test_startup_mode_never_walks_on_requests(build, monkeypatch):
+    index = StaticIndex(str(build), {'STATIC_INDEX_REFRESH': 'startup', 'STATIC_INDEX_REFRESH_INTERVAL': 0.01})
+
+    def walk(*args):
+        raise AssertionError("parcours du dossier pendant une requête")
+
+    monkeypatch.setattr(index, '_scan_signature', walk)
+    add_file(build)
+    time.sleep(0.02)
+    assert index.lookup('static/js/chunk.5678.js') is None
+    assert index.lookup('index.html') is not None
+
+def test_request_mode_rebuilds_on_lookup(build):
+    index = StaticIndex(str(build), {'STATIC_INDEX_REFRESH': 'request', 'STATIC_INDEX_REFRESH_INTERVAL': 0.01})
+    add_file(build)
+    time.sleep(0.02)
+    assert index.lookup('static/js/chunk.5678.js') is not None
+    assert index.refreshes == 2
+
+def test_background_mode_rebuilds_off_the_request_path(build, monkeypatch):
+    index = StaticIndex(str(build), {'STATIC_INDEX_REFRESH': 'background', 'STATIC_INDEX_REFRESH_INTERVAL': 0.01})
+    try:
+        watcher = index._watcher  # démarré avec l'index
+        assert watcher is not None and watcher.is_alive()
+
+        # Une recherche n'est qu'une lecture du dictionnaire : ni pid, ni parcours du dossier
+        with monkeypatch.context() as patch:
+            patch.setattr(static_index.os, 'getpid', lambda: pytest.fail("os.getpid pendant une recherche"))
+            patch.setattr(index, 'maybe_refresh', lambda: pytest.fail("vérification pendant une recherche"))
+            assert index.lookup('index.html') is not None
+
+        add_file(build)
+        assert wait_for(lambda: index.lookup('static/js/chunk.5678.js') is not None)
+        index.start_watcher()
+        assert index._watcher is watcher  # un seul thread par processus
+    finally:
+        index.stop_watcher()
+    assert not watcher.is_alive()
+    assert index not in static_index._watched
+
+@pytest.mark.skipif(not hasattr(os, 'fork') or not hasattr(os, 'register_at_fork'), reason="fork indisponible")
+def test_background_watcher_restarts_after_fork(build):
+    index = StaticIndex(str(build), {'STATIC_INDEX_REFRESH': 'background', 'STATIC_INDEX_REFRESH_INTERVAL': 0.01})
+    index._refresh_lock.acquire()  # verrou détenu par un thread du parent au moment du fork
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # Processus enfant : le thread est relancé et le dossier de nouveau surveillé
+            try:
+                add_file(build)
+                restarted = index._watcher_pid == os.getpid() and index._watcher.is_alive()
+                found = wait_for(lambda: index.lookup('static/js/chunk.5678.js') is not None)
+                os._exit(0 if restarted and found else 1)
+            except BaseException:
+                os._exit(2)
+        index._refresh_lock.release()
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    finally:
+        index.stop_watcher()
+
+def test_unknown_refresh_mode(build):
+    with pytest.raises(ValueError):
+        StaticIndex(str(build), {'STATIC_INDEX_REFRESH': 'sometimes'})
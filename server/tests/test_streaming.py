@@ -0,0 +1,63 @@
+# test_streaming.py - Export des tickets diffusé en flux (NDJSON / tableau JSON par morceaux)
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from modules import dashboard
+from modules.dashboard import synthetic
+from utils.streaming import stream_response
+
+@pytest.fixture
+def client(kpi_store, monkeypatch):
+    with kpi_store.lease() as connection:
+        synthetic.load_tickets(connection, 3000, datetime(2024, 1, 1), datetime(2024, 3, 1), seed=3)
+        connection.execute("UPDATE tickets SET deleted_at = '2024-03-01T00:00:00' WHERE id IN "
+                           "(SELECT id FROM tickets WHERE opened_at < '2024-02-01' LIMIT 10)")
+        connection.commit()
+        expected = connection.execute(
+            "SELECT COUNT(*) FROM tickets WHERE opened_at >= '2024-01-01' AND opened_at < '2024-02-01' "
+            "AND deleted_at IS NULL").fetchone()[0]
+    monkeypatch.setattr(dashboard, '_store', kpi_store)
+    monkeypatch.setitem(dashboard.APP_CONFIG, 'EXPORT_BATCH_SIZE', 100)
+    app = Flask(__name__)
+    app.register_blueprint(dashboard.dashboard_bp)
+    client = app.test_client()
+    client.expected = expected
+    return client
+
+def test_ndjson_export_streams_active_tickets_of_the_period(client):
+    response = client.get('/api/dashboard/tickets/export?view_type=monthly&month=1&year=2024')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert 'tickets-20240101-20240201.ndjson' in response.headers['Content-Disposition']
+    rows = [json.loads(line) for line in response.get_data().splitlines()]
+    assert len(rows) == client.expected
+    assert all('2024-01-01' <= row["opened_at"] < '2024-02-01' for row in rows)
+    assert [row["opened_at"] for row in rows] == sorted(row["opened_at"] for row in rows)
+
+def test_json_export_is_a_single_array(client):
+    response = client.get('/api/dashboard/tickets/export?view_type=monthly&month=1&year=2024&format=json')
+    assert response.mimetype == 'application/json'
+    rows = json.loads(response.get_data())
+    assert len(rows) == client.expected
+    assert set(rows[0]) == {"id", "technology", "assignee", "severity", "status",
+                            "opened_at", "closed_at", "updated_at"}
+
+@pytest.mark.parametrize('query', ['format=csv', 'view_type=daily', 'week=5', 'month=x'])
+def test_invalid_export_parameters(client, query):
+    assert client.get(f'/api/dashboard/tickets/export?{query}').status_code == 400
+
+def test_rows_are_encoded_by_the_shared_serializer():
+    app = Flask(__name__)
+    rows = [{"at": datetime(2024, 1, 2, 8, 30), "cost": Decimal('1.5'), "tags": ("a", "b")}] * 50
+    with app.test_request_context():
+        response = stream_response(iter(rows), 'ndjson', chunk_size=64)
+        chunks = list(response.response)
+    assert len(chunks) > 1
+    lines = b''.join(chunks).splitlines()
+    assert len(lines) == 50
+    assert json.loads(lines[0]) == {"at": "2024-01-02T08:30:00", "cost": 1.5, "tags": ["a", "b"]}
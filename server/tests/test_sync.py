@@ -0,0 +1,104 @@
+# test_sync.py - Synchronisation incrémentale : point de reprise persistant, erreurs, suppressions
+from config.settings import INGEST_CONFIG
+from database.ingest import IngestPipeline
+from database.sync import DeltaSync
+
+from conftest import FakeAPI, ticket_record
+
+def incident_record(incident_id, updated_at, deleted_at=None):
+    """Incident au format de la source 'siem_incidents'"""
+    return {"id": incident_id, "title": "Alerte", "source": "SIEM", "owner": "Alice", "severity": "critical",
+            "status": "open", "detected_at": "2024-03-01T08:00:00", "resolved_at": None,
+            "updated_at": updated_at, "deleted_at": deleted_at}
+
+def make_sync(name, api, store):
+    source = INGEST_CONFIG['SOURCES'][name]
+    return DeltaSync(IngestPipeline(name, source, api, store), source['SYNC'])
+
+class FailingAPI(FakeAPI):
+    """Source indisponible"""
+
+    def fetch_pages(self, endpoint, params=None, pagination=None):
+        self.requests.append(params or {})
+        raise ConnectionError("source indisponible")
+        yield
+
+def test_cursor_is_persisted_and_sent_back(fake_api, kpi_store):
+    fake_api.pages = [{"data": [incident_record(1, "2024-03-01T09:00:00")], "meta": {"sync_token": "tok1"}}]
+    first = make_sync('siem_incidents', fake_api, kpi_store).run()
+    assert first["mode"] == "full"
+    assert "sync_token" not in fake_api.requests[-1]["query_params"]
+
+    # Nouvelle instance (redémarrage) : le jeton est relu depuis sync_state
+    fake_api.pages = [{"data": [incident_record(2, "2024-03-01T10:00:00")], "meta": {"sync_token": "tok2"}}]
+    sync = make_sync('siem_incidents', fake_api, kpi_store)
+    second = sync.run()
+    assert second["mode"] == "delta"
+    assert fake_api.requests[-1]["query_params"]["sync_token"] == "tok1"
+    assert sync.get_state()["cursor"] == "tok2"
+    assert sync.get_state()["last_status"] == "ok"
+
+def test_failed_run_keeps_checkpoint(fake_api, kpi_store):
+    fake_api.pages = [{"data": [incident_record(1, "2024-03-01T09:00:00")], "meta": {"sync_token": "tok1"}}]
+    make_sync('siem_incidents', fake_api, kpi_store).run()
+
+    failing = FailingAPI()
+    sync = make_sync('siem_incidents', failing, kpi_store)
+    stats = sync.run()
+    assert "error" in stats
+    state = sync.get_state()
+    assert (state["cursor"], state["last_status"]) == ("tok1", "error")
+    assert "indisponible" in state["last_error"]
+
+    # Le passage suivant redemande les mêmes modifications
+    sync.run()
+    assert failing.requests[-1]["query_params"]["sync_token"] == "tok1"
+
+def test_since_mode_requests_from_high_water_mark_minus_lookback(fake_api, kpi_store):
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00"), ticket_record(2, "2024-03-01T10:00:00")]}]
+    sync = make_sync('landesk_tickets', fake_api, kpi_store)
+    sync.run()
+    assert sync.get_state()["high_water_mark"] == "2024-03-01T10:00:00"
+
+    fake_api.pages = []
+    stats = sync.run()
+    lookback = INGEST_CONFIG['SOURCES']['landesk_tickets']['SYNC']['LOOKBACK']
+    assert lookback == 600
+    assert stats["mode"] == "delta"
+    assert fake_api.requests[-1]["query_params"]["updated_since"] == "2024-03-01T09:50:00"
+    # Sans modification, le point de reprise ne recule pas
+    assert sync.get_state()["high_water_mark"] == "2024-03-01T10:00:00"
+
+def test_deleted_at_from_feed_soft_deletes(fake_api, kpi_store):
+    fake_api.pages = [{"data": [incident_record(1, "2024-03-01T09:00:00")], "meta": {"sync_token": "tok1"}}]
+    sync = make_sync('siem_incidents', fake_api, kpi_store)
+    sync.run()
+    fake_api.pages = [{"data": [incident_record(1, "2024-03-01T11:00:00", deleted_at=True)],
+                       "meta": {"sync_token": "tok2"}}]
+    sync.run()
+    with kpi_store.lease() as connection:
+        assert connection.execute("SELECT deleted_at FROM incidents WHERE id = '1'").fetchone()[0] == \
+            "2024-03-01T11:00:00"
+
+def test_swept_ticket_back_upstream_is_active_again(fake_api, kpi_store):
+    def ticket(ticket_id):
+        with kpi_store.lease() as connection:
+            return tuple(connection.execute("SELECT status, updated_at, deleted_at FROM tickets WHERE id = ?",
+                                            (str(ticket_id),)).fetchone())
+
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00"), ticket_record(2, "2024-03-01T09:30:00")]}]
+    sync = make_sync('landesk_tickets', fake_api, kpi_store)
+    sync.run(full=True)
+
+    # Ticket 2 absent d'une relecture complète : supprimé, sa date de modification reste celle de la source
+    fake_api.pages = [{"data": [ticket_record(1, "2024-03-01T09:00:00")]}]
+    assert sync.run(full=True)["deleted"] == 1
+    status, updated_at, deleted_at = ticket(2)
+    assert updated_at == "2024-03-01T09:30:00" and deleted_at is not None
+
+    # De retour dans la source avec une version plus récente (la source ne publie pas deleted_at)
+    fake_api.pages = [{"data": [ticket_record(2, "2024-03-02T10:00:00", status='closed')]}]
+    stats = sync.run()
+    assert stats["mode"] == "delta"
+    assert (stats["written"], stats["stale"]) == (1, 0)
+    assert ticket(2) == ("closed", "2024-03-02T10:00:00", None)
@@ -0,0 +1 @@
+# __init__.py - Utilitaires partagés par le serveur et les modules
@@ -0,0 +1,158 @@
+# cache.py - Cache mémoire LRU avec expiration (TTL) et limite de taille
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    Cache mémoire thread-safe combinant expiration (TTL) et éviction LRU.
+    La taille totale des entrées est bornée en nombre et en octets.
+    """
+    
+    def __init__(self, name, ttl=300, max_entries=256, max_bytes=16 * 1024 * 1024):
+        """
+        Initialise un nouveau cache
+        
+        Args:
+            name (str): Nom identifiant le cache (utilisé dans les logs et les statistiques)
+            ttl (float, optional): Durée de vie des entrées en secondes. None ou 0 pour aucune expiration.
+            max_entries (int, optional): Nombre maximal d'entrées. Par défaut 256.
+            max_bytes (int, optional): Taille maximale cumulée des entrées en octets. Par défaut 16 Mo.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # {clé: (expiration, taille, valeur)}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key):
+        """
+        Récupère une valeur du cache
+        
+        Args:
+            key (hashable): Clé de l'entrée
+            
+        Returns:
+            object: Valeur en cache, ou None si absente ou expirée
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, size, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key, value, size=None, ttl=None):
+        """
+        Ajoute ou remplace une entrée dans le cache
+        
+        Args:
+            key (hashable): Clé de l'entrée
+            value (object): Valeur à stocker
+            size (int, optional): Taille de la valeur en octets. Par défaut len(value).
+            ttl (float, optional): Durée de vie spécifique à l'entrée. Par défaut le TTL du cache.
+            
+        Returns:
+            bool: True si la valeur a été stockée, False si elle dépasse la taille maximale
+        """
+        if size is None:
+            size = len(value)
+        if self.max_bytes and size > self.max_bytes:
+            logger.debug(f"Cache {self.name}: entrée de {size} octets trop volumineuse, ignorée")
+            return False
+        
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, value)
+            self._size += size
+            self._evict()
+        return True
+    
+    def delete(self, key):
+        """
+        Supprime une entrée du cache
+        
+        Args:
+            key (hashable): Clé de l'entrée
+            
+        Returns:
+            bool: True si l'entrée existait, False sinon
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+    
+    def clear(self):
+        """Vide entièrement le cache"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def get_stats(self):
+        """
+        Renvoie les statistiques d'utilisation du cache
+        
+        Returns:
+            dict: Compteurs de succès, d'échecs, d'évictions et occupation du cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def _remove(self, key):
+        """Retire une entrée (le verrou doit être détenu)"""
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+    
+    def _evict(self):
+        """Évince les entrées les moins récemment utilisées jusqu'à respecter les limites"""
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._size > self.max_bytes)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
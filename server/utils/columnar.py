@@ -0,0 +1,53 @@
+# columnar.py - Résultats au format colonnes : {"columns": [...], "data": {colonne: [valeurs]}}
+import logging
+
+logger = logging.getLogger(__name__)
+
+def to_columnar(rows, columns=None):
+    """
+    Convertit une liste de lignes (dictionnaires) en résultat colonnes
+    
+    Args:
+        rows (list): Lignes sous forme de dictionnaires
+        columns (list, optional): Ordre des colonnes. Par défaut les clés de la première ligne.
+        
+    Returns:
+        dict: {"columns": [...], "data": {colonne: [valeurs]}}
+    """
+    if columns is None:
+        columns = list(rows[0].keys()) if rows else []
+    return {
+        "columns": list(columns),
+        "data": {column: [row.get(column) for row in rows] for column in columns}
+    }
+
+def from_tuples(columns, tuples):
+    """
+    Construit un résultat colonnes à partir de tuples (par exemple des lignes de curseur SQL)
+    
+    Args:
+        columns (list): Noms des colonnes
+        tuples (iterable): Lignes sous forme de séquences, dans l'ordre des colonnes
+        
+    Returns:
+        dict: {"columns": [...], "data": {colonne: [valeurs]}}
+    """
+    values = [[] for _ in columns]
+    appenders = [column_values.append for column_values in values]
+    for row in tuples:
+        for append, value in zip(appenders, row):
+            append(value)
+    return {"columns": list(columns), "data": dict(zip(columns, values))}
+
+def row_count(columnar):
+    """
+    Renvoie le nombre de lignes d'un résultat colonnes
+    
+    Args:
+        columnar (dict): Résultat colonnes
+        
+    Returns:
+        int: Nombre de lignes
+    """
+    columns = columnar["columns"]
+    return len(columnar["data"][columns[0]]) if columns else 0
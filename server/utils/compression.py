@@ -0,0 +1,159 @@
+# compression.py - Compression négociée (gzip / brotli), ETag forts et réponses 304
+import hashlib
+import logging
+import zlib
+
+from flask import request
+
+from utils import metrics
+from utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : seul gzip est proposé
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Types de contenu qui gagnent à être compressés (les images et polices le sont déjà)
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/x-ndjson',
+    'application/manifest+json',
+    'image/svg+xml',
+    'text/css',
+    'text/html',
+    'text/javascript',
+    'text/plain'
+}
+
+# Variantes compressées déjà calculées, indexées par (ETag du contenu, encodage) :
+# un même contenu interrogé par plusieurs écrans n'est compressé qu'une fois
+compressed_cache = TTLCache('compressed', ttl=None, max_entries=256, max_bytes=16 * 1024 * 1024)
+metrics.registry.track_cache(compressed_cache)
+
+def content_etag(body):
+    """
+    Calcule un ETag fort à partir du contenu
+
+    Args:
+        body (bytes): Contenu de la réponse
+
+    Returns:
+        str: Empreinte du contenu (sans guillemets)
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def negotiate_encoding(accept_encoding, allow_brotli=True):
+    """
+    Choisit l'encodage de contenu accepté par le client (brotli, puis gzip)
+
+    Args:
+        accept_encoding (str): Valeur de l'en-tête Accept-Encoding
+        allow_brotli (bool, optional): Proposer brotli s'il est installé. Par défaut True.
+
+    Returns:
+        str: 'br', 'gzip' ou None
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get('*', 0.0)
+    candidates = ['br', 'gzip'] if allow_brotli and brotli is not None else ['gzip']
+    best = None
+    best_quality = 0.0
+    for coding in candidates:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compress(body, encoding, gzip_level=6, brotli_quality=5):
+    """
+    Compresse un contenu. Le résultat est déterministe (pas d'horodatage dans l'en-tête gzip),
+    ce qui permet d'associer un ETag fort à chaque variante.
+
+    Args:
+        body (bytes): Contenu à compresser
+        encoding (str): 'gzip' ou 'br'
+        gzip_level (int, optional): Niveau de compression gzip (1-9). Par défaut 6.
+        brotli_quality (int, optional): Qualité brotli (0-11). Par défaut 5.
+
+    Returns:
+        bytes: Contenu compressé
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+def finalize_response(response, config):
+    """
+    Ajoute l'ETag, traite If-None-Match (304) et compresse la réponse selon Accept-Encoding.
+    L'ETag fort déjà posé par une vue (entrée de cache) est réutilisé ; sinon il est calculé
+    sur le contenu. Chaque encodage reçoit son propre ETag.
+
+    Args:
+        response (Response): Réponse Flask
+        config (dict): SERVER_CONFIG (COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, ...)
+
+    Returns:
+        Response: Réponse éventuellement compressée ou transformée en 304
+    """
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+    if 'Content-Encoding' in response.headers:
+        return response
+
+    compressible = response.mimetype in COMPRESSIBLE_TYPES
+    if response.direct_passthrough:
+        # Fichier servi par send_file : chargé en mémoire seulement s'il est compressible et raisonnable
+        length = response.content_length
+        if not compressible or length is None or length > config.get('COMPRESSION_MAX_FILE_SIZE', 4 * 1024 * 1024):
+            return response
+        response.direct_passthrough = False
+    elif response.is_streamed:
+        return response  # Réponses diffusées en flux : ni mise en mémoire, ni ETag
+
+    body = response.get_data()
+    etag, weak = response.get_etag()
+    if etag is None or weak:
+        etag = content_etag(body)
+
+    encoding = None
+    min_size = config.get('COMPRESSION_MIN_SIZE', 1024)
+    if config.get('COMPRESSION_ENABLED', True) and compressible and len(body) >= min_size:
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'),
+                                      config.get('BROTLI_ENABLED', True))
+
+    variant_etag = f"{etag}-{encoding}" if encoding else etag
+    response.set_etag(variant_etag)
+
+    if request.if_none_match.contains(variant_etag):
+        response.status_code = 304
+        response.set_data(b'')
+        for header in ('Content-Length', 'Content-Type', 'Content-Encoding'):
+            response.headers.pop(header, None)
+        return response
+
+    if encoding:
+        compressed = compressed_cache.get((etag, encoding))
+        if compressed is None:
+            compressed = compress(body, encoding, config.get('GZIP_LEVEL', 6), config.get('BROTLI_QUALITY', 5))
+            compressed_cache.set((etag, encoding), compressed)
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,257 @@
+# metrics.py - Mesures de performance exposées au format texte Prometheus
+import bisect
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Bornes par défaut des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """
+    Histogramme cumulatif à étiquettes (labels), compatible avec le format Prometheus.
+    Chaque observation ne coûte qu'une recherche dichotomique et quelques additions.
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Initialise un histogramme
+
+        Args:
+            name (str): Nom de la métrique
+            documentation (str): Description de la métrique
+            labelnames (tuple, optional): Noms des étiquettes. Par défaut aucune.
+            buckets (tuple, optional): Bornes supérieures des intervalles, triées. Par défaut DEFAULT_BUCKETS.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # {valeurs des étiquettes: [compteurs par intervalle..., somme, nombre]}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        """
+        Enregistre une observation
+
+        Args:
+            value (float): Valeur observée (en secondes pour une durée)
+            *labelvalues: Valeurs des étiquettes, dans l'ordre de labelnames
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *labelvalues):
+        """
+        Mesure la durée d'un bloc with avec une horloge monotone
+
+        Args:
+            *labelvalues: Valeurs des étiquettes
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def collect(self):
+        """
+        Produit les lignes du format texte Prometheus
+
+        Returns:
+            list: Lignes de texte
+        """
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, series in sorted(snapshot.items()):
+            labels = list(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+class Counter:
+    """Compteur monotone à étiquettes"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Initialise un compteur
+
+        Args:
+            name (str): Nom de la métrique (suffixe _total recommandé)
+            documentation (str): Description de la métrique
+            labelnames (tuple, optional): Noms des étiquettes. Par défaut aucune.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labelvalues):
+        """
+        Incrémente le compteur
+
+        Args:
+            amount (float, optional): Incrément. Par défaut 1.
+            *labelvalues: Valeurs des étiquettes
+        """
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def collect(self):
+        """Produit les lignes du format texte Prometheus"""
+        with self._lock:
+            snapshot = dict(self._values)
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, labelvalues)))} {_format_value(value)}")
+        return lines
+
+class CallbackMetric:
+    """Métrique dont la valeur est lue au moment de l'export (état d'un cache, d'un pool...)"""
+
+    def __init__(self, name, documentation, callback, metric_type='gauge', labelnames=()):
+        """
+        Initialise une métrique calculée
+
+        Args:
+            name (str): Nom de la métrique
+            documentation (str): Description de la métrique
+            callback (callable): Fonction renvoyant {valeurs des étiquettes (tuple): valeur}
+            metric_type (str, optional): 'gauge' ou 'counter'. Par défaut 'gauge'.
+            labelnames (tuple, optional): Noms des étiquettes. Par défaut aucune.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.metric_type = metric_type
+        self.labelnames = tuple(labelnames)
+
+    def collect(self):
+        """Produit les lignes du format texte Prometheus"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Métrique {self.name} indisponible: {str(e)}")
+            return lines
+        for labelvalues, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, labelvalues)))} {_format_value(value)}")
+        return lines
+
+class MetricsRegistry:
+    """Registre des métriques du processus"""
+
+    def __init__(self):
+        """Initialise un registre vide"""
+        self._metrics = {}
+        self._caches = weakref.WeakSet()
+        self._lock = threading.Lock()
+        for name, key, metric_type, documentation in (
+                ("cache_hits_total", "hits", "counter", "Lectures servies par le cache"),
+                ("cache_misses_total", "misses", "counter", "Lectures absentes ou expirées du cache"),
+                ("cache_evictions_total", "evictions", "counter", "Entrées évincées du cache (LRU ou taille)"),
+                ("cache_entries", "entries", "gauge", "Nombre d'entrées du cache"),
+                ("cache_bytes", "bytes", "gauge", "Taille des entrées du cache en octets")):
+            self.register(CallbackMetric(name, documentation, self._cache_values(key), metric_type, ('cache',)))
+
+    def register(self, metric):
+        """
+        Ajoute une métrique au registre (une métrique de même nom est conservée)
+
+        Args:
+            metric (object): Métrique exposant name et collect()
+
+        Returns:
+            object: Métrique enregistrée sous ce nom
+        """
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Crée (ou renvoie) un histogramme"""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name, documentation, labelnames=()):
+        """Crée (ou renvoie) un compteur"""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def track_cache(self, cache):
+        """
+        Exporte les statistiques d'un cache (utils.cache.TTLCache), étiquetées par son nom
+
+        Args:
+            cache (TTLCache): Cache à suivre
+        """
+        self._caches.add(cache)
+
+    def render(self):
+        """
+        Produit l'export complet au format texte Prometheus (version 0.0.4)
+
+        Returns:
+            str: Texte de l'export
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+    def _cache_values(self, key):
+        """Fonction de lecture d'une statistique de tous les caches suivis"""
+        def collect():
+            values = {}
+            for cache in list(self._caches):
+                values[(cache.name,)] = values.get((cache.name,), 0) + cache.get_stats()[key]
+            return values
+        return collect
+
+def _format_labels(labels):
+    """Formate une liste de paires (nom, valeur) en étiquettes Prometheus"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _escape(value):
+    """Échappe une valeur d'étiquette (barre oblique inverse, guillemet, retour à la ligne)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value):
+    """Formate une valeur numérique"""
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+# Registre du processus et métriques communes
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds', "Durée de traitement des requêtes HTTP", ('method', 'route', 'status'))
+connector_request_duration = registry.histogram(
+    'connector_request_duration_seconds', "Durée des appels aux sources de données",
+    ('connector', 'type', 'operation'))
+module_registration_duration = registry.histogram(
+    'module_registration_duration_seconds', "Durée d'import et d'enregistrement des modules", ('module',))
+json_serialization_duration = registry.histogram(
+    'json_serialization_duration_seconds', "Durée de sérialisation JSON des réponses", ('endpoint',))
@@ -0,0 +1,316 @@
+# scheduler.py - Planificateur de tâches périodiques en arrière-plan (gigue, non-chevauchement, métriques)
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils import metrics
+from utils.metrics import CallbackMetric
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+job_duration = metrics.registry.histogram(
+    'scheduler_job_duration_seconds', "Durée d'exécution des tâches planifiées", ('job',))
+job_runs = metrics.registry.counter(
+    'scheduler_job_runs_total', "Exécutions des tâches planifiées par résultat (ok, error, skipped)", ('job', 'outcome'))
+
+# Planificateurs du processus, pour l'export des métriques calculées
+_schedulers = weakref.WeakSet()
+_schedulers_lock = threading.Lock()
+
+def _job_values(attribute):
+    """Fonction de lecture d'un attribut des tâches de tous les planificateurs du processus"""
+    def collect():
+        with _schedulers_lock:
+            schedulers = list(_schedulers)
+        values = {}
+        for scheduler in schedulers:
+            for job in scheduler.jobs.values():
+                value = attribute(job)
+                if value is not None:
+                    values[(job.name,)] = value
+        return values
+    return collect
+
+metrics.registry.register(CallbackMetric(
+    'scheduler_job_running', "Tâches planifiées en cours d'exécution (0 ou 1)",
+    _job_values(lambda job: int(job.running)), 'gauge', ('job',)))
+metrics.registry.register(CallbackMetric(
+    'scheduler_job_last_success_age_seconds', "Ancienneté de la dernière exécution réussie de chaque tâche",
+    _job_values(lambda job: time.time() - job.last_success if job.last_success else None), 'gauge', ('job',)))
+
+class SkipRun(Exception):
+    """Levée par une tâche qui n'a rien à faire (donnée déjà fraîche) : l'exécution est comptée 'skipped'"""
+
+class Job:
+    """Tâche périodique : fonction, intervalle, gigue et statistiques d'exécution"""
+
+    def __init__(self, name, func, interval, jitter=0.1, initial_delay=None, lock_path=None):
+        """
+        Initialise une tâche
+
+        Args:
+            name (str): Nom de la tâche (étiquette des métriques)
+            func (callable): Fonction sans argument exécutée à chaque passage
+            interval (float): Intervalle moyen entre deux exécutions, en secondes
+            jitter (float, optional): Variation aléatoire relative de l'intervalle (0.1 : ±10 %). Par défaut 0.1.
+            initial_delay (float, optional): Délai avant la première exécution. Par défaut None
+                (tirage entre 0 et jitter x interval, pour étaler les démarrages simultanés).
+            lock_path (str, optional): Fichier de verrou partagé entre processus : une exécution
+                déjà en cours dans un autre processus fait sauter celle-ci. Par défaut None.
+        """
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.lock_path = lock_path
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_duration = None
+        self.last_run_at = None
+        self.last_success = None
+        self.last_error = None
+        self.next_run = time.monotonic() + (
+            random.uniform(0, jitter * interval) if initial_delay is None else initial_delay)
+
+    def schedule_next(self):
+        """Planifie l'exécution suivante : intervalle x (1 ± jitter)"""
+        self.next_run = time.monotonic() + self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def get_stats(self):
+        """
+        Renvoie les statistiques de la tâche
+
+        Returns:
+            dict: Exécutions, échecs, sauts, durée et date de la dernière exécution, prochaine échéance
+        """
+        return {
+            "interval": self.interval,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "next_run_in": max(0.0, self.next_run - time.monotonic())
+        }
+
+class Scheduler:
+    """
+    Exécute des tâches périodiques dans un thread d'arrière-plan. Une tâche n'est jamais lancée
+    tant que son exécution précédente n'est pas terminée (dans ce processus, et entre processus
+    pour les tâches dotées d'un fichier de verrou).
+    """
+
+    def __init__(self, name, max_workers=2):
+        """
+        Initialise un planificateur vide
+
+        Args:
+            name (str): Nom du planificateur (logs, nom du thread)
+            max_workers (int, optional): Tâches exécutées simultanément. Par défaut 2.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._executor = None
+        with _schedulers_lock:
+            _schedulers.add(self)
+
+    def add(self, job):
+        """
+        Ajoute une tâche
+
+        Args:
+            job (Job): Tâche à planifier
+
+        Returns:
+            Job: Tâche ajoutée
+        """
+        with self._lock:
+            self.jobs[job.name] = job
+        self._wakeup.set()
+        return job
+
+    def start(self):
+        """Démarre le thread du planificateur (sans effet s'il tourne déjà)"""
+        with self._lock:
+            if self.is_running():
+                return
+            self._stopping.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._thread = threading.Thread(target=self._loop, name=f"scheduler-{self.name}", daemon=True)
+            self._thread.start()
+        logger.info(f"Planificateur {self.name} démarré ({len(self.jobs)} tâche(s))")
+
+    def stop(self, wait=False):
+        """
+        Arrête le planificateur. Les tâches en cours se terminent ; aucune nouvelle n'est lancée.
+
+        Args:
+            wait (bool, optional): Attendre la fin des tâches en cours. Par défaut False.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        with self._lock:
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        if thread is not None:
+            thread.join()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        logger.info(f"Planificateur {self.name} arrêté")
+
+    def is_running(self):
+        """Indique si le thread du planificateur tourne"""
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def run_pending(self):
+        """
+        Lance les tâches arrivées à échéance
+
+        Returns:
+            float: Secondes avant la prochaine échéance
+        """
+        now = time.monotonic()
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            if job.next_run > now:
+                continue
+            job.schedule_next()
+            if self._executor is not None:
+                self._executor.submit(self.run_job, job)
+            else:
+                self.run_job(job)
+        return max(0.0, min([job.next_run for job in jobs] or [now + 60]) - time.monotonic())
+
+    def run_job(self, job):
+        """
+        Exécute une tâche immédiatement, sauf si elle est déjà en cours
+
+        Args:
+            job (Job or str): Tâche ou nom de la tâche
+
+        Returns:
+            str: Résultat de l'exécution ('ok', 'error' ou 'skipped')
+        """
+        if not isinstance(job, Job):
+            job = self.jobs[job]
+        with self._lock:
+            if job.running:
+                outcome = 'skipped'
+            else:
+                job.running = True
+                outcome = None
+        if outcome:
+            logger.debug(f"Tâche {job.name} déjà en cours, exécution sautée")
+            return self._record(job, outcome)
+
+        lock_file = None
+        started = time.perf_counter()
+        try:
+            lock_file = self._acquire_file_lock(job)
+            if job.lock_path and fcntl is not None and lock_file is None:
+                raise SkipRun("verrou détenu par un autre processus")
+            job.func()
+            outcome = 'ok'
+        except SkipRun as e:
+            logger.debug(f"Tâche {job.name} sautée: {str(e)}")
+            outcome = 'skipped'
+        except Exception as e:
+            logger.error(f"Erreur lors de l'exécution de la tâche {job.name}: {str(e)}")
+            job.last_error = str(e)
+            outcome = 'error'
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            duration = time.perf_counter() - started
+            with self._lock:
+                job.running = False
+        if outcome != 'skipped':
+            job.last_duration = duration
+            job.last_run_at = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+            job_duration.observe(duration, job.name)
+        if outcome == 'ok':
+            job.last_success = time.time()
+            job.last_error = None
+        return self._record(job, outcome)
+
+    def get_stats(self):
+        """
+        Renvoie les statistiques des tâches
+
+        Returns:
+            dict: {nom de la tâche: statistiques}
+        """
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return {job.name: job.get_stats() for job in jobs}
+
+    def _record(self, job, outcome):
+        """Compte le résultat d'une exécution"""
+        if outcome == 'skipped':
+            job.skipped += 1
+        else:
+            job.runs += 1
+            if outcome == 'error':
+                job.failures += 1
+        job_runs.inc(1, job.name, outcome)
+        return outcome
+
+    def _acquire_file_lock(self, job):
+        """Prend sans attendre le verrou de fichier de la tâche (None si absent ou déjà détenu)"""
+        if not job.lock_path or fcntl is None:
+            return None
+        lock_file = open(job.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def _loop(self):
+        """Boucle du thread : attend la prochaine échéance (ou l'ajout d'une tâche) puis lance les tâches dues"""
+        while not self._stopping.is_set():
+            try:
+                delay = self.run_pending()
+            except Exception as e:
+                logger.error(f"Erreur du planificateur {self.name}: {str(e)}")
+                delay = 1.0
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+def lock_path(directory, name):
+    """
+    Chemin du fichier de verrou d'une tâche
+
+    Args:
+        directory (str): Dossier des verrous
+        name (str): Nom de la tâche
+
+    Returns:
+        str: Chemin du fichier, ou None si les verrous de fichier ne sont pas disponibles
+    """
+    if fcntl is None:
+        return None
+    return os.path.join(directory, f".{name}.lock")
@@ -0,0 +1,122 @@
+# serializer.py - Sérialisation JSON des réponses de l'API (orjson si disponible, repli sur json)
+import array
+import json
+import logging
+from datetime import date, datetime, time as datetime_time
+from decimal import Decimal
+
+from flask import current_app
+from flask.json import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur le module json de la bibliothèque standard
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel
+    np = None
+
+logger = logging.getLogger(__name__)
+
+MIMETYPE = 'application/json'
+
+# Options orjson : tableaux NumPy natifs et clés non textuelles (entiers des agrégats)
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+_backend = 'orjson' if orjson is not None else 'json'
+
+def set_backend(name):
+    """
+    Choisit l'encodeur utilisé par dumps
+
+    Args:
+        name (str): 'auto' (orjson si installé), 'orjson' ou 'json'
+
+    Returns:
+        str: Encodeur effectivement retenu
+    """
+    global _backend
+    if name == 'json' or orjson is None:
+        if name == 'orjson':
+            logger.warning("orjson n'est pas installé, repli sur le module json")
+        _backend = 'json'
+    else:
+        _backend = 'orjson'
+    return _backend
+
+def get_backend():
+    """Renvoie le nom de l'encodeur courant ('orjson' ou 'json')"""
+    return _backend
+
+def to_serializable(value):
+    """
+    Convertit les types non pris en charge nativement par les encodeurs JSON
+
+    Args:
+        value (object): Valeur à convertir
+
+    Returns:
+        object: Valeur sérialisable
+
+    Raises:
+        TypeError: Si le type n'est pas pris en charge
+    """
+    if isinstance(value, (datetime, date, datetime_time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, array.array):
+        return value.tolist()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode('utf-8')
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+    raise TypeError(f"Type non sérialisable en JSON: {type(value).__name__}")
+
+def dumps(value):
+    """
+    Sérialise une valeur en JSON compact encodé en UTF-8.
+    Les octets sont considérés comme déjà sérialisés et renvoyés tels quels.
+
+    Args:
+        value (object): Valeur à sérialiser (dictionnaires, listes, résultats colonnes,
+            datetime, tableaux NumPy...)
+
+    Returns:
+        bytes: Document JSON
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if _backend == 'orjson':
+        return orjson.dumps(value, default=to_serializable, option=_ORJSON_OPTIONS)
+    return json.dumps(value, default=to_serializable, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_response(value, status=200, headers=None):
+    """
+    Construit une réponse JSON à partir d'une valeur ou d'octets déjà sérialisés
+
+    Args:
+        value (object): Valeur à sérialiser, ou bytes déjà encodés
+        status (int, optional): Code HTTP. Par défaut 200.
+        headers (dict, optional): En-têtes supplémentaires. Par défaut None.
+
+    Returns:
+        Response: Réponse Flask
+    """
+    return current_app.response_class(dumps(value), status=status, headers=headers, mimetype=MIMETYPE)
+
+class APIJSONEncoder(JSONEncoder):
+    """Encodeur de flask.json (jsonify) partageant les conversions de dumps"""
+
+    def default(self, value):
+        try:
+            return to_serializable(value)
+        except TypeError:
+            return super().default(value)
@@ -0,0 +1,336 @@
+# static_index.py - Index en mémoire des fichiers du build frontend (métadonnées, contenu, variantes compressées)
+import logging
+import mimetypes
+import os
+import threading
+import time
+import weakref
+
+from werkzeug.http import http_date
+from werkzeug.wsgi import wrap_file
+
+from utils import compression
+from utils.compression import COMPRESSIBLE_TYPES, compress, content_etag
+
+logger = logging.getLogger(__name__)
+
+# Extensions des variantes précompressées éventuellement produites par l'outil de build
+PRECOMPRESSED_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+# Reconstruction de l'index : jamais après le démarrage, par un thread d'arrière-plan,
+# ou vérification sur le thread de la requête (développement)
+REFRESH_MODES = ('startup', 'background', 'request')
+
+# Index dont le thread de surveillance doit être relancé dans les processus issus d'un fork
+_watched = weakref.WeakSet()
+
+def restart_watchers():
+    """
+    Relance les threads de surveillance (mode 'background') dans un processus issu d'un fork :
+    les threads du parent n'y survivent pas. Appelée après chaque fork (os.register_at_fork) et
+    par le hook post_fork de Gunicorn ; sans effet si le thread tourne déjà dans ce processus.
+    """
+    for index in list(_watched):
+        index._after_fork()
+
+class StaticFile:
+    """Métadonnées d'un fichier du build et, s'il est petit, son contenu et ses variantes compressées"""
+
+    __slots__ = ('path', 'size', 'mtime', 'mimetype', 'etag', 'last_modified', 'cache_control', 'data', 'variants')
+
+    def __init__(self, path, size, mtime, mimetype, cache_control):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.mimetype = mimetype
+        self.etag = f"{int(mtime * 1000):x}-{size:x}"
+        self.last_modified = http_date(mtime)
+        self.cache_control = cache_control
+        self.data = None
+        self.variants = {}  # {encoding: contenu compressé}
+
+class StaticIndex:
+    """
+    Index du dossier de build construit au démarrage. Servir un fichier se résume à une
+    recherche dans un dictionnaire ; le disque n'est relu que pour les gros fichiers.
+    Selon le mode de rafraîchissement, l'index est reconstruit lorsque le dossier change
+    (vérification à intervalle fixe par un thread d'arrière-plan, démarré avec l'index et relancé
+    après un fork, ou pendant une requête).
+    """
+
+    def __init__(self, root, config=None):
+        """
+        Initialise et construit l'index
+
+        Args:
+            root (str): Dossier du build (client/build)
+            config (dict, optional): SERVER_CONFIG (STATIC_PRELOAD_MAX_SIZE, STATIC_INDEX_REFRESH,
+                STATIC_INDEX_REFRESH_INTERVAL, STATIC_MAX_AGE, COMPRESSION_*). Par défaut None.
+
+        Raises:
+            ValueError: Si le mode de rafraîchissement n'est pas supporté
+        """
+        config = config or {}
+        self.root = os.path.abspath(root)
+        self.preload_max_size = config.get('STATIC_PRELOAD_MAX_SIZE', 1024 * 1024)
+        self.refresh_mode = config.get('STATIC_INDEX_REFRESH', 'background')
+        if self.refresh_mode not in REFRESH_MODES:
+            raise ValueError(f"Mode de rafraîchissement de l'index statique non supporté: {self.refresh_mode}")
+        self.refresh_interval = config.get('STATIC_INDEX_REFRESH_INTERVAL', 5)
+        self.max_age = config.get('STATIC_MAX_AGE', 365 * 24 * 3600)
+        self.compression_enabled = config.get('COMPRESSION_ENABLED', True)
+        self.compression_min_size = config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.compression_max_size = config.get('COMPRESSION_MAX_FILE_SIZE', 4 * 1024 * 1024)
+        self.gzip_level = config.get('STATIC_GZIP_LEVEL', 9)
+        self.brotli_enabled = config.get('BROTLI_ENABLED', True)
+        self.brotli_quality = config.get('STATIC_BROTLI_QUALITY', 11)
+
+        self._files = {}
+        self._signature = None
+        self._next_check = 0.0
+        self._refresh_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_pid = None  # Processus du thread de surveillance (les threads ne survivent pas au fork)
+        self._watcher_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.refreshes = 0
+        self.refresh()
+        if self.refresh_mode == 'background' and self.refresh_interval:
+            self.start_watcher()
+
+    def lookup(self, path):
+        """
+        Renvoie le fichier correspondant à un chemin de requête
+
+        Args:
+            path (str): Chemin relatif au build ('' pour la racine)
+
+        Returns:
+            StaticFile: Fichier indexé, ou None
+        """
+        if self.refresh_mode == 'request' and self.refresh_interval and time.monotonic() >= self._next_check:
+            self.maybe_refresh()
+        return self._files.get(path)
+
+    def maybe_refresh(self):
+        """Reconstruit l'index si le dossier a changé (un seul thread à la fois, sans attente)"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.refresh_interval
+            if self._scan_signature() != self._signature:
+                self._build()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self):
+        """Reconstruit l'index immédiatement"""
+        with self._refresh_lock:
+            self._next_check = time.monotonic() + self.refresh_interval
+            self._build()
+
+    def start_watcher(self):
+        """
+        Démarre le thread qui vérifie le dossier toutes les refresh_interval secondes (mode
+        'background'). Appelé à la construction de l'index, puis par restart_watchers dans
+        chaque processus issu d'un fork ; sans effet si le thread tourne déjà dans ce processus.
+        """
+        with self._watcher_lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._stopping.clear()
+            self._watcher = threading.Thread(target=self._watch, name='static-index', daemon=True)
+            self._watcher.start()
+            self._watcher_pid = os.getpid()
+            _watched.add(self)
+
+    def stop_watcher(self):
+        """Arrête le thread de surveillance du dossier (il n'est plus relancé après un fork)"""
+        with self._watcher_lock:
+            watcher, self._watcher, self._watcher_pid = self._watcher, None, None
+            _watched.discard(self)
+        self._stopping.set()
+        if watcher is not None and watcher.is_alive():
+            watcher.join()
+
+    def _after_fork(self):
+        """
+        Relance le thread de surveillance dans le processus enfant. Les verrous et l'événement
+        d'arrêt sont recréés : le thread du parent a pu les détenir au moment du fork.
+        """
+        if self._watcher_pid == os.getpid():
+            return
+        self._refresh_lock = threading.Lock()
+        self._watcher_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._watcher = None
+        self.start_watcher()
+
+    def response(self, entry, request, response_class):
+        """
+        Construit la réponse d'un fichier indexé : 304 si l'ETag correspond, variante compressée
+        acceptée par le client sinon
+
+        Args:
+            entry (StaticFile): Fichier indexé
+            request (Request): Requête Flask
+            response_class (type): Classe de réponse de l'application
+
+        Returns:
+            Response: Réponse HTTP
+        """
+        encoding = None
+        if entry.variants:
+            accepted = request.accept_encodings
+            for candidate in ('br', 'gzip'):
+                if candidate in entry.variants and accepted[candidate]:
+                    encoding = candidate
+                    break
+        etag = f"{entry.etag}-{encoding}" if encoding else entry.etag
+
+        headers = {
+            'Cache-Control': entry.cache_control,
+            'Last-Modified': entry.last_modified
+        }
+        if entry.variants:
+            headers['Vary'] = 'Accept-Encoding'
+
+        if request.if_none_match.contains(etag):
+            response = response_class(status=304, headers=headers)
+            response.set_etag(etag)
+            return response
+
+        if encoding:
+            response = response_class(entry.variants[encoding], mimetype=entry.mimetype, headers=headers)
+            response.headers['Content-Encoding'] = encoding
+        elif entry.data is not None:
+            response = response_class(entry.data, mimetype=entry.mimetype, headers=headers)
+        else:
+            try:
+                body = wrap_file(request.environ, open(entry.path, 'rb'))
+            except OSError:
+                self._next_check = 0.0  # Fichier supprimé depuis l'indexation : revérifier au prochain appel
+                return None
+            response = response_class(body, mimetype=entry.mimetype, headers=headers, direct_passthrough=True)
+            response.content_length = entry.size
+        response.set_etag(etag)
+        return response
+
+    def get_stats(self):
+        """
+        Renvoie les statistiques de l'index
+
+        Returns:
+            dict: Nombre de fichiers, octets préchargés et compressés, reconstructions
+        """
+        files = list(self._files.values())
+        seen = set()
+        preloaded = variants = 0
+        for entry in files:
+            if id(entry) in seen:
+                continue
+            seen.add(id(entry))
+            preloaded += len(entry.data) if entry.data is not None else 0
+            variants += sum(len(data) for data in entry.variants.values())
+        return {
+            "root": self.root,
+            "files": len(seen),
+            "preloaded_bytes": preloaded,
+            "compressed_bytes": variants,
+            "refresh_mode": self.refresh_mode,
+            "refreshes": self.refreshes
+        }
+
+    def _watch(self):
+        """Boucle du thread de surveillance : reconstruit l'index hors du chemin des requêtes"""
+        while not self._stopping.wait(self.refresh_interval):
+            try:
+                self.maybe_refresh()
+            except Exception as e:
+                logger.error(f"Erreur lors du rafraîchissement de l'index statique: {str(e)}")
+
+    def _scan_signature(self):
+        """
+        Empreinte du dossier : dates de modification de chaque sous-dossier (ajouts, suppressions,
+        dossier recréé par le build) et d'index.html, le seul fichier réécrit sans changer de nom
+        """
+        if not os.path.isdir(self.root):
+            return None
+        signature = []
+        paths = [directory for directory, _, _ in os.walk(self.root)]
+        paths.append(os.path.join(self.root, 'index.html'))
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_ino, stat.st_mtime, stat.st_size))
+        return tuple(signature)
+
+    def _build(self):
+        """Parcourt le dossier de build et remplace l'index en une seule affectation"""
+        signature = self._scan_signature()
+        files = {}
+        if signature is not None:
+            for directory, _, names in os.walk(self.root):
+                present = set(names)
+                for name in names:
+                    base, suffix = os.path.splitext(name)
+                    if suffix in PRECOMPRESSED_SUFFIXES.values() and base in present:
+                        continue  # Variante précompressée : rattachée au fichier d'origine
+                    path = os.path.join(directory, name)
+                    relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                    try:
+                        files[relative] = self._load(path, relative)
+                    except OSError as e:
+                        logger.warning(f"Fichier statique ignoré {relative}: {str(e)}")
+
+        # Racine et chemins inconnus de l'application monopage : index.html
+        index = files.get('index.html')
+        if index is not None:
+            files[''] = index
+
+        self._files = files
+        self._signature = signature
+        self.refreshes += 1
+        logger.info(f"Index statique construit: {len(files)} fichiers dans {self.root}")
+
+    def _load(self, path, relative):
+        """Lit les métadonnées d'un fichier, et son contenu et ses variantes s'il est assez petit"""
+        stat = os.stat(path)
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        # Les fichiers de build/static portent une empreinte dans leur nom : ils ne changent jamais
+        if relative.startswith('static/'):
+            cache_control = f"public, max-age={self.max_age}, immutable"
+        else:
+            cache_control = 'no-cache'
+        entry = StaticFile(path, stat.st_size, stat.st_mtime, mimetype, cache_control)
+
+        compressible = self.compression_enabled and mimetype in COMPRESSIBLE_TYPES and \
+            self.compression_min_size <= stat.st_size <= self.compression_max_size
+        if stat.st_size > self.preload_max_size and not compressible:
+            return entry
+
+        with open(path, 'rb') as source:
+            data = source.read()
+        entry.etag = content_etag(data)
+        if stat.st_size <= self.preload_max_size:
+            entry.data = data
+
+        if compressible:
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+                if os.path.exists(path + suffix):
+                    with open(path + suffix, 'rb') as variant:
+                        entry.variants[encoding] = variant.read()
+            if 'gzip' not in entry.variants:
+                entry.variants['gzip'] = compress(data, 'gzip', gzip_level=self.gzip_level)
+            if 'br' not in entry.variants and self.brotli_enabled and compression.brotli is not None:
+                entry.variants['br'] = compress(data, 'br', brotli_quality=self.brotli_quality)
+            # Une variante plus grosse que l'original n'a pas d'intérêt
+            entry.variants = {encoding: variant for encoding, variant in entry.variants.items()
+                              if len(variant) < stat.st_size}
+        return entry
+
+# Python 3.7+ ; sous 3.6, seul le hook post_fork de Gunicorn relance les threads
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=restart_watchers)
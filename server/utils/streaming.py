@@ -0,0 +1,108 @@
+# streaming.py - Réponses HTTP diffusées en flux (NDJSON / JSON par morceaux)
+import logging
+from flask import Response, stream_with_context
+
+from utils import serializer
+
+logger = logging.getLogger(__name__)
+
+# Taille approximative des morceaux envoyés au client
+CHUNK_SIZE = 64 * 1024
+
+def _encode(row):
+    """Sérialise une ligne en JSON compact avec l'encodeur des réponses de l'API (utils.serializer)"""
+    return serializer.dumps(row)
+
+def _chunked(parts, chunk_size=CHUNK_SIZE):
+    """
+    Regroupe des fragments JSON en morceaux d'environ chunk_size octets
+    
+    Args:
+        parts (iterable): Fragments encodés à envoyer (bytes)
+        chunk_size (int, optional): Taille cible d'un morceau. Par défaut 64 Ko.
+        
+    Yields:
+        bytes: Morceau encodé en UTF-8
+    """
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+def _guard(rows):
+    """Journalise les erreurs survenant pendant la diffusion (l'en-tête HTTP est déjà envoyé)"""
+    try:
+        for row in rows:
+            yield row
+    except Exception as e:
+        logger.error(f"Erreur pendant la diffusion de la réponse: {str(e)}")
+        raise
+
+def ndjson_response(rows, chunk_size=CHUNK_SIZE):
+    """
+    Diffuse des lignes au format NDJSON (un objet JSON par ligne)
+    
+    Args:
+        rows (iterable): Lignes à envoyer, par exemple SQLConnector.fetch_iter(...)
+        chunk_size (int, optional): Taille cible des morceaux. Par défaut 64 Ko.
+        
+    Returns:
+        Response: Réponse Flask diffusée avec une mémoire bornée
+    """
+    lines = (_encode(row) + b'\n' for row in _guard(rows))
+    return Response(
+        stream_with_context(_chunked(lines, chunk_size)),
+        mimetype='application/x-ndjson'
+    )
+
+def json_array_response(rows, chunk_size=CHUNK_SIZE):
+    """
+    Diffuse des lignes sous forme d'un tableau JSON envoyé par morceaux
+    
+    Args:
+        rows (iterable): Lignes à envoyer
+        chunk_size (int, optional): Taille cible des morceaux. Par défaut 64 Ko.
+        
+    Returns:
+        Response: Réponse Flask diffusée avec une mémoire bornée
+    """
+    def parts():
+        yield b'['
+        first = True
+        for row in _guard(rows):
+            yield _encode(row) if first else b',' + _encode(row)
+            first = False
+        yield b']'
+    
+    return Response(
+        stream_with_context(_chunked(parts(), chunk_size)),
+        mimetype='application/json'
+    )
+
+def stream_response(rows, output_format='ndjson', chunk_size=CHUNK_SIZE):
+    """
+    Diffuse des lignes dans le format demandé
+    
+    Args:
+        rows (iterable): Lignes à envoyer
+        output_format (str, optional): 'ndjson' ou 'json'. Par défaut 'ndjson'.
+        chunk_size (int, optional): Taille cible des morceaux. Par défaut 64 Ko.
+        
+    Returns:
+        Response: Réponse Flask diffusée
+        
+    Raises:
+        ValueError: Si le format n'est pas supporté
+    """
+    if output_format == 'ndjson':
+        return ndjson_response(rows, chunk_size)
+    if output_format == 'json':
+        return json_array_response(rows, chunk_size)
+    raise ValueError(f"Format de flux non supporté: {output_format}")
@@ -0,0 +1,8 @@
+# wsgi.py - Point d'entrée WSGI pour Gunicorn ou tout autre serveur WSGI
+#
+#   gunicorn -c gunicorn_config.py wsgi:app
+from app import create_app
+from config.settings import SERVER_CONFIG
+
+# Avec preload, tous les modules sont importés dans le maître et partagés par fork
+app = create_app(lazy_modules=False if SERVER_CONFIG.get('PRELOAD_APP', True) else None)